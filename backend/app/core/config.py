@@ -1,3 +1,4 @@
+from functools import cached_property
 from pathlib import Path
 
 from pydantic_settings import BaseSettings
@@ -9,10 +10,92 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    # Revoked-token Bloom filter
+    REVOCATION_BLOOM_CAPACITY: int = 100_000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.01
+    REVOCATION_REFRESH_SECONDS: float = 5.0
+    REVOCATION_REBUILD_SECONDS: float = 3600.0
     MEDIA_ROOT: str = "media"
     PROFILE_PICTURE_DIR: str = "profile_pictures"
+    SNAPSHOT_DIR: str = "snapshots"
     MEDIA_URL: str = "/media"
     STATIC_DIR: str = "static"
+    # Media storage backend: "local" (MEDIA_ROOT, served at MEDIA_URL) or "s3"
+    MEDIA_STORAGE_BACKEND: str = "local"
+    S3_BUCKET: str | None = None
+    S3_REGION: str | None = None
+    S3_ENDPOINT_URL: str | None = None  # e.g. a MinIO server
+    S3_ACCESS_KEY_ID: str | None = None
+    S3_SECRET_ACCESS_KEY: str | None = None
+    S3_KEY_PREFIX: str = ""
+    # Public bucket/CDN base URL media links point at; required for "s3", since
+    # published snapshot URLs must not expire the way presigned ones do.
+    S3_PUBLIC_BASE_URL: str | None = None
+    S3_MAX_POOL_CONNECTIONS: int = 20
+
+    # Background jobs
+    JOB_WORKERS: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 2.0
+    JOB_RETRY_MAX_SECONDS: float = 300.0
+    JOB_LEASE_SECONDS: int = 300
+    METADATA_BACKFILL_BATCH_SIZE: int = 500
+
+    # POST /batch: consecutive GET sub-requests run this many at a time
+    BATCH_MAX_CONCURRENCY: int = 4
+
+    # Saved visualization revision history
+    # The PATCH that brings the pending delta tail to this length folds it into
+    # a new payload blob (and checkpoint) inline; a job folds shorter tails
+    # REVISION_FOLD_DELAY_SECONDS after their first edit.
+    REVISION_CHECKPOINT_INTERVAL: int = 20
+    REVISION_FOLD_DELAY_SECONDS: float = 30.0
+
+    # Benchmark lab: workloads run in their own process pool
+    LAB_WORKERS: int = 2
+    LAB_MAX_PENDING: int = 4  # distinct runs queued or running; more get a 503
+    LAB_CPU_SECONDS: float = 20.0  # per run; later sizes are skipped past it
+    LAB_MAX_SIZE: int = 10_000_000
+    LAB_CACHE_SIZE: int = 128
+
+    # Content-addressed payload storage
+    PAYLOAD_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    PAYLOAD_GC_SECONDS: float = 3600.0
+
+    # Per-user storage quotas (0 disables a limit); the storage quota covers
+    # saved payloads and the profile picture together
+    QUOTA_MAX_VISUALIZATIONS: int = 1000
+    QUOTA_MAX_STORAGE_BYTES: int = 256 * 1024 * 1024
+    USAGE_RECONCILE_SECONDS: float = 86400.0
+    USAGE_RECONCILE_BATCH_SIZE: int = 500
+
+    # Server-sent change feed
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+    SSE_BUFFER_SIZE: int = 1000
+    SSE_MAX_STREAMS: int = 200
+
+    # Admission control / load shedding (0 disables a limit)
+    ADMISSION_MAX_IN_FLIGHT: int = 64
+    ADMISSION_HARD_LIMIT: int = 128
+    ADMISSION_MAX_POOL_WAIT_MS: float = 250.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 2
+    HEALTH_DB_PROBE_SECONDS: float = 5.0
+
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    # Fraction of fast successful requests that get an access log line;
+    # errors and requests slower than ACCESS_LOG_SLOW_MS are always logged.
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0
+    ACCESS_LOG_SLOW_MS: float = 1000.0
+
+    # On-demand profiling (disabled unless an admin token is set)
+    PROFILING_ADMIN_TOKEN: str | None = None
+    PROFILING_SAMPLE_RATE: int = 0  # profile 1 in N API requests; 0 disables
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_REPORT_LIMIT: int = 50
+    PROFILING_TRACEMALLOC_FRAMES: int = 10
 
     DATABASE_URL: str | None = None
     # MySQL
@@ -54,25 +137,36 @@ class Settings(BaseSettings):
     def CORS_ORIGINS(self) -> list[str]:
         return [o.strip() for o in self.CORS_ORIGINS_RAW.split(",") if o.strip()]
 
-    @property
+    # Filesystem paths are resolved once per process and then reused, so hot
+    # paths (uploads, snapshot writes) never pay for Path.resolve() syscalls.
+    @cached_property
     def BASE_DIR(self) -> Path:
         return Path(__file__).resolve().parent.parent
 
-    @property
+    @cached_property
     def MEDIA_ROOT_PATH(self) -> Path:
         media_path = Path(self.MEDIA_ROOT)
         if media_path.is_absolute():
             return media_path
         return (self.BASE_DIR / media_path).resolve()
 
-    @property
+    @cached_property
     def STATIC_ROOT_PATH(self) -> Path:
         return Path(__file__).resolve().parent.parent.parent.joinpath(self.STATIC_DIR).resolve()
 
-    @property
+    @cached_property
     def PROFILE_PICTURE_PATH(self) -> Path:
         return (self.MEDIA_ROOT_PATH / self.PROFILE_PICTURE_DIR).resolve()
 
+    @cached_property
+    def SNAPSHOT_PATH(self) -> Path:
+        return (self.MEDIA_ROOT_PATH / self.SNAPSHOT_DIR).resolve()
+
+    @property
+    def SNAPSHOT_URL(self) -> str:
+        base = self.MEDIA_URL.rstrip("/")
+        return f"{base}/{self.SNAPSHOT_DIR}".rstrip("/")
+
     @property
     def PROFILE_PICTURE_URL(self) -> str:
         base = self.MEDIA_URL.rstrip("/")
@@ -1,3 +1,11 @@
 AUTH_COOKIE_NAME = "access_token"
 PROFILE_PICTURE_ALLOWED_TYPES = {"image/png", "image/jpeg", "image/jpg"}
 PROFILE_PICTURE_MAX_BYTES = 5 * 1024 * 1024  # 5MB
+# Snapshots are content-addressed, so a given URL never changes its bytes.
+SNAPSHOT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MAX_BATCH_OPERATIONS = 10_000
+MAX_BATCH_REQUESTS = 20
+# Create-visualization bodies are streamed and refused past this size.
+VISUALIZATION_MAX_BODY_BYTES = 32 * 1024 * 1024  # 32MB
+MAX_BENCHMARK_SIZES = 12
+MAX_BENCHMARK_REPEATS = 5
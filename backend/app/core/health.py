@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+
+from ..db import engine
+
+
+class DatabaseProbe:
+    """Background DB liveness check; /health/db serves the cached result."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._status: dict = {"db": "unknown"}
+
+    def run_once(self) -> dict:
+        start = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                conn.exec_driver_sql("SELECT 1")
+        except Exception as exc:
+            status = {"db": "down", "error": type(exc).__name__}
+        else:
+            status = {"db": "ok"}
+        status["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        status["checked_at"] = datetime.utcnow().isoformat()
+        with self._lock:
+            self._status = status
+        return status
+
+    @property
+    def status(self) -> dict:
+        with self._lock:
+            return dict(self._status)
+
+
+db_probe = DatabaseProbe()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+
+
+class LatencyStats:
+    """Thread-safe latency recorder keeping totals and a window of recent samples."""
+
+    def __init__(self, window: int = 1024) -> None:
+        self._lock = threading.Lock()
+        self._recent: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+            self._recent.append(seconds)
+
+    def percentile(self, q: float) -> float:
+        with self._lock:
+            recent = sorted(self._recent)
+        if not recent:
+            return 0.0
+        index = min(len(recent) - 1, int(q * len(recent)))
+        return recent[index]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            count, total, max_ = self.count, self.total, self.max
+        return {
+            "count": count,
+            "avg_ms": round(total / count * 1000, 3) if count else 0.0,
+            "p50_ms": round(self.percentile(0.5) * 1000, 3),
+            "p95_ms": round(self.percentile(0.95) * 1000, 3),
+            "max_ms": round(max_ * 1000, 3),
+        }
+
+
+class DecayingAverage:
+    """Exponentially weighted average that also decays toward zero while idle.
+
+    Used for signals such as pool wait time, where a burst of slow samples
+    must not keep the value high once traffic (and sampling) stops.
+    """
+
+    def __init__(self, alpha: float = 0.2, half_life: float = 5.0) -> None:
+        self.alpha = alpha
+        self.half_life = half_life
+        self._lock = threading.Lock()
+        self._value = 0.0
+        self._updated = time.monotonic()
+
+    def _decayed(self, now: float) -> float:
+        return self._value * 0.5 ** ((now - self._updated) / self.half_life)
+
+    def record(self, sample: float) -> None:
+        with self._lock:
+            now = time.monotonic()
+            current = self._decayed(now)
+            self._value = current + self.alpha * (sample - current)
+            self._updated = now
+
+    def value(self) -> float:
+        with self._lock:
+            return self._decayed(time.monotonic())
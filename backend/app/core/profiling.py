@@ -0,0 +1,189 @@
+"""On-demand profiling: a statistical stack sampler and tracemalloc diffs.
+
+The sampler reads ``sys._current_frames()`` from a helper thread, so the
+profiled code runs unmodified and sync endpoints executing in the threadpool
+are captured too. Samples cover every busy thread in the process, so work
+from concurrent requests shows up in a report as well.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import secrets
+import sys
+import threading
+import tracemalloc
+from collections import Counter, deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+from .config import settings
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+
+
+def admin_token_matches(token: str | None) -> bool:
+    """True if ``token`` is the configured profiling admin token (never when unset)."""
+    expected = settings.PROFILING_ADMIN_TOKEN
+    return bool(expected and token and secrets.compare_digest(token, expected))
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    if filename.startswith(_APP_DIR):
+        filename = "app" + filename[len(_APP_DIR):]
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Sample all other threads every ``interval`` seconds while running."""
+
+    def __init__(self, interval: float, max_depth: int = 64) -> None:
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                in_app = False
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    in_app = in_app or code.co_filename.startswith(_APP_DIR)
+                    stack.append(_frame_label(code))
+                    frame = frame.f_back
+                # Idle pool/loop threads never run app code; leave them out.
+                if in_app:
+                    self.stacks[";".join(reversed(stack))] += 1
+
+
+@dataclass
+class ProfileReport:
+    id: int
+    method: str
+    path: str
+    status: int | None
+    duration_ms: float
+    samples: int
+    trigger: str  # "header" or "sampled"
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    stacks: dict[str, int] = field(default_factory=dict)
+
+    def summary(self) -> dict:
+        data = asdict(self)
+        data.pop("stacks")
+        return data
+
+    def top_functions(self, limit: int = 25) -> list[dict]:
+        """Functions by samples where they were the innermost frame (self time)."""
+        own: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            own[stack.rsplit(";", 1)[-1]] += count
+        return [{"function": name, "samples": n} for name, n in own.most_common(limit)]
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed-stack format, ready for flamegraph tools."""
+        ordered = sorted(self.stacks.items(), key=lambda item: item[1], reverse=True)
+        return "".join(f"{stack} {count}\n" for stack, count in ordered)
+
+
+class ProfileStore:
+    """The most recent profile reports, kept in memory."""
+
+    def __init__(self, limit: int) -> None:
+        self._reports: deque[ProfileReport] = deque(maxlen=limit)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def add(self, report: ProfileReport) -> None:
+        with self._lock:
+            self._reports.append(report)
+
+    def get(self, report_id: int) -> ProfileReport | None:
+        with self._lock:
+            return next((r for r in self._reports if r.id == report_id), None)
+
+    def list(self) -> list[ProfileReport]:
+        with self._lock:
+            return list(reversed(self._reports))
+
+
+profile_store = ProfileStore(settings.PROFILING_REPORT_LIMIT)
+
+
+class MemoryTracker:
+    """tracemalloc baseline plus diffs against it to find allocation hot spots."""
+
+    def __init__(self) -> None:
+        self._baseline: tracemalloc.Snapshot | None = None
+        self._started_here = False
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self._baseline is not None
+
+    def start(self, frames: int) -> None:
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+                self._started_here = True
+            self._baseline = tracemalloc.take_snapshot()
+
+    def diff(self, limit: int, group_by: str = "lineno") -> dict:
+        with self._lock:
+            if self._baseline is None:
+                raise RuntimeError("Memory tracking is not started")
+            snapshot = tracemalloc.take_snapshot()
+            stats = snapshot.compare_to(self._baseline, group_by)[:limit]
+            current, peak = tracemalloc.get_traced_memory()
+        return {
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "top": [
+                {
+                    "location": str(stat.traceback[0]) if stat.traceback else "?",
+                    "size_diff": stat.size_diff,
+                    "size": stat.size,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in stats
+            ],
+        }
+
+    def stop(self) -> None:
+        with self._lock:
+            self._baseline = None
+            if self._started_here:
+                tracemalloc.stop()
+                self._started_here = False
+
+
+memory_tracker = MemoryTracker()
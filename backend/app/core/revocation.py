@@ -0,0 +1,123 @@
+"""Revoked-token filter kept in memory so the per-request check skips the DB.
+
+A Bloom filter answers "definitely not revoked" without I/O. A positive
+answer may be a false positive, so it is confirmed against the
+revoked_tokens table. The filter is topped up incrementally by id and
+rebuilt periodically so expired revocations fall out of it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from ..db import engine
+from ..models import RevokedToken
+from .config import settings
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        # Kirsch-Mitzenmacher double hashing.
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class RevocationFilter:
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._last_id = 0
+        self.rebuilt_at: float | None = None
+
+    def add(self, jti: str) -> None:
+        with self._lock:
+            self._bloom.add(jti)
+
+    def might_be_revoked(self, jti: str) -> bool:
+        return jti in self._bloom
+
+    def is_revoked(self, session: Session, jti: str | None) -> bool:
+        if not jti or not self.might_be_revoked(jti):
+            return False
+        # Possible false positive: confirm against the table.
+        row = session.exec(
+            select(RevokedToken.id).where(RevokedToken.jti == jti)
+        ).first()
+        return row is not None
+
+    def refresh(self, session: Session) -> None:
+        """Add revocations written since the last refresh (e.g. by other workers)."""
+        rows = session.exec(
+            select(RevokedToken.id, RevokedToken.jti)
+            .where(RevokedToken.id > self._last_id)
+            .order_by(RevokedToken.id)
+        ).all()
+        with self._lock:
+            for row_id, jti in rows:
+                self._bloom.add(jti)
+                self._last_id = max(self._last_id, row_id)
+            needs_rebuild = self._bloom.count > self._bloom.capacity
+        if needs_rebuild:
+            self.rebuild(session)
+
+    def rebuild(self, session: Session) -> None:
+        """Purge expired revocations and rebuild the filter from live rows."""
+        session.exec(delete(RevokedToken).where(RevokedToken.expires_at < datetime.utcnow()))
+        session.commit()
+        rows = session.exec(select(RevokedToken.id, RevokedToken.jti)).all()
+        capacity = max(self.capacity, len(rows) * 2)
+        bloom = BloomFilter(capacity, self.error_rate)
+        last_id = 0
+        for row_id, jti in rows:
+            bloom.add(jti)
+            last_id = max(last_id, row_id)
+        with self._lock:
+            self._bloom = bloom
+            self._last_id = max(self._last_id, last_id)
+        self.rebuilt_at = time.monotonic()
+
+
+revocation_filter = RevocationFilter(
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+)
+
+
+def sync_revocations() -> None:
+    """Periodic task: incremental refresh, with a full rebuild every REBUILD interval."""
+    with Session(engine) as session:
+        rebuilt_at = revocation_filter.rebuilt_at
+        if (
+            rebuilt_at is None
+            or time.monotonic() - rebuilt_at >= settings.REVOCATION_REBUILD_SECONDS
+        ):
+            revocation_filter.rebuild(session)
+        else:
+            revocation_filter.refresh(session)
@@ -1,32 +1,45 @@
+import uuid
 from datetime import datetime, timedelta, timezone
-
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
 
 from .config import settings
 
-# Use PBKDF2-SHA256 instead of bcrypt to avoid backend issues.
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# python-jose and passlib pull in cryptography and a hash registry; they are
+# imported on first use so they stay off the cold-start path.
+
+
+@lru_cache(maxsize=1)
+def _pwd_context():
+    from passlib.context import CryptContext
+
+    # Use PBKDF2-SHA256 instead of bcrypt to avoid backend issues.
+    return CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
 
 def hash_password(p: str) -> str:
-    return pwd_context.hash(p)
+    return _pwd_context().hash(p)
 
 
 def verify_password(p: str, h: str) -> bool:
-    return pwd_context.verify(p, h)
+    return _pwd_context().verify(p, h)
 
 
 def create_access_token(data: dict, minutes: int | None = None) -> str:
+    from jose import jwt
+
     to_encode = data.copy()
     exp = datetime.now(timezone.utc) + timedelta(
         minutes=minutes or settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
     to_encode.update({"exp": exp})
+    # Unique token id so a single token can be revoked on logout.
+    to_encode.setdefault("jti", uuid.uuid4().hex)
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
 def decode_token(token: str) -> dict | None:
+    from jose import JWTError, jwt
+
     try:
         return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
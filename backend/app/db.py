@@ -1,21 +1,101 @@
-import pymysql
-from sqlmodel import Session, create_engine
-from sqlmodel import SQLModel
-from .core.config import settings
+import json
+import time
+from array import array
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+from sqlmodel import Session, SQLModel, create_engine
+from starlette.requests import Request
 
-# Ensure mysqlclient/MySQLdb imports resolve to PyMySQL when used implicitly.
-pymysql.install_as_MySQLdb()
+from .core.config import settings
+from .core.metrics import DecayingAverage, LatencyStats
+from .utils.payloads import encode_values
 
 try:
     _DATABASE_URI = settings.SQLALCHEMY_DATABASE_URI
 except ValueError as exc:  # configuration error
     raise RuntimeError(str(exc)) from exc
 
+# Time spent waiting for a pooled connection; read by admission control.
+pool_wait_stats = LatencyStats()
+pool_wait_recent = DecayingAverage()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            pool_wait_stats.record(waited)
+            pool_wait_recent.record(waited)
+
+
+_url = make_url(_DATABASE_URI)
+if _url.drivername == "mysql":
+    # A bare mysql:// URL loads MySQLdb; resolve it to PyMySQL. Other URLs
+    # never touch the shim, so pymysql is only imported when it is needed.
+    import pymysql
+
+    pymysql.install_as_MySQLdb()
+
+_engine_options = {}
+if _url.get_dialect().get_pool_class(_url) is QueuePool:
+    _engine_options["poolclass"] = TimedQueuePool
+
+def _json_serializer(value) -> str:
+    # Streamed saves hand over packed array('d') values; encode them without
+    # first turning them back into a list of Python floats.
+    if isinstance(value, array):
+        return encode_values(value)
+    return json.dumps(value)
+
+
 # Connection only; no DDL.
 engine = create_engine(
     _DATABASE_URI,
     pool_pre_ping=True,
     future=True,
+    json_serializer=_json_serializer,
+    **_engine_options,
+)
+
+
+# create_all() only creates missing tables, so columns and indexes added to
+# existing tables are applied here. Each statement is idempotent by failing.
+_SCHEMA_UPGRADES = (
+    "ALTER TABLE saved_visualizations MODIFY kind "
+    "ENUM('array','stack','queue','linkedlist','bst','binaryheap') NOT NULL",
+    "ALTER TABLE saved_visualizations ADD COLUMN snapshot VARCHAR(512) NULL",
+    "ALTER TABLE saved_visualizations ADD COLUMN element_count INTEGER NULL",
+    "ALTER TABLE saved_visualizations ADD COLUMN min_value DOUBLE NULL",
+    "ALTER TABLE saved_visualizations ADD COLUMN max_value DOUBLE NULL",
+    "ALTER TABLE saved_visualizations ADD COLUMN is_sorted BOOLEAN NULL",
+    "ALTER TABLE saved_visualizations ADD COLUMN height INTEGER NULL",
+    "ALTER TABLE saved_visualizations ADD COLUMN balance_factor INTEGER NULL",
+    "ALTER TABLE saved_visualizations ADD COLUMN revision INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE saved_visualizations MODIFY payload JSON NULL",
+    "ALTER TABLE saved_visualizations ADD COLUMN payload_hash VARCHAR(64) NULL",
+    "ALTER TABLE saved_visualizations ADD COLUMN payload_bytes BIGINT NULL",
+    "ALTER TABLE saved_visualizations ADD COLUMN base_revision INTEGER NULL",
+    "ALTER TABLE saved_visualizations ADD COLUMN history_bytes BIGINT NOT NULL DEFAULT 0",
+    "ALTER TABLE visualization_revisions ADD COLUMN checkpoint_hash VARCHAR(64) NULL",
+    "CREATE INDEX ix_saved_visualizations_payload_hash "
+    "ON saved_visualizations (payload_hash)",
+    "CREATE INDEX ix_saved_visualizations_snapshot ON saved_visualizations (snapshot)",
+    "CREATE INDEX ix_saved_visualizations_user_created "
+    "ON saved_visualizations (user_id, created_at)",
+    "CREATE INDEX ix_saved_visualizations_user_element_count "
+    "ON saved_visualizations (user_id, element_count)",
+    "CREATE INDEX ix_saved_visualizations_user_min_value "
+    "ON saved_visualizations (user_id, min_value)",
+    "CREATE INDEX ix_saved_visualizations_user_max_value "
+    "ON saved_visualizations (user_id, max_value)",
+    "CREATE INDEX ix_saved_visualizations_user_height "
+    "ON saved_visualizations (user_id, height)",
 )
 
 
@@ -27,17 +107,34 @@ def init_db() -> None:
     SQLModel.metadata.create_all(engine)
     
     with engine.connect() as conn:
-        try:
-            conn.exec_driver_sql(
-                "ALTER TABLE saved_visualizations MODIFY kind "
-                "ENUM('array','stack','queue','linkedlist','bst','binaryheap') NOT NULL"
-            )
-        except Exception:
-            # Fail silently; not fatal for app startup.
-            pass
-
-
-def get_session():
-    """FastAPI dependency that yields a DB session."""
-    with Session(engine) as session:
+        for statement in _SCHEMA_UPGRADES:
+            try:
+                conn.exec_driver_sql(statement)
+            except Exception:
+                # Already applied (or unsupported by this dialect); not fatal for startup.
+                pass
+
+
+def get_session(request: Request):
+    """FastAPI dependency that yields a DB session.
+
+    Sub-requests of POST /batch reuse the session the batch handed them.
+    The session only checks out a connection on its first statement, and
+    committed objects keep their in-memory state instead of being reloaded.
+    """
+    shared = getattr(request.state, "db_session", None)
+    if shared is not None:
+        yield shared
+        return
+    with Session(engine, expire_on_commit=False) as session:
         yield session
+
+
+def release_session(request: Request, session: Session) -> None:
+    """Return ``session``'s connection to the pool before a long wait.
+
+    Only a session the request owns is closed: a batch's shared session
+    still holds objects the sub-requests after this one rely on.
+    """
+    if getattr(request.state, "db_session", None) is not session:
+        session.close()
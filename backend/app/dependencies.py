@@ -1,7 +1,9 @@
-from fastapi import Depends, HTTPException, Request
+from fastapi import Depends, Header, HTTPException, Request
 from sqlmodel import Session
 
 from .core.constants import AUTH_COOKIE_NAME
+from .core.profiling import admin_token_matches
+from .core.revocation import revocation_filter
 from .core.security import decode_token
 from .db import get_session
 from .models import User
@@ -10,12 +12,39 @@ from .models import User
 def get_current_user(
     request: Request, session: Session = Depends(get_session)
 ) -> User:
+    # Inside POST /batch the cookie was already verified once for all sub-requests.
+    batch_user_id = getattr(request.state, "batch_user_id", None)
+    if batch_user_id is not None:
+        user = session.get(User, batch_user_id)
+        if not user:
+            raise HTTPException(status_code=401, detail="Not authenticated")
+        return user
+
     token = request.cookies.get(AUTH_COOKIE_NAME)
     data = decode_token(token) if token else None
     if not data or "sub" not in data:
         raise HTTPException(status_code=401, detail="Not authenticated")
+    if revocation_filter.is_revoked(session, data.get("jti")):
+        raise HTTPException(status_code=401, detail="Not authenticated")
 
     user = session.get(User, int(data["sub"]))
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     return user
+
+
+def get_optional_user(
+    request: Request, session: Session = Depends(get_session)
+) -> User | None:
+    try:
+        return get_current_user(request, session)
+    except HTTPException:
+        return None
+
+
+def require_profiling_admin(
+    x_profile_token: str | None = Header(default=None),
+) -> None:
+    # 404 rather than 401/403 so the admin surface is not advertised.
+    if not admin_token_matches(x_profile_token):
+        raise HTTPException(status_code=404, detail="Not Found")
@@ -0,0 +1,69 @@
+"""Server-side mirrors of the playground data structures.
+
+Each structure keeps its elements in compact ``array`` buffers and exposes
+the same operations and result shapes as ``frontend/src/algorithms/structures``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from .array import ArrayStructure
+from .base import OperationError, Structure
+from .bst import BstStructure
+from .heap import HeapStructure
+from .linked_list import LinkedListStructure
+from .queue import QueueStructure
+from .stack import StackStructure
+
+STRUCTURES: dict[str, type[Structure]] = {
+    cls.kind: cls
+    for cls in (
+        ArrayStructure,
+        StackStructure,
+        QueueStructure,
+        LinkedListStructure,
+        BstStructure,
+        HeapStructure,
+    )
+}
+
+
+def build(
+    kind: str, values: Sequence[float], *, mode: str = "min", balanced: bool = False
+) -> Structure:
+    """Bulk-load ``values`` the way the playground loads a saved visualization."""
+    if kind == "bst":
+        return BstStructure.from_sorted(values) if balanced else BstStructure.from_values(values)
+    if kind == "binaryheap":
+        return HeapStructure(values, mode=mode)
+    if kind not in STRUCTURES:
+        raise OperationError(f"Unknown structure kind {kind!r}")
+    return STRUCTURES[kind](values)
+
+
+def replay(
+    structure: Structure, operations: Sequence[dict], *, include_trace: bool = True
+) -> list[dict]:
+    """Apply ``operations`` in order and return the per-step trace."""
+    steps: list[dict] = []
+    for operation in operations:
+        result = structure.apply(operation)
+        if include_trace:
+            steps.append({"op": operation["op"], "result": result})
+    return steps
+
+
+__all__ = [
+    "ArrayStructure",
+    "BstStructure",
+    "HeapStructure",
+    "LinkedListStructure",
+    "OperationError",
+    "QueueStructure",
+    "STRUCTURES",
+    "StackStructure",
+    "Structure",
+    "build",
+    "replay",
+]
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+
+from .base import Structure
+
+
+def _valid_index(index, length: int, allow_end: bool) -> bool:
+    if not isinstance(index, int) or isinstance(index, bool) or index < 0:
+        return False
+    return index <= (length if allow_end else length - 1)
+
+
+class ArrayStructure(Structure):
+    kind = "array"
+    OPERATIONS = {
+        "insert": ("insert", ("value", "index")),
+        "delete_at": ("delete_at", ("index",)),
+        "search": ("search", ("value",)),
+        "clear": ("clear", ()),
+    }
+
+    def __init__(self, values: Iterable[float] = ()) -> None:
+        self.values = array("d", values)
+
+    def insert(self, value: float, index: int | None = None) -> dict:
+        if index is None:
+            self.values.append(value)
+            return {"index": len(self.values) - 1}
+        if not _valid_index(index, len(self.values), allow_end=True):
+            return {"error": "Invalid index."}
+        self.values.insert(index, value)
+        return {"index": index}
+
+    def delete_at(self, index: int) -> dict:
+        if not self.values:
+            return {"error": "Array is empty."}
+        if not _valid_index(index, len(self.values), allow_end=False):
+            return {"error": "Invalid index."}
+        removed = self.values.pop(index)
+        return {"removed": removed, "index": index}
+
+    def search(self, value: float) -> dict:
+        try:
+            found = self.values.index(value)
+        except ValueError:
+            return {"foundIndex": -1, "visited": list(range(len(self.values)))}
+        return {"foundIndex": found, "visited": list(range(found + 1))}
+
+    def clear(self) -> None:
+        del self.values[:]
+
+    def to_values(self) -> list[float]:
+        return self.values.tolist()
+
+    def __len__(self) -> int:
+        return len(self.values)
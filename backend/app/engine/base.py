@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, ClassVar
+
+
+class OperationError(ValueError):
+    """Raised for operations or payloads a structure cannot accept."""
+
+
+class Structure(ABC):
+    """Base for the array-backed mirrors of frontend/src/algorithms/structures.
+
+    ``OPERATIONS`` maps a public operation name to the method implementing it
+    and the argument names it takes from an operation dict, so a batch such as
+    ``[{"op": "push", "value": 3}, {"op": "pop"}]`` can be replayed generically.
+    Method results use the same shapes as the JS structures.
+    """
+
+    kind: ClassVar[str]
+    OPERATIONS: ClassVar[dict[str, tuple[str, tuple[str, ...]]]] = {}
+
+    def apply(self, operation: dict) -> Any:
+        name = operation.get("op")
+        if name not in self.OPERATIONS:
+            supported = ", ".join(sorted(self.OPERATIONS))
+            raise OperationError(
+                f"Unsupported operation {name!r} for {self.kind}; expected one of: {supported}"
+            )
+        method, arg_names = self.OPERATIONS[name]
+        args = []
+        for arg in arg_names:
+            value = operation.get(arg)
+            if value is None and arg != "index":
+                raise OperationError(f"Operation {name!r} requires {arg!r}")
+            args.append(value)
+        return getattr(self, method)(*args)
+
+    @abstractmethod
+    def to_values(self) -> list[float]:
+        """Values in the order the frontend saves them."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of elements held."""
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from collections.abc import Iterable, Sequence
+
+from .base import OperationError, Structure
+
+NIL = -1
+
+
+def _insertion_links(values: Sequence[float]) -> tuple[int, array, array]:
+    """Root and child links of the BST built by inserting ``values`` in order.
+
+    That tree is the Cartesian tree of the keys with insertion time as the
+    heap order: a key's parent is the later-inserted of its nearest
+    earlier-inserted neighbours in key order. One pass over the keys in sorted
+    order with a stack of insertion indices builds it, instead of replaying up
+    to O(n^2) descents.
+    Raises OperationError on duplicates, like insert-by-insert loading.
+    """
+    n = len(values)
+    left = array("q", [NIL]) * n
+    right = array("q", [NIL]) * n
+    ordered = sorted(range(n), key=values.__getitem__)
+    for a, b in zip(ordered, ordered[1:], strict=False):
+        if values[a] == values[b]:
+            raise OperationError("Duplicate values are not allowed.")
+    stack: list[int] = []
+    for node in ordered:
+        last = NIL
+        # Keys inserted after this one, to its left, hang beneath it.
+        while stack and stack[-1] > node:
+            last = stack.pop()
+        left[node] = last
+        if stack:
+            right[stack[-1]] = node
+        stack.append(node)
+    return (stack[0] if stack else NIL), left, right
+
+
+class BstStructure(Structure):
+    """Binary search tree stored in parallel index arrays.
+
+    Node ``i`` has key ``keys[i]`` and children ``left[i]`` / ``right[i]``
+    (``NIL`` for none). Freed slots are recycled, so no per-node objects are
+    allocated. Traversals are iterative, so degenerate (chain-shaped) trees
+    of any depth are fine.
+    """
+
+    kind = "bst"
+    OPERATIONS = {
+        "insert": ("insert", ("value",)),
+        "delete": ("delete", ("value",)),
+        "search": ("search", ("value",)),
+        "clear": ("clear", ()),
+    }
+
+    def __init__(self) -> None:
+        self.keys = array("d")
+        self.left = array("q")
+        self.right = array("q")
+        self.root = NIL
+        self._free = array("q")
+        self._size = 0
+
+    # -- construction -------------------------------------------------------
+
+    @classmethod
+    def from_values(cls, values: Sequence[float]) -> BstStructure:
+        """Bulk-load ``values`` into the tree replaying their inserts would build.
+
+        Matches the frontend's loadFromPayload in O(n log n) for any insert
+        order, degenerate ones included; node ``i`` holds ``values[i]``.
+        """
+        tree = cls()
+        tree.root, tree.left, tree.right = _insertion_links(values)
+        tree.keys = array("d", values)
+        tree._size = len(values)
+        return tree
+
+    @classmethod
+    def shape_of(cls, values: Sequence[float]) -> tuple[int, int]:
+        """``(height, balance_factor)`` of ``from_values(values)``, without building it."""
+        root, left, right = _insertion_links(values)
+        if root == NIL:
+            return 0, 0
+        # Preorder, then children before parents: heights bottom-up in O(n).
+        order = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            for child in (left[node], right[node]):
+                if child != NIL:
+                    stack.append(child)
+        heights = array("q", [0]) * len(left)
+        for node in reversed(order):
+            below = max(
+                heights[left[node]] if left[node] != NIL else 0,
+                heights[right[node]] if right[node] != NIL else 0,
+            )
+            heights[node] = below + 1
+        left_height = heights[left[root]] if left[root] != NIL else 0
+        right_height = heights[right[root]] if right[root] != NIL else 0
+        return heights[root], left_height - right_height
+
+    @classmethod
+    def from_sorted(cls, values: Iterable[float]) -> BstStructure:
+        """Build a height-balanced tree from values in O(n) (after de-duplication)."""
+        tree = cls()
+        ordered = sorted(set(values))
+        n = len(ordered)
+        if not n:
+            return tree
+        tree.keys = array("d", ordered)
+        tree.left = array("q", [NIL]) * n
+        tree.right = array("q", [NIL]) * n
+        tree._size = n
+        # Node index == position in sorted order; link each midpoint to its halves.
+        tree.root = (n - 1) // 2
+        stack = [(0, n - 1)]
+        while stack:
+            lo, hi = stack.pop()
+            mid = (lo + hi) // 2
+            if lo <= mid - 1:
+                tree.left[mid] = (lo + mid - 1) // 2
+                stack.append((lo, mid - 1))
+            if mid + 1 <= hi:
+                tree.right[mid] = (mid + 1 + hi) // 2
+                stack.append((mid + 1, hi))
+        return tree
+
+    def _new_node(self, value: float) -> int:
+        if self._free:
+            index = self._free.pop()
+            self.keys[index] = value
+            self.left[index] = NIL
+            self.right[index] = NIL
+        else:
+            index = len(self.keys)
+            self.keys.append(value)
+            self.left.append(NIL)
+            self.right.append(NIL)
+        self._size += 1
+        return index
+
+    def _release(self, index: int) -> None:
+        self._free.append(index)
+        self._size -= 1
+
+    # -- operations ---------------------------------------------------------
+
+    def insert(self, value: float) -> dict:
+        keys, left, right = self.keys, self.left, self.right
+        if self.root == NIL:
+            self.root = self._new_node(value)
+            return {"inserted": True, "path": [value]}
+        path = []
+        current = self.root
+        while True:
+            key = keys[current]
+            path.append(key)
+            if value == key:
+                return {
+                    "inserted": False,
+                    "error": "Duplicate values are not allowed.",
+                    "path": path,
+                }
+            links = left if value < key else right
+            child = links[current]
+            if child == NIL:
+                links[current] = self._new_node(value)
+                path.append(value)
+                return {"inserted": True, "path": path}
+            current = child
+
+    def search(self, value: float) -> dict:
+        path = []
+        current = self.root
+        while current != NIL:
+            key = self.keys[current]
+            path.append(key)
+            if value == key:
+                return {"found": True, "path": path}
+            current = self.left[current] if value < key else self.right[current]
+        return {"found": False, "path": path}
+
+    def _replace_child(self, parent: int, node: int, replacement: int) -> None:
+        if parent == NIL:
+            self.root = replacement
+        elif self.left[parent] == node:
+            self.left[parent] = replacement
+        else:
+            self.right[parent] = replacement
+
+    def delete(self, value: float) -> dict:
+        keys, left, right = self.keys, self.left, self.right
+        path = []
+        parent, node = NIL, self.root
+        while node != NIL and keys[node] != value:
+            path.append(keys[node])
+            parent, node = node, (left[node] if value < keys[node] else right[node])
+        if node == NIL:
+            return {"deleted": False, "path": path, "error": "Value not found."}
+        path.append(keys[node])
+
+        if left[node] == NIL or right[node] == NIL:
+            child = left[node] if right[node] == NIL else right[node]
+            self._replace_child(parent, node, child)
+            self._release(node)
+        else:
+            # Two children: copy the in-order successor up, then unlink it.
+            successor_parent, successor = node, right[node]
+            while left[successor] != NIL:
+                successor_parent, successor = successor, left[successor]
+            keys[node] = keys[successor]
+            if successor_parent == node:
+                right[successor_parent] = right[successor]
+            else:
+                left[successor_parent] = right[successor]
+            self._release(successor)
+        return {"deleted": True, "path": path, "error": None}
+
+    def clear(self) -> None:
+        del self.keys[:], self.left[:], self.right[:], self._free[:]
+        self.root = NIL
+        self._size = 0
+
+    # -- inspection ---------------------------------------------------------
+
+    def traverse(self, order: str = "in") -> list[float]:
+        keys, left, right = self.keys, self.left, self.right
+        result: list[float] = []
+        if self.root == NIL:
+            return result
+        if order == "level":
+            queue = deque([self.root])
+            while queue:
+                node = queue.popleft()
+                result.append(keys[node])
+                if left[node] != NIL:
+                    queue.append(left[node])
+                if right[node] != NIL:
+                    queue.append(right[node])
+            return result
+        if order == "pre":
+            stack = [self.root]
+            while stack:
+                node = stack.pop()
+                result.append(keys[node])
+                if right[node] != NIL:
+                    stack.append(right[node])
+                if left[node] != NIL:
+                    stack.append(left[node])
+            return result
+        if order == "post":
+            # Reverse of a (node, right, left) preorder.
+            stack = [self.root]
+            while stack:
+                node = stack.pop()
+                result.append(keys[node])
+                if left[node] != NIL:
+                    stack.append(left[node])
+                if right[node] != NIL:
+                    stack.append(right[node])
+            result.reverse()
+            return result
+        stack: list[int] = []
+        node = self.root
+        while stack or node != NIL:
+            while node != NIL:
+                stack.append(node)
+                node = left[node]
+            node = stack.pop()
+            result.append(keys[node])
+            node = right[node]
+        return result
+
+    def _height(self, start: int) -> int:
+        if start == NIL:
+            return 0
+        height = 0
+        level = [start]
+        while level:
+            height += 1
+            level = [
+                child
+                for node in level
+                for child in (self.left[node], self.right[node])
+                if child != NIL
+            ]
+        return height
+
+    def height(self) -> int:
+        return self._height(self.root)
+
+    def balance_factor(self) -> int:
+        """Height of the root's left subtree minus its right subtree."""
+        if self.root == NIL:
+            return 0
+        return self._height(self.left[self.root]) - self._height(self.right[self.root])
+
+    def to_values(self) -> list[float]:
+        return self.traverse("level")
+
+    def __len__(self) -> int:
+        return self._size
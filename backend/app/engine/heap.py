@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import operator
+from array import array
+from collections.abc import Iterable
+
+from .base import OperationError, Structure
+
+
+class HeapStructure(Structure):
+    """Binary heap on a flat ``array('d')``, matching the frontend's sift order."""
+
+    kind = "binaryheap"
+    OPERATIONS = {
+        "insert": ("insert", ("value",)),
+        "extract": ("extract", ()),
+        "remove": ("extract", ()),
+        "peek": ("peek", ()),
+        "set_mode": ("set_mode", ("mode",)),
+        "clear": ("clear", ()),
+    }
+
+    def __init__(self, values: Iterable[float] = (), mode: str = "min") -> None:
+        self.values = array("d", values)
+        self.mode = "max" if mode == "max" else "min"
+        self.heapify()
+
+    @property
+    def _before(self):
+        return operator.lt if self.mode == "min" else operator.gt
+
+    def _bubble_up(self, i: int) -> list[list[int]]:
+        values, before, swaps = self.values, self._before, []
+        while i > 0:
+            parent = (i - 1) // 2
+            if not before(values[i], values[parent]):
+                break
+            values[i], values[parent] = values[parent], values[i]
+            swaps.append([i, parent])
+            i = parent
+        return swaps
+
+    def _bubble_down(self, i: int, record: bool = True) -> list[list[int]]:
+        values, before, swaps = self.values, self._before, []
+        n = len(values)
+        while True:
+            left = 2 * i + 1
+            right = left + 1
+            candidate = i
+            if left < n and before(values[left], values[candidate]):
+                candidate = left
+            if right < n and before(values[right], values[candidate]):
+                candidate = right
+            if candidate == i:
+                return swaps
+            values[i], values[candidate] = values[candidate], values[i]
+            if record:
+                swaps.append([i, candidate])
+            i = candidate
+
+    def heapify(self) -> None:
+        """Bottom-up O(n) build, identical in result to the JS heapify."""
+        for i in range(len(self.values) // 2 - 1, -1, -1):
+            self._bubble_down(i, record=False)
+
+    def set_mode(self, mode: str) -> dict:
+        if mode not in ("min", "max"):
+            raise OperationError("Heap mode must be 'min' or 'max'.")
+        if mode != self.mode:
+            self.mode = mode
+            self.heapify()
+        return {"mode": self.mode}
+
+    def insert(self, value: float) -> dict:
+        self.values.append(value)
+        return {"swaps": self._bubble_up(len(self.values) - 1)}
+
+    def peek(self) -> float | None:
+        return self.values[0] if self.values else None
+
+    def extract(self) -> dict:
+        values = self.values
+        if not values:
+            return {"value": None, "swaps": []}
+        if len(values) == 1:
+            return {"value": values.pop(), "swaps": []}
+        root = values[0]
+        values[0] = values.pop()
+        return {"value": root, "swaps": self._bubble_down(0)}
+
+    def clear(self) -> None:
+        del self.values[:]
+
+    def height(self) -> int:
+        return len(self.values).bit_length()
+
+    def to_values(self) -> list[float]:
+        return self.values.tolist()
+
+    def __len__(self) -> int:
+        return len(self.values)
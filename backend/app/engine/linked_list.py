@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+
+from .base import Structure
+
+
+class LinkedListStructure(Structure):
+    """Singly linked list semantics stored as a contiguous array of values.
+
+    Index-based operations cost O(n) as in the pointer-chasing JS version,
+    but as a memmove instead of per-node traversal and allocation.
+    """
+
+    kind = "linkedlist"
+    OPERATIONS = {
+        "append": ("append", ("value",)),
+        "insert": ("append", ("value",)),
+        "prepend": ("prepend", ("value",)),
+        "insert_at": ("insert_at", ("index", "value")),
+        "delete_at": ("delete_at", ("index",)),
+        "delete_by_value": ("delete_by_value", ("value",)),
+        "remove": ("remove_head", ()),
+        "search": ("search", ("value",)),
+        "clear": ("clear", ()),
+    }
+
+    def __init__(self, values: Iterable[float] = ()) -> None:
+        self.values = array("d", values)
+
+    def append(self, value: float) -> float:
+        self.values.append(value)
+        return value
+
+    def prepend(self, value: float) -> float:
+        self.values.insert(0, value)
+        return value
+
+    def insert_at(self, index: int, value: float) -> dict:
+        if (
+            not isinstance(index, int)
+            or isinstance(index, bool)
+            or index < 0
+            or index > len(self.values)
+        ):
+            return {"error": "Invalid index."}
+        self.values.insert(index, value)
+        return {"index": index}
+
+    def remove_head(self) -> float | None:
+        return self.values.pop(0) if self.values else None
+
+    def delete_at(self, index: int) -> dict:
+        if not self.values:
+            return {"error": "List is empty."}
+        if (
+            not isinstance(index, int)
+            or isinstance(index, bool)
+            or index < 0
+            or index >= len(self.values)
+        ):
+            return {"error": "Invalid index."}
+        return {"removed": self.values.pop(index), "index": index}
+
+    def delete_by_value(self, value: float) -> dict:
+        if not self.values:
+            return {"deleted": False, "visited": [], "error": "List is empty."}
+        try:
+            index = self.values.index(value)
+        except ValueError:
+            return {
+                "deleted": False,
+                "visited": list(range(len(self.values))),
+                "error": "Value not found.",
+            }
+        removed = self.values.pop(index)
+        return {"deleted": True, "removed": removed, "visited": list(range(index + 1))}
+
+    def search(self, value: float) -> dict:
+        try:
+            index = self.values.index(value)
+        except ValueError:
+            return {"found": False, "index": -1, "visited": list(range(len(self.values)))}
+        return {"found": True, "index": index, "visited": list(range(index + 1))}
+
+    def clear(self) -> None:
+        del self.values[:]
+
+    def to_values(self) -> list[float]:
+        return self.values.tolist()
+
+    def __len__(self) -> int:
+        return len(self.values)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+
+from .base import Structure
+
+
+class QueueStructure(Structure):
+    """FIFO queue on a flat array with a moving head offset.
+
+    Dequeue advances ``head`` instead of shifting every element; the consumed
+    prefix is dropped once it exceeds half the buffer, keeping dequeue O(1)
+    amortized where the JS ``Array.shift`` is O(n).
+    """
+
+    kind = "queue"
+    OPERATIONS = {
+        "enqueue": ("enqueue", ("value",)),
+        "insert": ("enqueue", ("value",)),
+        "dequeue": ("dequeue", ()),
+        "remove": ("dequeue", ()),
+        "peek_front": ("peek_front", ()),
+        "peek_rear": ("peek_rear", ()),
+        "clear": ("clear", ()),
+    }
+
+    def __init__(self, values: Iterable[float] = ()) -> None:
+        self.items = array("d", values)
+        self.head = 0
+
+    def enqueue(self, value: float) -> float:
+        self.items.append(value)
+        return value
+
+    def dequeue(self) -> float | None:
+        if self.head >= len(self.items):
+            return None
+        value = self.items[self.head]
+        self.head += 1
+        if self.head * 2 >= len(self.items):
+            del self.items[: self.head]
+            self.head = 0
+        return value
+
+    def peek_front(self) -> float | None:
+        return self.items[self.head] if self.head < len(self.items) else None
+
+    def peek_rear(self) -> float | None:
+        return self.items[-1] if self.head < len(self.items) else None
+
+    def clear(self) -> None:
+        del self.items[:]
+        self.head = 0
+
+    def to_values(self) -> list[float]:
+        return self.items[self.head :].tolist()
+
+    def __len__(self) -> int:
+        return len(self.items) - self.head
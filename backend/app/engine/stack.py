@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+
+from .base import Structure
+
+
+class StackStructure(Structure):
+    kind = "stack"
+    OPERATIONS = {
+        "push": ("push", ("value",)),
+        "insert": ("push", ("value",)),
+        "pop": ("pop", ()),
+        "remove": ("pop", ()),
+        "peek": ("peek", ()),
+        "clear": ("clear", ()),
+    }
+
+    def __init__(self, values: Iterable[float] = ()) -> None:
+        self.items = array("d", values)
+
+    def push(self, value: float) -> float:
+        self.items.append(value)
+        return value
+
+    def pop(self) -> float | None:
+        return self.items.pop() if self.items else None
+
+    def peek(self) -> float | None:
+        return self.items[-1] if self.items else None
+
+    def clear(self) -> None:
+        del self.items[:]
+
+    def to_values(self) -> list[float]:
+        return self.items.tolist()
+
+    def __len__(self) -> int:
+        return len(self.items)
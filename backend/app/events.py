@@ -0,0 +1,111 @@
+"""In-process pub/sub for saved-visualization change events.
+
+Mutating handlers run in Starlette's threadpool and publish after commit;
+SSE streams consume events on the event loop. Each worker process keeps a
+bounded ring buffer so reconnecting clients can resume via Last-Event-ID.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from .core.config import settings
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    user_id: int
+    type: str
+    data: Any
+
+    def encode(self) -> str:
+        payload = json.dumps(self.data, separators=(",", ":"), default=str)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+class StreamLimitExceeded(Exception):
+    pass
+
+
+@dataclass(eq=False)
+class Subscription:
+    user_id: int
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=256))
+    overflowed: bool = False
+
+    def push(self, event: Event) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A stalled client is dropped; it resumes from the ring buffer on reconnect.
+            self.overflowed = True
+
+
+class EventBroker:
+    def __init__(self, buffer_size: int, max_streams: int) -> None:
+        self.max_streams = max_streams
+        self._lock = threading.Lock()
+        self._buffer: deque[Event] = deque(maxlen=buffer_size)
+        self._subscribers: dict[int, set[Subscription]] = {}
+        self._active = 0
+        self._last_id = 0
+
+    @property
+    def active_streams(self) -> int:
+        return self._active
+
+    def publish(self, user_id: int, event_type: str, data: Any) -> Event:
+        with self._lock:
+            self._last_id += 1
+            event = Event(self._last_id, user_id, event_type, data)
+            self._buffer.append(event)
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for sub in subscribers:
+            sub.loop.call_soon_threadsafe(sub.push, event)
+        return event
+
+    def subscribe(
+        self, user_id: int, last_event_id: int | None = None
+    ) -> tuple[Subscription, list[Event] | None]:
+        """Register a stream and return it with the events it missed.
+
+        The replay list is ``None`` when ``last_event_id`` has already been
+        evicted from the ring buffer and the client must reload its state.
+        """
+        with self._lock:
+            if self._active >= self.max_streams:
+                raise StreamLimitExceeded()
+            sub = Subscription(user_id=user_id, loop=asyncio.get_running_loop())
+            self._subscribers.setdefault(user_id, set()).add(sub)
+            self._active += 1
+            if last_event_id is None:
+                return sub, []
+            oldest = self._buffer[0].id if self._buffer else self._last_id + 1
+            if last_event_id < oldest - 1 or last_event_id > self._last_id:
+                # Evicted, or an id from before this process started.
+                return sub, None
+            replay = [
+                e for e in self._buffer if e.id > last_event_id and e.user_id == user_id
+            ]
+            return sub, replay
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subscribers.get(sub.user_id)
+            if subs and sub in subs:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.user_id]
+                self._active -= 1
+
+
+broker = EventBroker(
+    buffer_size=settings.SSE_BUFFER_SIZE, max_streams=settings.SSE_MAX_STREAMS
+)
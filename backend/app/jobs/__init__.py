@@ -0,0 +1,28 @@
+from . import tasks  # noqa: F401  (registers built-in handlers)
+from .queue import (
+    PermanentJobError,
+    enqueue,
+    job_handler,
+    metrics,
+    queue_depth,
+    run_pending,
+)
+from .tasks import (
+    schedule_metadata_backfill,
+    schedule_payload_migration,
+    schedule_usage_reconciliation,
+)
+from .worker import worker_pool
+
+__all__ = [
+    "PermanentJobError",
+    "enqueue",
+    "job_handler",
+    "metrics",
+    "queue_depth",
+    "run_pending",
+    "schedule_metadata_backfill",
+    "schedule_payload_migration",
+    "schedule_usage_reconciliation",
+    "worker_pool",
+]
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, or_, update
+from sqlmodel import Session, select
+
+from ..core.config import settings
+from ..core.metrics import LatencyStats
+from ..db import engine
+from ..models import Job
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[dict], None]
+
+_HANDLERS: dict[str, JobHandler] = {}
+
+# Dialects where SELECT ... FOR UPDATE SKIP LOCKED lets workers claim without blocking.
+_SKIP_LOCKED_DIALECTS = {"mysql", "mariadb", "postgresql"}
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot help; the job fails at once."""
+
+
+class JobMetrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+        # Time from enqueue to completion, and time spent inside the handler.
+        self.latency = LatencyStats()
+        self.run_time = LatencyStats()
+
+    def count(self, outcome: str) -> None:
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def snapshot(self) -> dict:
+        return {
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "failed": self.failed,
+            "latency": self.latency.snapshot(),
+            "run_time": self.run_time.snapshot(),
+        }
+
+
+metrics = JobMetrics()
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register ``func`` as the handler for jobs of ``kind``."""
+
+    def decorator(func: JobHandler) -> JobHandler:
+        _HANDLERS[kind] = func
+        return func
+
+    return decorator
+
+
+def enqueue(
+    session: Session,
+    kind: str,
+    payload: dict | None = None,
+    delay_seconds: float = 0,
+) -> Job:
+    """Add a job to ``session``; it becomes visible to workers when the caller commits."""
+    if kind not in _HANDLERS:
+        raise ValueError(f"No job handler registered for {kind!r}")
+    now = datetime.utcnow()
+    job = Job(
+        kind=kind,
+        payload=payload or {},
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+        run_after=now + timedelta(seconds=delay_seconds),
+        created_at=now,
+    )
+    session.add(job)
+    return job
+
+
+def _claimable(now: datetime):
+    lease_expired = now - timedelta(seconds=settings.JOB_LEASE_SECONDS)
+    return or_(
+        (Job.status == "queued") & (Job.run_after <= now),
+        # Jobs left "running" by a crashed worker are picked up again.
+        (Job.status == "running") & (Job.started_at < lease_expired),
+    )
+
+
+def claim_next(session: Session) -> Job | None:
+    """Atomically mark the next due job as running and return it."""
+    now = datetime.utcnow()
+    query = (
+        select(Job).where(_claimable(now)).order_by(Job.run_after, Job.id).limit(1)
+    )
+    if session.get_bind().dialect.name in _SKIP_LOCKED_DIALECTS:
+        job = session.exec(query.with_for_update(skip_locked=True)).first()
+        if job is None:
+            session.rollback()
+            return None
+        job.status = "running"
+        job.started_at = now
+        job.attempts += 1
+        session.add(job)
+        session.commit()
+        return job
+
+    # Fallback (SQLite): compare-and-set on the candidate row; losing a race just retries.
+    for _ in range(3):
+        job = session.exec(query).first()
+        if job is None:
+            return None
+        claimed = session.exec(
+            update(Job)
+            .where(Job.id == job.id, Job.status == job.status, Job.attempts == job.attempts)
+            .values(status="running", started_at=now, attempts=job.attempts + 1)
+        )
+        session.commit()
+        if claimed.rowcount == 1:
+            session.refresh(job)
+            return job
+    return None
+
+
+def _retry_delay(attempts: int) -> float:
+    return min(
+        settings.JOB_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0)),
+        settings.JOB_RETRY_MAX_SECONDS,
+    )
+
+
+def run_job(session: Session, job: Job) -> None:
+    handler = _HANDLERS.get(job.kind)
+    start = time.perf_counter()
+    try:
+        if handler is None:
+            raise LookupError(f"No job handler registered for {job.kind!r}")
+        handler(job.payload)
+    except Exception as exc:
+        now = datetime.utcnow()
+        job.last_error = f"{type(exc).__name__}: {exc}"[:512]
+        if job.attempts >= job.max_attempts or isinstance(exc, PermanentJobError):
+            job.status = "failed"
+            job.finished_at = now
+            metrics.count("failed")
+            logger.exception("Job %s (%s) failed permanently", job.id, job.kind)
+        else:
+            job.status = "queued"
+            job.run_after = now + timedelta(seconds=_retry_delay(job.attempts))
+            metrics.count("retried")
+            logger.warning("Job %s (%s) failed, retrying: %s", job.id, job.kind, exc)
+    else:
+        job.status = "done"
+        job.finished_at = datetime.utcnow()
+        metrics.count("succeeded")
+        metrics.latency.record((job.finished_at - job.created_at).total_seconds())
+    finally:
+        metrics.run_time.record(time.perf_counter() - start)
+    session.add(job)
+    session.commit()
+
+
+def run_pending(limit: int | None = None) -> int:
+    """Run due jobs in the calling thread until none remain; returns the count run."""
+    processed = 0
+    with Session(engine) as session:
+        while limit is None or processed < limit:
+            job = claim_next(session)
+            if job is None:
+                break
+            run_job(session, job)
+            processed += 1
+    return processed
+
+
+def queue_depth(session: Session) -> dict:
+    rows = session.exec(
+        select(Job.status, func.count()).where(Job.status != "done").group_by(Job.status)
+    ).all()
+    depth = {"queued": 0, "running": 0, "failed": 0}
+    depth.update({status: count for status, count in rows})
+    return depth
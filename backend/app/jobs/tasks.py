@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlmodel import Session, select, update
+
+from ..core.config import settings
+from ..db import engine
+from ..models import Job, PayloadBlob, SavedVisualization, User, UserUsage
+from ..storage import get_storage
+from ..utils.payload_blobs import store_payload
+from ..utils.payloads import numeric_values
+from ..utils.revisions import current_values, fold_revisions, has_pending_edits
+from ..utils.usage import charge_usage, stored_bytes
+from ..utils.visualization_metadata import apply_metadata
+from .queue import PermanentJobError, enqueue, job_handler
+
+logger = logging.getLogger(__name__)
+
+
+@job_handler("delete_media")
+def delete_media(payload: dict) -> None:
+    """Remove a media object from storage; missing objects are not an error.
+
+    Snapshot keys are content-addressed, so a republish after the delete was
+    queued can point a visualization at the same key again; such keys stay.
+    """
+    path_value = payload.get("path")
+    if not path_value:
+        return
+    with Session(engine) as session:
+        in_use = session.exec(
+            select(SavedVisualization.id)
+            .where(SavedVisualization.snapshot == path_value)
+            .limit(1)
+        ).first()
+    if in_use is not None:
+        return
+    try:
+        get_storage().remove(path_value)
+    except ValueError as exc:
+        # A key outside the media root will never become valid.
+        raise PermanentJobError(str(exc)) from exc
+
+
+@job_handler("backfill_visualization_metadata")
+def backfill_visualization_metadata(payload: dict) -> None:
+    """Fill metadata columns for one batch of rows, then enqueue the next batch.
+
+    Rows whose payload is not numeric get ``element_count = 0`` and no other
+    metadata, so neither this job nor the startup check picks them up again.
+    """
+    after_id = int(payload.get("after_id", 0))
+    batch_size = int(payload.get("batch_size", settings.METADATA_BACKFILL_BATCH_SIZE))
+    with Session(engine) as session:
+        rows = session.exec(
+            select(SavedVisualization)
+            .where(
+                SavedVisualization.element_count.is_(None),
+                SavedVisualization.id > after_id,
+            )
+            .order_by(SavedVisualization.id)
+            .limit(batch_size)
+        ).all()
+        for viz in rows:
+            try:
+                values = current_values(viz)
+            except ValueError:
+                viz.element_count = 0
+            else:
+                apply_metadata(viz, values)
+            session.add(viz)
+        if len(rows) == batch_size:
+            enqueue(
+                session,
+                "backfill_visualization_metadata",
+                {"after_id": rows[-1].id, "batch_size": batch_size},
+            )
+        session.commit()
+
+
+@job_handler("migrate_inline_payloads")
+def migrate_inline_payloads(payload: dict) -> None:
+    """Move one batch of legacy inline payloads into payload_blobs, then continue."""
+    after_id = int(payload.get("after_id", 0))
+    batch_size = int(payload.get("batch_size", settings.METADATA_BACKFILL_BATCH_SIZE))
+    with Session(engine) as session:
+        rows = session.exec(
+            select(SavedVisualization)
+            .where(
+                SavedVisualization.payload_hash.is_(None),
+                SavedVisualization.id > after_id,
+            )
+            .order_by(SavedVisualization.id)
+            .limit(batch_size)
+        ).all()
+        for viz in rows:
+            try:
+                values = numeric_values(viz.payload)
+            except ValueError:
+                continue
+            digest, size = store_payload(session, values)
+            # Already stored, so counted even past the quota.
+            charge_usage(session, viz.user_id, payload_bytes=size, enforce=False)
+            viz.payload_hash = digest
+            viz.payload_bytes = size
+            viz.payload = None
+            session.add(viz)
+        if len(rows) == batch_size:
+            enqueue(
+                session,
+                "migrate_inline_payloads",
+                {"after_id": rows[-1].id, "batch_size": batch_size},
+            )
+        session.commit()
+
+
+@job_handler("fold_visualization_revisions")
+def fold_visualization_revisions(payload: dict) -> None:
+    """Compact a visualization's pending edits into a new payload blob.
+
+    PATCH folds inline once the tail reaches REVISION_CHECKPOINT_INTERVAL;
+    this job catches the shorter tails left behind by a burst of edits.
+    """
+    with Session(engine) as session:
+        viz = session.get(SavedVisualization, int(payload["id"]), with_for_update=True)
+        if viz is None or not has_pending_edits(viz):
+            return
+        fold_revisions(session, viz)
+        session.commit()
+
+
+def _job_pending(session: Session, kind: str) -> bool:
+    """True if a job of ``kind`` is already queued or running."""
+    job_id = session.exec(
+        select(Job.id)
+        .where(Job.kind == kind, Job.status.in_(("queued", "running")))
+        .limit(1)
+    ).first()
+    return job_id is not None
+
+
+def schedule_metadata_backfill() -> bool:
+    """Enqueue a backfill if any saved visualization still lacks metadata."""
+    with Session(engine) as session:
+        if _job_pending(session, "backfill_visualization_metadata"):
+            return False
+        pending = session.exec(
+            select(SavedVisualization.id)
+            .where(SavedVisualization.element_count.is_(None))
+            .limit(1)
+        ).first()
+        if pending is None:
+            return False
+        enqueue(session, "backfill_visualization_metadata")
+        session.commit()
+    return True
+
+
+def schedule_payload_migration() -> bool:
+    """Enqueue a migration if any saved visualization still stores its payload inline."""
+    with Session(engine) as session:
+        if _job_pending(session, "migrate_inline_payloads"):
+            return False
+        pending = session.exec(
+            select(SavedVisualization.id)
+            .where(SavedVisualization.payload_hash.is_(None))
+            .limit(1)
+        ).first()
+        if pending is None:
+            return False
+        enqueue(session, "migrate_inline_payloads")
+        session.commit()
+    return True
+
+
+@job_handler("reconcile_user_usage")
+def reconcile_user_usage(payload: dict) -> None:
+    """Recount usage for one batch of users from their saved rows, then continue.
+
+    Also fills ``payload_bytes`` on rows that predate the column. Picture
+    sizes cannot be recounted from the database; they are only reset when
+    the user no longer has a picture.
+    """
+    after_id = int(payload.get("after_id", 0))
+    batch_size = int(payload.get("batch_size", settings.USAGE_RECONCILE_BATCH_SIZE))
+    with Session(engine) as session:
+        # Lock the counters before any plain read, so writers wait instead of
+        # racing the recount and the counts below are not read from an older
+        # snapshot (REPEATABLE READ starts it at the first plain read). Every
+        # row belongs to a user, so the first batch_size rows past after_id
+        # cover all rows of the users batch below.
+        locked = session.exec(
+            select(UserUsage)
+            .where(UserUsage.user_id > after_id)
+            .order_by(UserUsage.user_id)
+            .limit(batch_size)
+            .with_for_update()
+        ).all()
+        users = session.exec(
+            select(User.id, User.profile_picture)
+            .where(User.id > after_id)
+            .order_by(User.id)
+            .limit(batch_size)
+        ).all()
+        if not users:
+            return
+        user_ids = [user_id for user_id, _ in users]
+        existing = {usage.user_id: usage for usage in locked}
+        session.exec(
+            update(SavedVisualization)
+            .where(
+                SavedVisualization.user_id.in_(user_ids),
+                SavedVisualization.payload_bytes.is_(None),
+                SavedVisualization.payload_hash.is_not(None),
+            )
+            .values(
+                payload_bytes=select(PayloadBlob.size_bytes)
+                .where(PayloadBlob.hash == SavedVisualization.payload_hash)
+                .scalar_subquery()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        totals = {
+            user_id: (count, total)
+            for user_id, count, total in session.exec(
+                select(
+                    SavedVisualization.user_id,
+                    func.count(SavedVisualization.id),
+                    stored_bytes(),
+                )
+                .where(SavedVisualization.user_id.in_(user_ids))
+                .group_by(SavedVisualization.user_id)
+            )
+        }
+        repaired = 0
+        for user_id, profile_picture in users:
+            count, total = totals.get(user_id, (0, 0))
+            usage = existing.get(user_id) or UserUsage(user_id=user_id)
+            picture_bytes = usage.picture_bytes if profile_picture else 0
+            if (usage.visualization_count, usage.payload_bytes, usage.picture_bytes) == (
+                count,
+                total,
+                picture_bytes,
+            ):
+                continue
+            usage.visualization_count = count
+            usage.payload_bytes = total
+            usage.picture_bytes = picture_bytes
+            usage.updated_at = datetime.utcnow()
+            session.add(usage)
+            repaired += 1
+        if repaired:
+            logger.info("Repaired usage counters for %d users", repaired)
+        if len(users) == batch_size:
+            enqueue(
+                session,
+                "reconcile_user_usage",
+                {"after_id": user_ids[-1], "batch_size": batch_size},
+            )
+        session.commit()
+
+
+def schedule_usage_reconciliation() -> bool:
+    """Enqueue a usage recount unless one is already queued or running."""
+    with Session(engine) as session:
+        if _job_pending(session, "reconcile_user_usage"):
+            return False
+        enqueue(session, "reconcile_user_usage")
+        session.commit()
+    return True
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import logging
+import threading
+
+from ..core.config import settings
+from .queue import run_pending
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorkerPool:
+    """Daemon threads that poll the jobs table and run due jobs."""
+
+    def __init__(self, workers: int, poll_interval: float) -> None:
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name=f"job-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info("Started %d job worker(s)", self.workers)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                processed = run_pending(limit=10)
+            except Exception:
+                logger.exception("Job worker loop failed")
+                processed = 0
+            if not processed:
+                self._stop.wait(self.poll_interval)
+
+
+worker_pool = JobWorkerPool(
+    workers=settings.JOB_WORKERS, poll_interval=settings.JOB_POLL_INTERVAL_SECONDS
+)
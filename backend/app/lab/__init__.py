@@ -0,0 +1,14 @@
+"""Server-side benchmarking of the structure engine (POST /lab/benchmarks).
+
+Benchmark workers are spawned processes that import ``app.lab.workloads``, and
+with it this package, so only the settings-free workloads are re-exported
+here. The pool that needs settings is imported from ``app.lab.pool``.
+"""
+
+from .workloads import DISTRIBUTIONS, WORKLOADS, run_workload
+
+__all__ = [
+    "DISTRIBUTIONS",
+    "WORKLOADS",
+    "run_workload",
+]
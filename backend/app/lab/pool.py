@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ..core.config import settings
+from .workloads import init_worker, run_limited
+
+logger = logging.getLogger(__name__)
+
+# Recycle workers now and then; a 10M-element run leaves a large heap behind.
+_TASKS_PER_WORKER = 20
+
+
+class LabBusy(Exception):
+    """Every benchmark slot is taken; the caller should retry later."""
+
+
+class BenchmarkLab:
+    """Runs lab workloads in a bounded process pool and caches their results.
+
+    Workers are spawned on first use, so the API process never forks with
+    its threads running and pays nothing at startup. Identical requests share
+    one run while it is in flight, and completed results are kept in an LRU
+    keyed by the request parameters; runs cut short by the CPU limit are not
+    cached because they depend on machine load.
+
+    Only used from the event loop thread, so no locking is needed.
+    """
+
+    def __init__(self, workers: int, max_pending: int, cache_size: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._executor: ProcessPoolExecutor | None = None
+        self._cache: OrderedDict[tuple, dict] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Future] = {}
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=max(1, self.workers),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+                max_tasks_per_child=_TASKS_PER_WORKER,
+            )
+        return self._executor
+
+    @staticmethod
+    def _key(params: dict) -> tuple:
+        return tuple(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in sorted(params.items())
+        )
+
+    async def run(self, params: dict, cpu_seconds: float) -> tuple[dict, bool]:
+        """Return ``(result, cached)`` for the workload described by ``params``."""
+        key = self._key(params)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached, True
+        running = self._inflight.get(key)
+        if running is None:
+            if len(self._inflight) >= self.max_pending:
+                raise LabBusy
+            self.misses += 1
+            running = asyncio.ensure_future(self._execute(key, params, cpu_seconds))
+            self._inflight[key] = running
+            running.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one client disconnecting does not cancel a shared run.
+        return await asyncio.shield(running), False
+
+    async def _execute(self, key: tuple, params: dict, cpu_seconds: float) -> dict:
+        try:
+            result = await asyncio.wrap_future(
+                self._pool().submit(run_limited, params, cpu_seconds)
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. killed at the hard CPU limit); start afresh.
+            logger.warning("Benchmark worker pool broke; recreating it")
+            self.shutdown(wait=False)
+            raise
+        if not result["truncated"]:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def snapshot(self) -> dict:
+        return {
+            "running": len(self._inflight),
+            "cached": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+benchmark_lab = BenchmarkLab(
+    workers=settings.LAB_WORKERS,
+    max_pending=settings.LAB_MAX_PENDING,
+    cache_size=settings.LAB_CACHE_SIZE,
+)
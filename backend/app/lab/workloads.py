@@ -0,0 +1,186 @@
+"""Timed operation workloads over the server-side structure engine.
+
+This module runs inside the benchmark worker processes, so it only depends on
+``app.engine`` and the standard library: no settings, database or web stack.
+"""
+
+from __future__ import annotations
+
+import random
+import signal
+import time
+from array import array
+from collections.abc import Callable, Sequence
+
+from ..engine import BstStructure, HeapStructure, QueueStructure, StackStructure
+
+# Operations between CPU-time checks; keeps the check cost out of the timings.
+_CHECK_EVERY = 4096
+# Extra CPU seconds before the RLIMIT_CPU backstop fires, past the soft checks.
+_HARD_LIMIT_GRACE = 2
+
+DISTRIBUTIONS = ("random", "sorted", "reversed", "few_unique")
+
+
+class CpuLimitExceeded(Exception):
+    """The job used up its CPU-time budget."""
+
+
+def _dataset(distribution: str, size: int, seed: int) -> array:
+    if distribution == "sorted":
+        return array("d", range(size))
+    if distribution == "reversed":
+        return array("d", range(size, 0, -1))
+    rng = random.Random(seed)
+    if distribution == "few_unique":
+        return array("d", rng.choices(range(16), k=size))
+    return array("d", (rng.random() for _ in range(size)))
+
+
+def _timed(operation: Callable, args: Sequence, deadline: float) -> float:
+    """Call ``operation`` once per item of ``args``; return elapsed wall seconds."""
+    start = time.perf_counter()
+    for offset in range(0, len(args), _CHECK_EVERY):
+        for value in args[offset : offset + _CHECK_EVERY]:
+            operation(value)
+        if time.process_time() > deadline:
+            raise CpuLimitExceeded
+    return time.perf_counter() - start
+
+
+def _timed_calls(operation: Callable, count: int, deadline: float) -> float:
+    """Call ``operation()`` ``count`` times; return elapsed wall seconds."""
+    start = time.perf_counter()
+    for offset in range(0, count, _CHECK_EVERY):
+        for _ in range(min(_CHECK_EVERY, count - offset)):
+            operation()
+        if time.process_time() > deadline:
+            raise CpuLimitExceeded
+    return time.perf_counter() - start
+
+
+def _stack(values: array, deadline: float) -> dict[str, float]:
+    stack = StackStructure()
+    return {
+        "push": _timed(stack.push, values, deadline),
+        "pop": _timed_calls(stack.pop, len(values), deadline),
+    }
+
+
+def _queue(values: array, deadline: float) -> dict[str, float]:
+    queue = QueueStructure()
+    return {
+        "enqueue": _timed(queue.enqueue, values, deadline),
+        "dequeue": _timed_calls(queue.dequeue, len(values), deadline),
+    }
+
+
+def _bst(values: array, deadline: float) -> dict[str, float]:
+    tree = BstStructure()
+    return {
+        "insert": _timed(tree.insert, values, deadline),
+        "search": _timed(tree.search, values, deadline),
+    }
+
+
+def _heap(values: array, deadline: float) -> dict[str, float]:
+    heap = HeapStructure()
+    return {
+        "insert": _timed(heap.insert, values, deadline),
+        "extract": _timed_calls(heap.extract, len(values), deadline),
+    }
+
+
+# structure -> (workload name, runner, {operation: complexity claim}).
+# The claims mirror frontend/src/data/structureInfo.js.
+WORKLOADS: dict[str, tuple[str, Callable[[array, float], dict[str, float]], dict]] = {
+    "stack": ("push_pop", _stack, {"push": "O(1)", "pop": "O(1)"}),
+    "queue": ("enqueue_dequeue", _queue, {"enqueue": "O(1)", "dequeue": "O(1)"}),
+    "bst": (
+        "insert_search",
+        _bst,
+        {"insert": "O(log n) average, O(n) worst", "search": "O(log n) average, O(n) worst"},
+    ),
+    "binaryheap": ("insert_extract", _heap, {"insert": "O(log n)", "extract": "O(log n)"}),
+}
+
+
+def run_workload(
+    structure: str,
+    distribution: str,
+    sizes: Sequence[int],
+    seed: int,
+    repeats: int,
+    cpu_seconds: float,
+) -> dict:
+    """Time each operation of ``structure``'s workload at every size.
+
+    Sizes run in ascending order. Once the CPU budget is spent the remaining
+    sizes are skipped and ``truncated`` is set, so a degenerate case (sorted
+    input into a BST) still returns the part of the curve it managed.
+    """
+    workload, runner, complexity = WORKLOADS[structure]
+    deadline = time.process_time() + cpu_seconds
+    series = {operation: [] for operation in complexity}
+    truncated = False
+    for size in sorted(set(sizes)):
+        try:
+            values = _dataset(distribution, size, seed)
+            # Best of ``repeats`` runs, the usual way to filter scheduler noise.
+            runs = [runner(values, deadline) for _ in range(repeats)]
+        except CpuLimitExceeded:
+            truncated = True
+            break
+        for operation in complexity:
+            seconds = min(run[operation] for run in runs)
+            series[operation].append(
+                {
+                    "size": size,
+                    "seconds": seconds,
+                    "ns_per_op": seconds / size * 1e9 if size else 0.0,
+                }
+            )
+    return {
+        "structure": structure,
+        "workload": workload,
+        "distribution": distribution,
+        "seed": seed,
+        "repeats": repeats,
+        "truncated": truncated,
+        "series": [
+            {"operation": operation, "complexity": claim, "points": series[operation]}
+            for operation, claim in complexity.items()
+        ],
+    }
+
+
+def _on_cpu_limit(signum, frame) -> None:
+    raise CpuLimitExceeded
+
+
+def init_worker() -> None:
+    """Process pool initializer: turn SIGXCPU into CpuLimitExceeded."""
+    if hasattr(signal, "SIGXCPU"):
+        signal.signal(signal.SIGXCPU, _on_cpu_limit)
+
+
+def run_limited(params: dict, cpu_seconds: float) -> dict:
+    """Worker entry point: ``run_workload`` with an RLIMIT_CPU backstop.
+
+    The workload checks its own budget between operation blocks; the rlimit
+    only fires if a single step (building a huge dataset) overruns.
+    """
+    try:
+        import resource
+    except ImportError:  # not on this platform; the soft checks still apply
+        return run_workload(cpu_seconds=cpu_seconds, **params)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    limit = int(usage.ru_utime + usage.ru_stime + cpu_seconds) + _HARD_LIMIT_GRACE
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+    try:
+        return run_workload(cpu_seconds=cpu_seconds, **params)
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
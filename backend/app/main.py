@@ -1,15 +1,46 @@
-from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 import logging
 
+from sqlmodel import Session
+
 from .core.config import settings
-from .db import init_db
-from .routers import auth, profile
+from .core.constants import SNAPSHOT_CACHE_CONTROL
+from .core.health import db_probe
+from .core.logging import configure_logging, shutdown_logging
+from .core.periodic import PeriodicThread
+from .core.revocation import sync_revocations
+from .db import get_session, init_db
+from .jobs import metrics as job_metrics
+from .jobs import (
+    queue_depth,
+    schedule_metadata_backfill,
+    schedule_payload_migration,
+    schedule_usage_reconciliation,
+    worker_pool,
+)
+from .middleware import AdmissionControlMiddleware, ProfilingMiddleware, RequestIdMiddleware
+from .lab.pool import benchmark_lab
+from .routers import admin, auth, batch, lab, profile
+from .storage import get_storage
+from .utils.payload_blobs import collect_garbage
+from .utils.static_files import CachedStaticFiles
 
 logger = logging.getLogger(__name__)
 
+revocation_sync = PeriodicThread(
+    "revocation-sync", settings.REVOCATION_REFRESH_SECONDS, sync_revocations
+)
+db_probe_thread = PeriodicThread(
+    "db-probe", settings.HEALTH_DB_PROBE_SECONDS, db_probe.run_once
+)
+payload_gc = PeriodicThread("payload-gc", settings.PAYLOAD_GC_SECONDS, collect_garbage)
+usage_reconcile = PeriodicThread(
+    "usage-reconcile", settings.USAGE_RECONCILE_SECONDS, schedule_usage_reconciliation
+)
+
 API_VERSION = "v1"
 
 tags_metadata = [
@@ -25,6 +56,14 @@ tags_metadata = [
         "name": "profile",
         "description": "Profile management, saved visualizations CRUD, and profile picture upload.",
     },
+    {
+        "name": "batch",
+        "description": "Several API requests in one round trip with one auth check.",
+    },
+    {
+        "name": "lab",
+        "description": "Server-side timing curves for the structure engine's operations.",
+    },
 ]
 
 app = FastAPI(
@@ -40,6 +79,12 @@ app = FastAPI(
     },
 )
 
+# Added first so it runs inside admission control; shed requests are never profiled.
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(AdmissionControlMiddleware)
+# Outermost of ours, so shed and profiled requests carry a request id too.
+app.add_middleware(RequestIdMiddleware)
+
 # CORS only in dev (local Vite)
 if settings.ENV.lower() == "dev":
     app.add_middleware(
@@ -55,10 +100,14 @@ if settings.ENV.lower() == "dev":
 def on_startup() -> None:
     if settings.ENV.lower() == "test":
         return
+    configure_logging(settings.LOG_LEVEL, json_output=settings.LOG_JSON)
+    # Fail fast on a misconfigured media backend rather than on the first upload.
+    get_storage()
     # Only pings DB; no DDL.
     init_db()
     settings.MEDIA_ROOT_PATH.mkdir(parents=True, exist_ok=True)
     settings.PROFILE_PICTURE_PATH.mkdir(parents=True, exist_ok=True)
+    settings.SNAPSHOT_PATH.mkdir(parents=True, exist_ok=True)
     static_dir = settings.STATIC_ROOT_PATH
     index_file = static_dir / "index.html"
     logger.info(
@@ -67,6 +116,28 @@ def on_startup() -> None:
         static_dir.exists(),
         index_file.exists(),
     )
+    db_probe.run_once()
+    db_probe_thread.start()
+    sync_revocations()
+    revocation_sync.start()
+    schedule_payload_migration()
+    schedule_metadata_backfill()
+    schedule_usage_reconciliation()
+    payload_gc.start()
+    usage_reconcile.start()
+    if settings.JOB_WORKERS > 0:
+        worker_pool.start()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    db_probe_thread.stop()
+    revocation_sync.stop()
+    payload_gc.stop()
+    usage_reconcile.stop()
+    worker_pool.stop()
+    benchmark_lab.shutdown()
+    shutdown_logging()
 
 
 # All API endpoints live under /api/v1
@@ -79,13 +150,28 @@ def health() -> dict:
 
 
 @api.get("/health/db", tags=["health"])
-def health_db() -> dict:
-    return {"db": "ok"}
+def health_db():
+    # Served from the background probe so health checks never queue for the DB.
+    status = db_probe.status
+    if status["db"] == "down":
+        return JSONResponse(status_code=503, content=status)
+    return status
+
+
+@api.get("/health/jobs", tags=["health"])
+def health_jobs(session: Session = Depends(get_session)) -> dict:
+    return {"queue": queue_depth(session), **job_metrics.snapshot()}
 
 
 # Auth routes: /api/v1/auth/...
 api.include_router(auth.router)
 api.include_router(profile.router)
+# Several API calls in one round trip: POST /api/v1/batch
+api.include_router(batch.router)
+# Structure benchmarks in a process pool: POST /api/v1/lab/benchmarks
+api.include_router(lab.router)
+# Profiling tools: /api/v1/admin/... (X-Profile-Token required)
+api.include_router(admin.router)
 
 
 @app.exception_handler(HTTPException)
@@ -93,14 +179,25 @@ def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
         content={"error": exc.detail, "status_code": exc.status_code},
+        headers=getattr(exc, "headers", None),
     )
 
 
 @app.exception_handler(Exception)
 def unhandled_exception_handler(request: Request, exc: Exception):
+    # Runs outside RequestIdMiddleware, so the id is passed explicitly.
+    request_id = getattr(request.state, "request_id", None)
+    logger.error(
+        "Unhandled error on %s %s",
+        request.method,
+        request.url.path,
+        exc_info=exc,
+        extra={"request_id": request_id},
+    )
     return JSONResponse(
         status_code=500,
-        content={"error": "Internal Server Error"},
+        content={"error": "Internal Server Error", "request_id": request_id},
+        headers={"X-Request-ID": request_id} if request_id else None,
     )
 
 
@@ -108,7 +205,12 @@ app.include_router(api)
 
 app.mount(
     settings.MEDIA_URL,
-    StaticFiles(directory=str(settings.MEDIA_ROOT_PATH), check_dir=False),
+    CachedStaticFiles(
+        directory=str(settings.MEDIA_ROOT_PATH),
+        check_dir=False,
+        immutable_prefixes=(settings.SNAPSHOT_DIR,),
+        cache_control=SNAPSHOT_CACHE_CONTROL,
+    ),
     name="media",
 )
 
@@ -0,0 +1,10 @@
+from .admission import AdmissionControlMiddleware, admission_controller
+from .profiling import ProfilingMiddleware
+from .request_id import RequestIdMiddleware
+
+__all__ = [
+    "AdmissionControlMiddleware",
+    "ProfilingMiddleware",
+    "RequestIdMiddleware",
+    "admission_controller",
+]
@@ -0,0 +1,107 @@
+"""Profile single requests on demand, or 1 in N requests when sampling is enabled.
+
+A request is profiled when it carries ``X-Profile: 1`` (or ``?profile=1``)
+together with a valid ``X-Profile-Token``. The response then carries
+``X-Profile-Id``; the report is read back from ``/api/v1/admin/profiles``.
+When neither trigger applies the cost is one counter increment and a
+header lookup.
+"""
+
+from __future__ import annotations
+
+import itertools
+import time
+from urllib.parse import parse_qs
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core.config import settings
+from ..core.profiling import (
+    PROFILE_TOKEN_HEADER,
+    ProfileReport,
+    ProfileStore,
+    StackSampler,
+    admin_token_matches,
+    profile_store,
+)
+
+API_PREFIX = "/api/"
+ADMIN_PREFIX = "/api/v1/admin/"
+
+
+def _requested(scope: Scope, headers: Headers) -> bool:
+    if headers.get("x-profile") == "1":
+        return True
+    query = scope.get("query_string", b"")
+    return b"profile=" in query and parse_qs(query.decode()).get("profile") == ["1"]
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: int | None = None,
+        store: ProfileStore | None = None,
+    ) -> None:
+        self.app = app
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.store = store or profile_store
+        self._counter = itertools.count(1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if (
+            scope["type"] != "http"
+            or not path.startswith(API_PREFIX)
+            or path.startswith(ADMIN_PREFIX)
+            or path.endswith("/stream")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        trigger = None
+        if self.sample_rate > 0 and next(self._counter) % self.sample_rate == 0:
+            trigger = "sampled"
+        if settings.PROFILING_ADMIN_TOKEN:
+            headers = Headers(scope=scope)
+            if _requested(scope, headers) and admin_token_matches(
+                headers.get(PROFILE_TOKEN_HEADER)
+            ):
+                trigger = "header"
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        report_id = self.store.next_id()
+        status: int | None = None
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-profile-id", str(report_id).encode()),
+                ]
+            await send(message)
+
+        sampler = StackSampler(settings.PROFILING_INTERVAL_MS / 1000)
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            sampler.stop()
+            self.store.add(
+                ProfileReport(
+                    id=report_id,
+                    method=scope.get("method", ""),
+                    path=path,
+                    status=status,
+                    duration_ms=round((time.perf_counter() - start) * 1000, 3),
+                    samples=sampler.samples,
+                    trigger=trigger,
+                    stacks=dict(sampler.stacks),
+                )
+            )
@@ -0,0 +1,89 @@
+"""Tag each request with an id and write one access log line per request.
+
+The id comes from an incoming ``X-Request-ID`` header when it looks sane,
+otherwise a new one is generated. It is echoed on the response and attached
+to every log record emitted while the request runs.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import re
+import time
+import uuid
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core.config import settings
+from ..core.logging import request_id_var
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+access_logger = logging.getLogger("app.access")
+
+
+class RequestIdMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float | None = None,
+        slow_ms: float | None = None,
+    ) -> None:
+        self.app = app
+        self.sample_rate = (
+            settings.ACCESS_LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+        )
+        self.slow_ms = settings.ACCESS_LOG_SLOW_MS if slow_ms is None else slow_ms
+
+    def should_log(self, status: int, duration_ms: float) -> bool:
+        if status >= 400 or duration_ms >= self.slow_ms:
+            return True
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = Headers(scope=scope).get(REQUEST_ID_HEADER)
+        request_id = (
+            incoming if incoming and _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+        )
+        # Exposed as request.state.request_id for handlers outside this middleware.
+        scope.setdefault("state", {})["request_id"] = request_id
+        token = request_id_var.set(request_id)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-request-id", request_id.encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if self.should_log(status, duration_ms):
+                access_logger.info(
+                    "%s %s %s",
+                    scope.get("method"),
+                    scope.get("path"),
+                    status,
+                    extra={
+                        "request_id": request_id,
+                        "method": scope.get("method"),
+                        "path": scope.get("path"),
+                        "status": status,
+                        "duration_ms": round(duration_ms, 3),
+                    },
+                )
+            request_id_var.reset(token)
@@ -1,6 +1,19 @@
 from datetime import datetime
 
-from sqlalchemy import JSON, Column, Enum, TIMESTAMP, text, String
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    Column,
+    Double,
+    Enum,
+    Index,
+    Integer,
+    TIMESTAMP,
+    String,
+    UniqueConstraint,
+    text,
+)
 from sqlmodel import Field, Relationship, SQLModel
 
 class User(SQLModel, table=True):
@@ -20,10 +33,33 @@ class User(SQLModel, table=True):
     )
 
 
+class PayloadBlob(SQLModel, table=True):
+    """payload_blobs table mapping (content-addressed visualization values)."""
+
+    __tablename__ = "payload_blobs"
+
+    # sha256 of the canonical JSON encoding of the normalized values.
+    hash: str = Field(primary_key=True, max_length=64)
+    values: list = Field(sa_column=Column(JSON, nullable=False))
+    size_bytes: int
+    ref_count: int = Field(default=0, index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class SavedVisualization(SQLModel, table=True):
     """saved_visualizations table mapping."""
 
     __tablename__ = "saved_visualizations"
+    # Fetch server-side defaults (timestamps) in the INSERT/UPDATE itself.
+    __mapper_args__ = {"eager_defaults": True}
+    # Listing sorts/filters within one user's rows, so every index leads with user_id.
+    __table_args__ = (
+        Index("ix_saved_visualizations_user_created", "user_id", "created_at"),
+        Index("ix_saved_visualizations_user_element_count", "user_id", "element_count"),
+        Index("ix_saved_visualizations_user_min_value", "user_id", "min_value"),
+        Index("ix_saved_visualizations_user_max_value", "user_id", "max_value"),
+        Index("ix_saved_visualizations_user_height", "user_id", "height"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     user_id: int = Field(index=True, foreign_key="users.id")
@@ -42,7 +78,46 @@ class SavedVisualization(SQLModel, table=True):
         )
     )
     name: str = Field(sa_column=Column(String(100), nullable=False))
-    payload: dict | list = Field(sa_column=Column(JSON, nullable=False))  # MySQL JSON
+    # Legacy inline values (MySQL JSON); new rows reference a payload_blobs row instead.
+    payload: dict | list | None = Field(
+        default=None, sa_column=Column(JSON(none_as_null=True), nullable=True)
+    )
+    payload_hash: str | None = Field(
+        default=None, foreign_key="payload_blobs.hash", index=True, max_length=64
+    )
+    # Relative media path of the published snapshot, e.g. "snapshots/<sha256>.json".
+    snapshot: str | None = Field(
+        default=None, sa_column=Column(String(512), nullable=True, index=True)
+    )
+    # Derived from payload at write time; NULL until computed (see backfill job).
+    element_count: int | None = Field(default=None, sa_column=Column(Integer, nullable=True))
+    min_value: float | None = Field(default=None, sa_column=Column(Double, nullable=True))
+    max_value: float | None = Field(default=None, sa_column=Column(Double, nullable=True))
+    is_sorted: bool | None = Field(default=None, sa_column=Column(Boolean, nullable=True))
+    # Only for tree-shaped kinds (bst, binaryheap).
+    height: int | None = Field(default=None, sa_column=Column(Integer, nullable=True))
+    balance_factor: int | None = Field(
+        default=None, sa_column=Column(Integer, nullable=True)
+    )
+    # Canonical size of the referenced blob, counted towards the owner's quota.
+    # NULL on rows that predate it until reconcile_user_usage fills it in.
+    payload_bytes: int | None = Field(
+        default=None, sa_column=Column(BigInteger, nullable=True)
+    )
+    # Checkpoint blobs this row's edits have superseded, also counted towards
+    # the quota: they stay referenced by visualization_revisions.
+    history_bytes: int = Field(
+        default=0, sa_column=Column(BigInteger, nullable=False, server_default=text("0"))
+    )
+    # Bumped by every PATCH; history lives in visualization_revisions.
+    revision: int = Field(
+        default=0, sa_column=Column(Integer, nullable=False, server_default=text("0"))
+    )
+    # Revision held by payload_hash (and by a checkpoint row); later revisions
+    # are deltas not yet folded in. NULL until the first PATCH.
+    base_revision: int | None = Field(
+        default=None, sa_column=Column(Integer, nullable=True)
+    )
     created_at: datetime = Field(
         sa_column=Column(
             TIMESTAMP,
@@ -61,6 +136,18 @@ class SavedVisualization(SQLModel, table=True):
     user: User | None = Relationship(back_populates="saved_visualizations")
 
 
+class UserUsage(SQLModel, table=True):
+    """user_usage table mapping (running storage totals, one row per user)."""
+
+    __tablename__ = "user_usage"
+
+    user_id: int = Field(primary_key=True, foreign_key="users.id")
+    visualization_count: int = Field(default=0)
+    payload_bytes: int = Field(default=0, sa_column=Column(BigInteger, nullable=False))
+    picture_bytes: int = Field(default=0, sa_column=Column(BigInteger, nullable=False))
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class AuditLog(SQLModel, table=True):
     """audit_log table mapping."""
 
@@ -71,3 +158,60 @@ class AuditLog(SQLModel, table=True):
     action: str = Field(max_length=64)
     detail: str | None = Field(default=None, max_length=512)
     created_at: datetime | None = None
+
+
+class Job(SQLModel, table=True):
+    """jobs table mapping (durable background job queue)."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_status_run_after", "status", "run_after"),)
+
+    id: int | None = Field(default=None, primary_key=True)
+    kind: str = Field(max_length=64)
+    payload: dict = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    status: str = Field(default="queued", max_length=16)  # queued, running, done, failed
+    attempts: int = Field(default=0)
+    max_attempts: int = Field(default=5)
+    run_after: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    last_error: str | None = Field(default=None, max_length=512)
+
+
+class RevokedToken(SQLModel, table=True):
+    """revoked_tokens table mapping (logged-out JWTs until they expire)."""
+
+    __tablename__ = "revoked_tokens"
+
+    id: int | None = Field(default=None, primary_key=True)
+    jti: str = Field(index=True, unique=True, max_length=64)
+    user_id: int | None = Field(default=None, index=True)
+    expires_at: datetime = Field(index=True)
+    revoked_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class VisualizationRevision(SQLModel, table=True):
+    """visualization_revisions table mapping (delta history of saved visualizations)."""
+
+    __tablename__ = "visualization_revisions"
+    __table_args__ = (
+        UniqueConstraint(
+            "visualization_id", "revision", name="uq_visualization_revisions_viz_revision"
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    visualization_id: int = Field(foreign_key="saved_visualizations.id")
+    revision: int
+    # Edit operations that turn revision - 1 into this revision.
+    ops: list = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    # Full values at this revision: a referenced payload blob, set whenever the
+    # deltas are folded, or (older rows) the values inline.
+    checkpoint_hash: str | None = Field(
+        default=None, foreign_key="payload_blobs.hash", max_length=64
+    )
+    checkpoint: list | None = Field(
+        default=None, sa_column=Column(JSON(none_as_null=True), nullable=True)
+    )
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from ..core.config import settings
+from ..core.profiling import memory_tracker, profile_store
+from ..dependencies import require_profiling_admin
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_profiling_admin)],
+    include_in_schema=False,
+)
+
+
+@router.get("/profiles", summary="List recent request profiles")
+def list_profiles() -> list[dict]:
+    return [report.summary() for report in profile_store.list()]
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    summary="Read a request profile",
+    responses={404: {"description": "Not found"}},
+)
+def read_profile_report(
+    profile_id: int,
+    format: str = Query("json", pattern="^(json|collapsed)$"),
+    limit: int = Query(25, ge=1, le=500),
+):
+    report = profile_store.get(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "collapsed":
+        return PlainTextResponse(report.collapsed())
+    return {**report.summary(), "top_functions": report.top_functions(limit)}
+
+
+@router.post("/memory/start", summary="Start tracemalloc and take a baseline snapshot")
+def start_memory_tracking(
+    frames: int = Query(settings.PROFILING_TRACEMALLOC_FRAMES, ge=1, le=100),
+) -> dict:
+    memory_tracker.start(frames)
+    return {"tracking": True}
+
+
+@router.get(
+    "/memory/diff",
+    summary="Top allocation growth since the baseline snapshot",
+    responses={409: {"description": "Memory tracking not started"}},
+)
+def memory_diff(
+    limit: int = Query(25, ge=1, le=500),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+) -> dict:
+    try:
+        return memory_tracker.diff(limit, group_by)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+
+@router.post("/memory/stop", summary="Stop tracemalloc")
+def stop_memory_tracking() -> dict:
+    memory_tracker.stop()
+    return {"tracking": False}
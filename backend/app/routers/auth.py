@@ -1,7 +1,11 @@
+from datetime import UTC, datetime
+
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
 from ..core.constants import AUTH_COOKIE_NAME
+from ..core.revocation import revocation_filter
 from ..core.security import (
     create_access_token,
     decode_token,
@@ -9,7 +13,8 @@ from ..core.security import (
     verify_password,
 )
 from ..db import get_session
-from ..models import User
+from ..dependencies import get_current_user
+from ..models import RevokedToken, User, UserUsage
 from ..schemas import UserCreate, UserLogin, UserOut
 from ..utils.user_serializers import serialize_user
 
@@ -24,10 +29,6 @@ router = APIRouter(prefix="/auth", tags=["auth"])
     responses={400: {"description": "Email already registered"}, 422: {"description": "Validation error"}},
 )
 def register(payload: UserCreate, session: Session = Depends(get_session)):
-    exists = session.exec(select(User).where(User.email == payload.email)).first()
-    if exists:
-        raise HTTPException(status_code=400, detail="Email already registered")
-
     user = User(
         name=payload.name,
         surname=payload.surname,
@@ -36,8 +37,15 @@ def register(payload: UserCreate, session: Session = Depends(get_session)):
         hashed_password=hash_password(payload.password),
     )
     session.add(user)
+    try:
+        session.flush()
+    except IntegrityError as exc:
+        # The unique index on email decides; no SELECT beforehand.
+        session.rollback()
+        raise HTTPException(status_code=400, detail="Email already registered") from exc
+    # Counters start at zero, so quota checks never need to seed them.
+    session.add(UserUsage(user_id=user.id))
     session.commit()
-    session.refresh(user)
     return serialize_user(user)
 
 
@@ -71,8 +79,24 @@ def login(
     return {"message": "logged in"}
 
 
-@router.post("/logout", summary="Log out by clearing auth cookie")
-def logout(response: Response):
+@router.post("/logout", summary="Log out, revoking the token and clearing the auth cookie")
+def logout(request: Request, response: Response, session: Session = Depends(get_session)):
+    token = request.cookies.get(AUTH_COOKIE_NAME)
+    data = decode_token(token) if token else None
+    if data and data.get("jti"):
+        session.add(
+            RevokedToken(
+                jti=data["jti"],
+                user_id=int(data["sub"]) if "sub" in data else None,
+                expires_at=datetime.fromtimestamp(data["exp"], tz=UTC).replace(tzinfo=None),
+            )
+        )
+        try:
+            session.commit()
+        except IntegrityError:
+            # Already revoked.
+            session.rollback()
+        revocation_filter.add(data["jti"])
     response.delete_cookie(AUTH_COOKIE_NAME, path="/")
     return {"message": "logged out"}
 
@@ -83,14 +107,5 @@ def logout(response: Response):
     summary="Return the current authenticated user",
     responses={401: {"description": "Not authenticated"}},
 )
-def me(request: Request, session: Session = Depends(get_session)):
-    token = request.cookies.get(AUTH_COOKIE_NAME)
-    data = decode_token(token) if token else None
-    if not data or "sub" not in data:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-
-    user = session.get(User, int(data["sub"]))
-    if not user:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-
-    return serialize_user(user)
+def me(current_user: User = Depends(get_current_user)):
+    return serialize_user(current_user)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.asyncexitstack import AsyncExitStackMiddleware
+from sqlmodel import Session
+from starlette.middleware.exceptions import ExceptionMiddleware
+from starlette.types import ASGIApp, Message
+
+from ..core.config import settings
+from ..db import engine, get_session
+from ..dependencies import get_optional_user
+from ..models import User
+from ..schemas import BatchRequest, BatchRequestItem, BatchResponseItem
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["batch"])
+
+API_PREFIX = "/api/v1/"
+# No nested batches, admin tools, cookie-changing auth calls or long-running
+# lab benchmarks inside a batch.
+BLOCKED_PREFIXES = ("/api/v1/batch", "/api/v1/admin/", "/api/v1/auth/", "/api/v1/lab/")
+ALLOWED_PATHS = ("/api/v1/auth/me",)
+# Only what route handlers read; the cookie lets unauthenticated batches still 401.
+FORWARDED_HEADERS = (b"cookie", b"user-agent", b"accept-language")
+
+
+def _dispatcher(app) -> ASGIApp:
+    """The app's routes wrapped the way FastAPI wraps them, minus the user middleware.
+
+    Sub-requests therefore skip admission control, profiling and access
+    logging; the batch request itself went through them once.
+    """
+    handlers = {
+        key: handler
+        for key, handler in app.exception_handlers.items()
+        if key not in (500, Exception)
+    }
+    return ExceptionMiddleware(AsyncExitStackMiddleware(app.router), handlers=handlers)
+
+
+def _rejection(item: BatchRequestItem) -> str | None:
+    parts = urlsplit(item.path)
+    if parts.scheme or parts.netloc or not parts.path.startswith(API_PREFIX):
+        return f"Sub-request path must start with {API_PREFIX}"
+    if parts.path.endswith("/stream") or (
+        parts.path.startswith(BLOCKED_PREFIXES) and parts.path not in ALLOWED_PATHS
+    ):
+        return "Path is not allowed in a batch"
+    return None
+
+
+async def _dispatch(
+    dispatcher: ASGIApp, request: Request, item: BatchRequestItem, state: dict
+) -> BatchResponseItem:
+    rejection = _rejection(item)
+    if rejection:
+        return BatchResponseItem(
+            id=item.id, status=400, body={"error": rejection, "status_code": 400}
+        )
+
+    parts = urlsplit(item.path)
+    body = b"" if item.body is None else json.dumps(item.body).encode()
+    headers = [
+        (name, value)
+        for name, value in request.scope["headers"]
+        if name in FORWARDED_HEADERS
+    ]
+    headers += [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ]
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": item.method,
+        "scheme": request.scope.get("scheme", "http"),
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": parts.path,
+        "raw_path": parts.path.encode(),
+        "query_string": parts.query.encode(),
+        "headers": headers,
+        "app": request.scope.get("app"),
+        "state": state,
+    }
+
+    body_sent = False
+
+    async def receive() -> Message:
+        nonlocal body_sent
+        if body_sent:
+            return {"type": "http.disconnect"}
+        body_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status = 500
+    chunks: list[bytes] = []
+
+    async def send(message: Message) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await dispatcher(scope, receive, send)
+    except Exception:
+        logger.exception("Batch sub-request %s %s failed", item.method, parts.path)
+        return BatchResponseItem(id=item.id, status=500, body={"error": "Internal Server Error"})
+
+    raw = b"".join(chunks)
+    try:
+        parsed = json.loads(raw) if raw else None
+    except ValueError:
+        parsed = raw.decode("utf-8", errors="replace")
+    return BatchResponseItem(id=item.id, status=status, body=parsed)
+
+
+@router.post(
+    "/batch",
+    response_model=list[BatchResponseItem],
+    summary="Run several API requests in one round trip",
+    description=(
+        "Executes sub-requests in order against the regular API routes and returns "
+        "one result per sub-request with its own status code. The auth cookie is "
+        "verified once for the whole batch, and sub-requests share one database "
+        "session. Consecutive GETs are independent reads, so they run concurrently, "
+        "each with its own session."
+    ),
+)
+async def run_batch(
+    batch: BatchRequest,
+    request: Request,
+    user: User | None = Depends(get_optional_user),
+    session: Session = Depends(get_session),
+):
+    dispatcher = _dispatcher(request.app)
+    shared_state = {
+        "db_session": session,
+        "batch_user_id": user.id if user else None,
+        "request_id": getattr(request.state, "request_id", None),
+    }
+    semaphore = asyncio.Semaphore(max(1, settings.BATCH_MAX_CONCURRENCY))
+
+    async def run_isolated(item: BatchRequestItem) -> BatchResponseItem:
+        async with semaphore:
+            # A Session is not thread-safe, so concurrent reads get their own.
+            own_session = Session(engine, expire_on_commit=False)
+            try:
+                return await _dispatch(
+                    dispatcher, request, item, {**shared_state, "db_session": own_session}
+                )
+            finally:
+                await run_in_threadpool(own_session.close)
+
+    items = batch.requests
+    results: list[BatchResponseItem] = []
+    index = 0
+    while index < len(items):
+        end = index
+        while end < len(items) and items[end].method == "GET":
+            end += 1
+        if end - index > 1:
+            results += await asyncio.gather(*(run_isolated(item) for item in items[index:end]))
+            index = end
+            continue
+        results.append(await _dispatch(dispatcher, request, items[index], dict(shared_state)))
+        index += 1
+    return results
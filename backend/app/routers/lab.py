@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlmodel import Session
+
+from ..core.config import settings
+from ..db import get_session
+from ..dependencies import get_current_user
+from ..lab.pool import LabBusy, benchmark_lab
+from ..models import User
+from ..schemas import BenchmarkRequest, BenchmarkResult
+
+router = APIRouter(prefix="/lab", tags=["lab"])
+
+
+@router.post(
+    "/benchmarks",
+    response_model=BenchmarkResult,
+    summary="Time a structure's operations over generated datasets",
+    description=(
+        "Runs the structure's workload (stack push/pop, queue enqueue/dequeue, "
+        "BST insert/search, heap insert/extract) at each size in a separate "
+        "worker process and returns one timing curve per operation. Runs are "
+        "CPU-time limited; a run that hits the limit returns the sizes it "
+        "finished with truncated=true. Identical requests are served from cache."
+    ),
+    responses={
+        400: {"description": "Size out of range"},
+        401: {"description": "Not authenticated"},
+        503: {"description": "All benchmark slots are busy"},
+    },
+)
+async def run_benchmark(
+    params: BenchmarkRequest,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    if min(params.sizes) < 1 or max(params.sizes) > settings.LAB_MAX_SIZE:
+        raise HTTPException(
+            status_code=400, detail=f"Sizes must be between 1 and {settings.LAB_MAX_SIZE}"
+        )
+    # Return the connection to the pool; a run can take many seconds.
+    session.close()
+    try:
+        result, cached = await benchmark_lab.run(params.model_dump(), settings.LAB_CPU_SECONDS)
+    except LabBusy as exc:
+        raise HTTPException(
+            status_code=503,
+            detail="Benchmark lab is busy; try again shortly",
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+        ) from exc
+    return {**result, "cached": cached}
@@ -1,100 +1,214 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import secrets
 from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile
-from sqlmodel import Session, select
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import defer
+from sqlmodel import Session, delete, select
 
 from ..core.constants import (
     PROFILE_PICTURE_ALLOWED_TYPES,
     PROFILE_PICTURE_MAX_BYTES,
+    VISUALIZATION_MAX_BODY_BYTES,
 )
 from ..core.config import settings
 from ..core.security import hash_password, verify_password
-from ..db import get_session
+from ..db import get_session, release_session
 from ..dependencies import get_current_user
-from ..models import SavedVisualization, User
+from ..engine import OperationError, build, replay
+from ..events import StreamLimitExceeded, broker
+from ..jobs import enqueue
+from ..models import SavedVisualization, User, UserUsage
 from ..schemas import (
+    OperationBatch,
+    OperationBatchResult,
     PasswordUpdate,
+    PublishedSnapshotOut,
     SavedVisualizationCreate,
     SavedVisualizationOut,
+    SavedVisualizationPatch,
+    SavedVisualizationSummary,
     UserProfileOut,
     UserUpdate,
+    VisualizationRevisionOut,
+)
+from ..storage import get_storage
+from ..utils.user_serializers import serialize_user, serialize_user_with_saved_visualizations
+from ..utils.user_serializers import (
+    build_snapshot_url,
+    serialize_saved_visualization,
+    serialize_saved_visualization_summary,
+)
+from ..utils.payload_blobs import prefetch_payloads, release_payload, store_payload
+from ..utils.payloads import encode_values, numeric_values
+from ..utils.revisions import (
+    current_values,
+    delete_revisions,
+    edited_length,
+    fold_revisions,
+    has_pending_edits,
+    reconstruct_revision,
+    record_revision,
+)
+from ..utils.snapshots import write_snapshot
+from ..utils.sql_functions import json_array_length
+from ..utils.usage import QuotaExceeded, charge_usage, read_usage
+from ..utils.visualization_filters import VisualizationFilters, visualization_filters
+from ..utils.visualization_ingest import VisualizationBodyParser
+from ..utils.visualization_metadata import (
+    METADATA_FIELDS,
+    TREE_KINDS,
+    apply_edit_metadata,
+    apply_metadata,
 )
-from ..utils.user_serializers import serialize_user_with_saved_visualizations
-from ..utils.user_serializers import serialize_saved_visualization
 
 router = APIRouter(prefix="/profile", tags=["profile"])
 
+SUMMARY_FIELDS = ("name", "kind", "created_at", "updated_at", "element_count", "snapshot_url")
+SPARSE_FIELDS = frozenset(SUMMARY_FIELDS) | set(METADATA_FIELDS) | {"payload"}
+
+INCLUDE_PAYLOAD_QUERY = Query(
+    True, description="Set to false to return summaries without the payload column."
+)
+FIELDS_QUERY = Query(
+    None,
+    description=(
+        "Comma-separated sparse fieldset for saved visualizations "
+        f"({', '.join(sorted(SPARSE_FIELDS))}); id is always included."
+    ),
+)
+
 
 def _refresh_saved_visualizations(
-    session: Session, user_id: int
+    session: Session, user_id: int, filters: VisualizationFilters | None = None
 ) -> list[SavedVisualization]:
-    return session.exec(
-        select(SavedVisualization)
-        .where(SavedVisualization.user_id == user_id)
-        .order_by(SavedVisualization.created_at.desc())
-    ).all()
+    query = select(SavedVisualization).where(SavedVisualization.user_id == user_id)
+    visualizations = session.exec((filters or VisualizationFilters()).apply(query)).all()
+    prefetch_payloads(session, visualizations)
+    return visualizations
+
+
+def _resolve_fields(fields: str | None, include_payload: bool) -> set[str] | None:
+    """Return the sparse fieldset to serialize, or None for full records."""
+    if fields is None:
+        return None if include_payload else set(SUMMARY_FIELDS)
+    requested = {name.strip() for name in fields.split(",") if name.strip()} - {"id"}
+    unknown = requested - SPARSE_FIELDS
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    if not include_payload:
+        requested.discard("payload")
+    return requested
+
+
+def _list_visualization_summaries(
+    session: Session,
+    user_id: int,
+    fields: set[str],
+    filters: VisualizationFilters | None = None,
+) -> list[dict]:
+    with_count = "element_count" in fields
+    if with_count:
+        # Rows written before the metadata columns existed fall back to JSON.
+        query = select(
+            SavedVisualization,
+            func.coalesce(
+                SavedVisualization.element_count,
+                json_array_length(SavedVisualization.payload),
+            ).label("element_count"),
+        )
+    else:
+        query = select(SavedVisualization)
+    if "payload" not in fields:
+        # Never fetch the JSON column; touching it by accident raises instead.
+        query = query.options(defer(SavedVisualization.payload, raiseload=True))
+    query = query.where(SavedVisualization.user_id == user_id)
+    rows = session.exec((filters or VisualizationFilters()).apply(query)).all()
+    if "payload" in fields:
+        prefetch_payloads(session, [row[0] if with_count else row for row in rows])
+    if not with_count:
+        return [serialize_saved_visualization_summary(viz, None, fields) for viz in rows]
+    return [
+        serialize_saved_visualization_summary(viz, count, fields) for viz, count in rows
+    ]
+
+
+def _get_owned_visualization(
+    session: Session, viz_id: int, user_id: int, for_update: bool = False
+) -> SavedVisualization:
+    visualization = session.get(SavedVisualization, viz_id, with_for_update=for_update)
+    if not visualization or visualization.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Saved visualization not found")
+    return visualization
 
 
 def _persist_user(session: Session, user: User) -> None:
     session.add(user)
     session.commit()
-    session.refresh(user)
+
+
+def _charge_usage(session: Session, user_id: int, **changes: int) -> None:
+    """``charge_usage`` for request handlers: a refused quota becomes a 403."""
+    try:
+        charge_usage(session, user_id, **changes)
+    except QuotaExceeded as exc:
+        session.rollback()
+        raise HTTPException(status_code=403, detail=str(exc)) from exc
 
 
 def _extract_numeric_array(payload: Any) -> list[float]:
     # Accept list, wrapper with "values", or legacy tree payloads
-    values: Any = payload
-    if isinstance(payload, dict):
-        if isinstance(payload.get("values"), list):
-            values = payload.get("values")
-        elif isinstance(payload.get("tree"), dict):
-            collected: list[Any] = []
-            stack = [payload.get("tree")]
-            while stack:
-                node = stack.pop()
-                if not isinstance(node, dict) or "value" not in node:
-                    continue
-                collected.append(node.get("value"))
-                if node.get("right") is not None:
-                    stack.append(node.get("right"))
-                if node.get("left") is not None:
-                    stack.append(node.get("left"))
-            if collected:
-                values = collected
-    if not isinstance(values, list):
-        raise HTTPException(
-            status_code=400,
-            detail="Payload must be an array of numbers or an object with a 'values' array.",
-        )
-    normalized: list[float] = []
-    for item in values:
-        try:
-            num = float(item)
-        except Exception:
-            raise HTTPException(
-                status_code=400,
-                detail="Payload values must be numeric.",
-            )
-        normalized.append(num)
-    return normalized
+    try:
+        return numeric_values(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @router.get(
     "/me",
     response_model=UserProfileOut,
-    summary="Get current profile with saved visualizations",
-    responses={401: {"description": "Not authenticated"}},
+    response_model_exclude_unset=True,
+    summary="Get current profile with saved visualizations and storage usage",
+    responses={401: {"description": "Not authenticated"}, 400: {"description": "Unknown field"}},
 )
 def read_profile(
+    include_payload: bool = INCLUDE_PAYLOAD_QUERY,
+    fields: str | None = FIELDS_QUERY,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
-    visualizations = _refresh_saved_visualizations(session, current_user.id)
-    return serialize_user_with_saved_visualizations(current_user, visualizations)
+    sparse = _resolve_fields(fields, include_payload)
+    if sparse is not None:
+        profile = serialize_user(current_user)
+        profile["saved_visualizations"] = _list_visualization_summaries(
+            session, current_user.id, sparse
+        )
+    else:
+        visualizations = _refresh_saved_visualizations(session, current_user.id)
+        profile = serialize_user_with_saved_visualizations(current_user, visualizations)
+    profile["usage"] = read_usage(session, current_user.id)
+    return profile
 
 
 @router.put(
@@ -109,11 +223,6 @@ def update_profile(
     session: Session = Depends(get_session),
 ):
     if payload.email and payload.email != current_user.email:
-        exists = session.exec(
-            select(User).where(User.email == payload.email)
-        ).first()
-        if exists:
-            raise HTTPException(status_code=400, detail="Email already in use")
         current_user.email = payload.email
 
     if payload.name is not None:
@@ -121,7 +230,12 @@ def update_profile(
     if payload.surname is not None:
         current_user.surname = payload.surname
 
-    _persist_user(session, current_user)
+    try:
+        _persist_user(session, current_user)
+    except IntegrityError as exc:
+        # The unique index on email decides; no SELECT beforehand.
+        session.rollback()
+        raise HTTPException(status_code=400, detail="Email already in use") from exc
     visualizations = _refresh_saved_visualizations(session, current_user.id)
     return serialize_user_with_saved_visualizations(current_user, visualizations)
 
@@ -143,19 +257,22 @@ def update_password(
     return {"message": "Password updated"}
 
 
-def _profile_picture_path(filename: str) -> Path:
-    return settings.PROFILE_PICTURE_PATH / filename
-
-
-def _delete_profile_picture(path_value: str | None) -> None:
+def _delete_media(session: Session, path_value: str | None) -> None:
+    """Queue removal of a media file; it runs once the caller commits."""
     if not path_value:
         return
-    target = (settings.MEDIA_ROOT_PATH / path_value).resolve()
-    try:
-        if target.is_file():
-            target.unlink()
-    except OSError:
-        pass
+    enqueue(session, "delete_media", {"path": path_value})
+
+
+def _replace_profile_picture(
+    session: Session, user: User, relative_path: str, size: int
+) -> dict:
+    _charge_usage(session, user.id, picture_bytes=size)
+    _delete_media(session, user.profile_picture)
+    user.profile_picture = relative_path
+    _persist_user(session, user)
+    visualizations = _refresh_saved_visualizations(session, user.id)
+    return serialize_user_with_saved_visualizations(user, visualizations)
 
 
 @router.put(
@@ -165,6 +282,7 @@ def _delete_profile_picture(path_value: str | None) -> None:
     responses={
         400: {"description": "Invalid file or too large"},
         401: {"description": "Not authenticated"},
+        403: {"description": "Storage quota exceeded"},
     },
 )
 async def upload_profile_picture(
@@ -182,19 +300,20 @@ async def upload_profile_picture(
     if len(contents) > PROFILE_PICTURE_MAX_BYTES:
         raise HTTPException(status_code=400, detail="File is too large (max 5MB).")
 
-    settings.PROFILE_PICTURE_PATH.mkdir(parents=True, exist_ok=True)
     ext = Path(file.filename or "").suffix.lower() or ".png"
     filename = f"{secrets.token_hex(16)}{ext}"
-    target_path = _profile_picture_path(filename)
-
-    target_path.write_bytes(contents)
-    _delete_profile_picture(current_user.profile_picture)
     relative_path = f"{settings.PROFILE_PICTURE_DIR}/{filename}"
-    current_user.profile_picture = relative_path
-    _persist_user(session, current_user)
-
-    visualizations = _refresh_saved_visualizations(session, current_user.id)
-    return serialize_user_with_saved_visualizations(current_user, visualizations)
+    # Stored first so no usage row lock is held across the upload; the file is
+    # removed again if the charge is refused or the commit fails.
+    storage = get_storage()
+    await storage.save(relative_path, contents, file.content_type)
+    try:
+        return await run_in_threadpool(
+            _replace_profile_picture, session, current_user, relative_path, len(contents)
+        )
+    except Exception:
+        await storage.delete(relative_path)
+        raise
 
 
 @router.delete(
@@ -207,10 +326,16 @@ def delete_account(
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
-    _delete_profile_picture(current_user.profile_picture)
-    visualizations = _refresh_saved_visualizations(session, current_user.id)
+    _delete_media(session, current_user.profile_picture)
+    visualizations = session.exec(
+        select(SavedVisualization).where(SavedVisualization.user_id == current_user.id)
+    ).all()
+    delete_revisions(session, [viz.id for viz in visualizations])
     for viz in visualizations:
+        _delete_media(session, viz.snapshot)
+        release_payload(session, viz.payload_hash)
         session.delete(viz)
+    session.exec(delete(UserUsage).where(UserUsage.user_id == current_user.id))
     session.delete(current_user)
     session.commit()
     return Response(status_code=204)
@@ -218,44 +343,191 @@ def delete_account(
 
 @router.get(
     "/me/saved-visualizations",
-    response_model=list[SavedVisualizationOut],
+    response_model=list[SavedVisualizationOut] | list[SavedVisualizationSummary],
+    response_model_exclude_unset=True,
     summary="List saved visualizations",
-    responses={401: {"description": "Not authenticated"}},
+    responses={
+        401: {"description": "Not authenticated"},
+        400: {"description": "Unknown field or sort key"},
+    },
 )
 def list_saved_visualizations(
+    include_payload: bool = INCLUDE_PAYLOAD_QUERY,
+    fields: str | None = FIELDS_QUERY,
+    filters: VisualizationFilters = Depends(visualization_filters),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
-    visualizations = _refresh_saved_visualizations(session, current_user.id)
+    sparse = _resolve_fields(fields, include_payload)
+    if sparse is not None:
+        return _list_visualization_summaries(session, current_user.id, sparse, filters)
+    visualizations = _refresh_saved_visualizations(session, current_user.id, filters)
     return [serialize_saved_visualization(v) for v in visualizations]
 
 
-@router.post(
-    "/me/saved-visualizations",
-    response_model=SavedVisualizationOut,
-    status_code=201,
-    summary="Create a saved visualization",
+async def _event_stream(request: Request, sub, replay):
+    try:
+        yield f"retry: {int(settings.SSE_HEARTBEAT_SECONDS * 1000)}\n\n"
+        if replay is None:
+            # Missed events are gone; the client should reload the full list.
+            yield "event: reset\ndata: {}\n\n"
+        else:
+            for event in replay:
+                yield event.encode()
+        while not sub.overflowed:
+            try:
+                event = await asyncio.wait_for(
+                    sub.queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS
+                )
+            except TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": heartbeat\n\n"
+                continue
+            yield event.encode()
+    finally:
+        broker.unsubscribe(sub)
+
+
+@router.get(
+    "/me/saved-visualizations/stream",
+    summary="Stream saved visualization changes (server-sent events)",
     responses={
-        400: {"description": "Payload must be numeric array"},
         401: {"description": "Not authenticated"},
+        503: {"description": "Too many open streams"},
     },
 )
-def create_saved_visualization(
-    payload: SavedVisualizationCreate,
+async def stream_saved_visualizations(
+    request: Request,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
-    normalized_values = _extract_numeric_array(payload.payload)
+    user_id = current_user.id
+    # Release the pooled connection; the stream may stay open for hours.
+    release_session(request, session)
+    last_event_id = request.headers.get("last-event-id")
+    try:
+        sub, replay = broker.subscribe(
+            user_id, int(last_event_id) if last_event_id else None
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid Last-Event-ID") from exc
+    except StreamLimitExceeded as exc:
+        raise HTTPException(
+            status_code=503, detail="Too many open streams", headers={"Retry-After": "5"}
+        ) from exc
+    return StreamingResponse(
+        _event_stream(request, sub, replay),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _read_visualization_body(request: Request) -> SavedVisualizationCreate:
+    """Stream and validate a create body; the payload arrives as a packed array('d')."""
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"Request body is too large (max {VISUALIZATION_MAX_BODY_BYTES} bytes).",
+    )
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > VISUALIZATION_MAX_BODY_BYTES:
+        raise too_large
+    parser = VisualizationBodyParser()
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > VISUALIZATION_MAX_BODY_BYTES:
+                raise too_large
+            parser.feed(chunk)
+        fields = parser.close()
+    except json.JSONDecodeError as exc:
+        # Same shape FastAPI uses when it parses the body itself.
+        raise RequestValidationError(
+            [
+                {
+                    "type": "json_invalid",
+                    "loc": ("body", exc.pos),
+                    "msg": "JSON decode error",
+                    "input": {},
+                    "ctx": {"error": exc.msg},
+                }
+            ]
+        ) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    try:
+        return SavedVisualizationCreate.model_validate(fields)
+    except ValidationError as exc:
+        # "input" would echo the packed payload back; leave it out.
+        raise RequestValidationError(
+            [
+                {"type": error["type"], "loc": ("body", *error["loc"]), "msg": error["msg"]}
+                for error in exc.errors(include_url=False)
+            ]
+        ) from exc
+
+
+def _create_visualization(
+    session: Session, user: User, payload: SavedVisualizationCreate
+) -> dict:
+    values = payload.payload
+    digest, size = store_payload(session, values)
+    _charge_usage(session, user.id, visualizations=1, payload_bytes=size)
     visualization = SavedVisualization(
-        user_id=current_user.id,
+        user_id=user.id,
         name=payload.name,
         kind=payload.kind,
-        payload=normalized_values,
+        payload_hash=digest,
+        payload_bytes=size,
     )
+    apply_metadata(visualization, values)
     session.add(visualization)
     session.commit()
-    session.refresh(visualization)
-    return serialize_saved_visualization(visualization)
+    # The payload was only ever held packed; GET returns it from the blob.
+    data = serialize_saved_visualization(visualization, include_payload=False)
+    broker.publish(user.id, "created", data)
+    return data
+
+
+@router.post(
+    "/me/saved-visualizations",
+    response_model=SavedVisualizationSummary,
+    response_model_exclude_unset=True,
+    status_code=201,
+    summary="Create a saved visualization",
+    description=(
+        "The body is parsed as it streams in: the payload array is packed into "
+        f"floats on the fly, bodies over {VISUALIZATION_MAX_BODY_BYTES} bytes are "
+        "refused with 413 and the first non-numeric value fails the request. "
+        "The response carries the id and metadata without the payload; fetch "
+        "it with GET when needed."
+    ),
+    responses={
+        400: {"description": "Payload must be numeric array"},
+        401: {"description": "Not authenticated"},
+        403: {"description": "Saved visualization or storage quota exceeded"},
+        413: {"description": "Request body too large"},
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": SavedVisualizationCreate.model_json_schema()}
+            },
+        }
+    },
+)
+async def create_saved_visualization(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    # Return the auth lookup's connection to the pool while the body streams;
+    # the insert checks out a fresh one.
+    release_session(request, session)
+    payload = await _read_visualization_body(request)
+    return await run_in_threadpool(_create_visualization, session, current_user, payload)
 
 
 @router.get(
@@ -269,9 +541,7 @@ def retrieve_saved_visualization(
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
-    visualization = session.get(SavedVisualization, viz_id)
-    if not visualization or visualization.user_id != current_user.id:
-        raise HTTPException(status_code=404, detail="Saved visualization not found")
+    visualization = _get_owned_visualization(session, viz_id, current_user.id)
     return serialize_saved_visualization(visualization)
 
 
@@ -286,9 +556,246 @@ def delete_saved_visualization(
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
-    visualization = session.get(SavedVisualization, viz_id)
-    if not visualization or visualization.user_id != current_user.id:
-        raise HTTPException(status_code=404, detail="Saved visualization not found")
+    visualization = _get_owned_visualization(session, viz_id, current_user.id)
+    _delete_media(session, visualization.snapshot)
+    charge_usage(
+        session,
+        current_user.id,
+        visualizations=-1,
+        payload_bytes=-((visualization.payload_bytes or 0) + visualization.history_bytes),
+    )
+    release_payload(session, visualization.payload_hash)
+    delete_revisions(session, [visualization.id])
     session.delete(visualization)
     session.commit()
+    broker.publish(current_user.id, "deleted", {"id": viz_id})
+    return Response(status_code=204)
+
+
+def _materialize_legacy_payload(session: Session, visualization: SavedVisualization) -> None:
+    """Give a visualization that predates blobs or metadata what PATCH relies on."""
+    if visualization.payload_hash is None:
+        values = _extract_numeric_array(visualization.payload)
+        digest, size = store_payload(session, values)
+        # Already stored inline, so counted even past the quota.
+        charge_usage(
+            session,
+            visualization.user_id,
+            payload_bytes=size - (visualization.payload_bytes or 0),
+            enforce=False,
+        )
+        visualization.payload_hash = digest
+        visualization.payload_bytes = size
+        visualization.payload = None
+        apply_metadata(visualization, values)
+    elif visualization.element_count is None:
+        apply_metadata(visualization, current_values(visualization))
+
+
+def _edit_growth(ops: list[dict]) -> int:
+    """Upper bound on the bytes ``ops`` add to the canonical payload.
+
+    Removed and overwritten values are credited when the revisions are folded.
+    """
+    return sum(
+        len(encode_values([op["value"]])) - 1
+        for op in ops
+        if op["op"] in ("push", "insert", "set")
+    )
+
+
+@router.patch(
+    "/me/saved-visualizations/{viz_id}",
+    response_model=SavedVisualizationSummary,
+    response_model_exclude_unset=True,
+    summary="Apply incremental edits to a saved visualization",
+    description=(
+        "Applies push/pop/insert/delete/set edits to the saved values in order. "
+        "Only the edits are written: the stored values are neither read nor "
+        "rewritten, and the response carries the updated metadata without the "
+        "payload. Pending edits are folded into the stored values in the "
+        "background. Tree kinds (bst, binaryheap) cannot be edited this way, "
+        "since positional edits would break their ordering."
+    ),
+    responses={
+        400: {"description": "Invalid edit operation or tree kind"},
+        401: {"description": "Not authenticated"},
+        403: {"description": "Storage quota exceeded"},
+        404: {"description": "Not found"},
+        409: {"description": "Revision conflict"},
+    },
+)
+def patch_saved_visualization(
+    viz_id: int,
+    patch: SavedVisualizationPatch,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    # Locked so a concurrent fold cannot overwrite the columns changed here.
+    visualization = _get_owned_visualization(
+        session, viz_id, current_user.id, for_update=True
+    )
+    if visualization.kind in TREE_KINDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Edits are not supported for {visualization.kind} visualizations.",
+        )
+    if (
+        patch.expected_revision is not None
+        and patch.expected_revision != visualization.revision
+    ):
+        raise HTTPException(status_code=409, detail="Saved visualization has changed")
+    ops = [op.model_dump(exclude_none=True) for op in patch.operations]
+    try:
+        _materialize_legacy_payload(session, visualization)
+        edited_length(ops, visualization.element_count)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    growth = _edit_growth(ops)
+    # The first edit since a fold turns the stored blob into a checkpoint that
+    # outlives it, so its (exact) size moves to history_bytes. Only growth is
+    # refused at the limit: edits that shrink the payload stay allowed.
+    superseded = 0 if has_pending_edits(visualization) else visualization.payload_bytes or 0
+    _charge_usage(
+        session, current_user.id, payload_bytes=growth + superseded, enforce=growth > 0
+    )
+    record_revision(session, visualization, ops)
+    apply_edit_metadata(visualization, ops)
+    visualization.payload_bytes = (visualization.payload_bytes or 0) + growth
+    visualization.history_bytes += superseded
+    session.add(visualization)
+    pending = visualization.revision - visualization.base_revision
+    if pending == 1:
+        enqueue(
+            session,
+            "fold_visualization_revisions",
+            {"id": visualization.id},
+            delay_seconds=settings.REVISION_FOLD_DELAY_SECONDS,
+        )
+    try:
+        if pending >= settings.REVISION_CHECKPOINT_INTERVAL:
+            # Bound the delta tail here rather than trusting the worker to
+            # keep up; the job only compacts shorter tails.
+            fold_revisions(session, visualization)
+        session.commit()
+    except IntegrityError as exc:
+        # Another PATCH claimed this revision number first.
+        session.rollback()
+        raise HTTPException(status_code=409, detail="Saved visualization has changed") from exc
+    data = serialize_saved_visualization(visualization, include_payload=False)
+    broker.publish(current_user.id, "updated", data)
+    return data
+
+
+@router.get(
+    "/me/saved-visualizations/{viz_id}/revisions/{revision}",
+    response_model=VisualizationRevisionOut,
+    summary="Reconstruct a saved visualization at an earlier revision",
+    responses={401: {"description": "Not authenticated"}, 404: {"description": "Not found"}},
+)
+def read_saved_visualization_revision(
+    viz_id: int,
+    revision: int,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    visualization = _get_owned_visualization(session, viz_id, current_user.id)
+    values = reconstruct_revision(session, visualization, revision)
+    if values is None:
+        raise HTTPException(status_code=404, detail="Revision not found")
+    return {"id": visualization.id, "revision": revision, "payload": values}
+
+
+@router.post(
+    "/me/saved-visualizations/{viz_id}/publish",
+    response_model=PublishedSnapshotOut,
+    summary="Publish an immutable public snapshot of a saved visualization",
+    responses={401: {"description": "Not authenticated"}, 404: {"description": "Not found"}},
+)
+def publish_saved_visualization(
+    viz_id: int,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    visualization = _get_owned_visualization(session, viz_id, current_user.id)
+    snapshot_path = write_snapshot(visualization)
+    if visualization.snapshot != snapshot_path:
+        # Content changed since the last publish; the old URL is retired.
+        _delete_media(session, visualization.snapshot)
+        visualization.snapshot = snapshot_path
+        session.add(visualization)
+        session.commit()
+        broker.publish(
+            current_user.id,
+            "updated",
+            serialize_saved_visualization(visualization, include_payload=False),
+        )
+    return {"id": visualization.id, "snapshot_url": build_snapshot_url(visualization)}
+
+
+@router.delete(
+    "/me/saved-visualizations/{viz_id}/publish",
+    status_code=204,
+    summary="Unpublish a saved visualization snapshot",
+    responses={401: {"description": "Not authenticated"}, 404: {"description": "Not found"}},
+)
+def unpublish_saved_visualization(
+    viz_id: int,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    visualization = _get_owned_visualization(session, viz_id, current_user.id)
+    if visualization.snapshot:
+        _delete_media(session, visualization.snapshot)
+        visualization.snapshot = None
+        session.add(visualization)
+        session.commit()
+        broker.publish(
+            current_user.id,
+            "updated",
+            serialize_saved_visualization(visualization, include_payload=False),
+        )
     return Response(status_code=204)
+
+
+@router.post(
+    "/me/saved-visualizations/{viz_id}/operations",
+    response_model=OperationBatchResult,
+    summary="Replay a batch of structure operations against a saved visualization",
+    description=(
+        "Loads the saved values into the server-side structure engine, applies the "
+        "operations in order and returns the final values with a per-step trace. "
+        "The saved visualization itself is not modified."
+    ),
+    responses={
+        400: {"description": "Unsupported operation or invalid payload"},
+        401: {"description": "Not authenticated"},
+        404: {"description": "Not found"},
+    },
+)
+def replay_saved_visualization_operations(
+    viz_id: int,
+    batch: OperationBatch,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    visualization = _get_owned_visualization(session, viz_id, current_user.id)
+    values = _extract_numeric_array(current_values(visualization))
+    try:
+        structure = build(
+            visualization.kind, values, mode=batch.mode, balanced=batch.balanced
+        )
+        steps = replay(
+            structure,
+            [op.model_dump(exclude_none=True) for op in batch.operations],
+            include_trace=batch.include_trace,
+        )
+    except OperationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {
+        "id": visualization.id,
+        "kind": visualization.kind,
+        "values": structure.to_values(),
+        "steps": steps,
+    }
@@ -1,9 +1,16 @@
 from datetime import datetime
 
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
+from .core.constants import (
+    MAX_BATCH_OPERATIONS,
+    MAX_BATCH_REQUESTS,
+    MAX_BENCHMARK_REPEATS,
+    MAX_BENCHMARK_SIZES,
+)
+
 
 class SavedVisualizationBase(BaseModel):
     name: str = Field(max_length=100)
@@ -27,11 +34,182 @@ class SavedVisualizationOut(SavedVisualizationBase):
     id: int
     created_at: datetime | None = None
     updated_at: datetime | None = None
+    snapshot_url: str | None = None
+    element_count: int | None = None
+    min_value: float | None = None
+    max_value: float | None = None
+    is_sorted: bool | None = None
+    height: int | None = None
+    balance_factor: int | None = None
+    revision: int | None = None
 
     class Config:
         from_attributes = True
 
 
+class SavedVisualizationSummary(BaseModel):
+    """Lightweight listing entry; only the requested fields are present."""
+
+    id: int
+    name: str | None = None
+    kind: str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    snapshot_url: str | None = None
+    element_count: int | None = None
+    min_value: float | None = None
+    max_value: float | None = None
+    is_sorted: bool | None = None
+    height: int | None = None
+    balance_factor: int | None = None
+    revision: int | None = None
+    payload: Any = None
+
+
+class PublishedSnapshotOut(BaseModel):
+    id: int
+    snapshot_url: str
+
+
+class StructureOperation(BaseModel):
+    op: str = Field(max_length=32)
+    value: float | None = None
+    index: int | None = None
+    mode: Literal["min", "max"] | None = None
+
+
+class OperationBatch(BaseModel):
+    operations: list[StructureOperation] = Field(max_length=MAX_BATCH_OPERATIONS)
+    include_trace: bool = True
+    # Initial heap ordering, and whether to bulk-build a BST balanced.
+    mode: Literal["min", "max"] = "min"
+    balanced: bool = False
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "operations": [{"op": "push", "value": 9}, {"op": "pop"}, {"op": "peek"}],
+            }
+        }
+    )
+
+
+class OperationStep(BaseModel):
+    op: str
+    result: Any
+
+
+class OperationBatchResult(BaseModel):
+    id: int
+    kind: str
+    values: list[float]
+    steps: list[OperationStep] = []
+
+
+class PayloadEdit(BaseModel):
+    op: Literal["push", "pop", "insert", "delete", "set"]
+    index: int | None = None
+    value: float | None = None
+
+
+class SavedVisualizationPatch(BaseModel):
+    operations: list[PayloadEdit] = Field(min_length=1, max_length=MAX_BATCH_OPERATIONS)
+    # When set, the update is rejected with 409 unless it still matches.
+    expected_revision: int | None = None
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "operations": [
+                    {"op": "set", "index": 0, "value": 4},
+                    {"op": "insert", "index": 1, "value": 8},
+                    {"op": "pop"},
+                ],
+                "expected_revision": 3,
+            }
+        }
+    )
+
+
+class VisualizationRevisionOut(BaseModel):
+    id: int
+    revision: int
+    payload: list[float]
+
+
+class BatchRequestItem(BaseModel):
+    id: str | None = Field(default=None, max_length=64)
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    # Absolute API path, optionally with a query string, e.g. "/api/v1/profile/me".
+    path: str = Field(max_length=2048)
+    body: Any = None
+
+
+class BatchRequest(BaseModel):
+    requests: list[BatchRequestItem] = Field(min_length=1, max_length=MAX_BATCH_REQUESTS)
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "requests": [
+                    {"id": "me", "path": "/api/v1/auth/me"},
+                    {"id": "saved", "path": "/api/v1/profile/me/saved-visualizations"},
+                ]
+            }
+        }
+    )
+
+
+class BatchResponseItem(BaseModel):
+    id: str | None = None
+    status: int
+    body: Any = None
+
+
+class BenchmarkRequest(BaseModel):
+    structure: Literal["stack", "queue", "bst", "binaryheap"]
+    distribution: Literal["random", "sorted", "reversed", "few_unique"] = "random"
+    sizes: list[int] = Field(min_length=1, max_length=MAX_BENCHMARK_SIZES)
+    seed: int = 0
+    repeats: int = Field(default=1, ge=1, le=MAX_BENCHMARK_REPEATS)
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "structure": "bst",
+                "distribution": "random",
+                "sizes": [1000, 10000, 100000],
+                "repeats": 3,
+            }
+        }
+    )
+
+
+class BenchmarkPoint(BaseModel):
+    size: int
+    seconds: float
+    ns_per_op: float
+
+
+class BenchmarkSeries(BaseModel):
+    operation: str
+    # Claimed complexity, as listed in the frontend's structure info panel.
+    complexity: str
+    points: list[BenchmarkPoint]
+
+
+class BenchmarkResult(BaseModel):
+    structure: str
+    workload: str
+    distribution: str
+    seed: int
+    repeats: int
+    # The CPU limit was reached; sizes past the last point were skipped.
+    truncated: bool
+    cached: bool
+    series: list[BenchmarkSeries]
+
+
 class UserBase(BaseModel):
     name: str | None = None
     surname: str | None = None
@@ -71,5 +249,15 @@ class PasswordUpdate(BaseModel):
     new_password: str = Field(min_length=8)
 
 
+class UsageOut(BaseModel):
+    visualization_count: int
+    payload_bytes: int
+    picture_bytes: int
+    # None when the limit is disabled.
+    max_visualizations: int | None = None
+    max_storage_bytes: int | None = None
+
+
 class UserProfileOut(UserOut):
-    saved_visualizations: list[SavedVisualizationOut] = []
+    saved_visualizations: list[SavedVisualizationOut | SavedVisualizationSummary] = []
+    usage: UsageOut | None = None
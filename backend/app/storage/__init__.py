@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+from ..core.config import settings
+from .base import MediaStorage
+from .local import LocalMediaStorage
+from .s3 import S3MediaStorage
+
+
+@lru_cache
+def get_storage() -> MediaStorage:
+    """Return the configured media storage backend (built once per process)."""
+    backend = settings.MEDIA_STORAGE_BACKEND.lower()
+    if backend == "local":
+        return LocalMediaStorage(settings.MEDIA_ROOT_PATH, settings.MEDIA_URL)
+    if backend == "s3":
+        missing = [
+            key
+            for key, val in {
+                "S3_BUCKET": settings.S3_BUCKET,
+                "S3_PUBLIC_BASE_URL": settings.S3_PUBLIC_BASE_URL,
+            }.items()
+            if not val
+        ]
+        if missing:
+            raise ValueError(f"MEDIA_STORAGE_BACKEND=s3 requires {', '.join(missing)}")
+        return S3MediaStorage(
+            settings.S3_BUCKET,
+            region=settings.S3_REGION,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            key_prefix=settings.S3_KEY_PREFIX,
+            public_base_url=settings.S3_PUBLIC_BASE_URL,
+            max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+        )
+    raise ValueError(f"Unknown MEDIA_STORAGE_BACKEND: {settings.MEDIA_STORAGE_BACKEND}")
+
+
+__all__ = ["LocalMediaStorage", "MediaStorage", "S3MediaStorage", "get_storage"]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from functools import partial
+
+import anyio
+
+
+class MediaStorage(ABC):
+    """Where uploaded media and published snapshots live.
+
+    Keys are relative paths such as ``profile_pictures/<name>.png``; the same
+    key is what the database stores. Backends implement the blocking
+    primitives; async callers use ``save``/``delete`` so the I/O runs on a
+    worker thread instead of the event loop.
+    """
+
+    @abstractmethod
+    def write(
+        self,
+        key: str,
+        data: bytes,
+        content_type: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
+        """Store ``data`` under ``key``, replacing any existing object atomically."""
+
+    @abstractmethod
+    def remove(self, key: str) -> None:
+        """Delete ``key``; a missing object is not an error."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """URL a browser can fetch ``key`` from, ideally without going through the app."""
+
+    async def save(
+        self,
+        key: str,
+        data: bytes,
+        content_type: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
+        await anyio.to_thread.run_sync(
+            partial(self.write, key, data, content_type, cache_control)
+        )
+
+    async def delete(self, key: str) -> None:
+        await anyio.to_thread.run_sync(self.remove, key)
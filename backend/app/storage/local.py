@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+from .base import MediaStorage
+
+
+class LocalMediaStorage(MediaStorage):
+    """Files under ``root``, served by the app's ``/media`` static mount."""
+
+    def __init__(self, root: Path, base_url: str) -> None:
+        self.root = root.resolve()
+        self.base_url = base_url.rstrip("/")
+
+    def _path(self, key: str) -> Path:
+        target = (self.root / key.lstrip("/")).resolve()
+        if self.root not in target.parents:
+            raise ValueError(f"Media key escapes MEDIA_ROOT: {key}")
+        return target
+
+    def write(
+        self,
+        key: str,
+        data: bytes,
+        content_type: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
+        target = self._path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so readers never observe a partially written file.
+        tmp_path = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, target)
+
+    def remove(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key.lstrip('/')}"
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from .base import MediaStorage
+
+
+class S3MediaStorage(MediaStorage):
+    """Objects in an S3-compatible bucket (AWS S3, MinIO, ...).
+
+    boto3 is imported on first use so it stays an optional dependency. One
+    client (and its connection pool) is shared by all threads; boto3 clients
+    are thread-safe. Objects are served from ``public_base_url`` (a public
+    bucket or CDN): published snapshot links must not expire.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        region: str | None = None,
+        endpoint_url: str | None = None,
+        access_key_id: str | None = None,
+        secret_access_key: str | None = None,
+        key_prefix: str = "",
+        public_base_url: str,
+        max_pool_connections: int = 20,
+    ) -> None:
+        self.bucket = bucket
+        self.region = region
+        self.endpoint_url = endpoint_url
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self.key_prefix = key_prefix.strip("/")
+        self.public_base_url = public_base_url.rstrip("/")
+        self.max_pool_connections = max_pool_connections
+        self._client: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> Any:
+        try:
+            import boto3
+            from botocore.config import Config
+        except ImportError as exc:  # pragma: no cover - depends on installed extras
+            raise RuntimeError(
+                "MEDIA_STORAGE_BACKEND=s3 requires boto3 (pip install boto3)"
+            ) from exc
+        return boto3.client(
+            "s3",
+            region_name=self.region,
+            endpoint_url=self.endpoint_url,
+            aws_access_key_id=self.access_key_id,
+            aws_secret_access_key=self.secret_access_key,
+            config=Config(
+                max_pool_connections=self.max_pool_connections,
+                retries={"max_attempts": 3, "mode": "standard"},
+            ),
+        )
+
+    def _object_key(self, key: str) -> str:
+        key = key.lstrip("/")
+        return f"{self.key_prefix}/{key}" if self.key_prefix else key
+
+    def write(
+        self,
+        key: str,
+        data: bytes,
+        content_type: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
+        extra = {}
+        if content_type:
+            extra["ContentType"] = content_type
+        if cache_control:
+            extra["CacheControl"] = cache_control
+        self.client.put_object(
+            Bucket=self.bucket, Key=self._object_key(key), Body=data, **extra
+        )
+
+    def remove(self, key: str) -> None:
+        # DeleteObject succeeds for keys that do not exist.
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def url(self, key: str) -> str:
+        return f"{self.public_base_url}/{self._object_key(key)}"
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import object_session
+from sqlmodel import Session, delete, select, update
+
+from ..core.config import settings
+from ..db import engine
+from ..models import PayloadBlob, SavedVisualization
+from .payloads import encode_values
+
+
+class BlobCache:
+    """Thread-safe LRU of blob values, bounded by their canonical size in bytes.
+
+    Blobs are immutable per hash, so entries never need invalidating. Values
+    are kept packed as ``array('d')``, eight bytes per element.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[array, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> array | None:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, digest: str, values: Iterable[float], size: int) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if digest in self._entries:
+                self._entries.move_to_end(digest)
+                return
+            self._entries[digest] = (array("d", values), size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+
+    def discard(self, digest: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(digest, None)
+            if entry is not None:
+                self.size -= entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+blob_cache = BlobCache(settings.PAYLOAD_CACHE_MAX_BYTES)
+
+
+def canonical_payload(values: Sequence[float]) -> bytes:
+    """Serialize normalized values the same way every time, whatever the input spelling."""
+    return encode_values(values).encode()
+
+
+def _increment(session: Session, digest: str) -> bool:
+    result = session.exec(
+        update(PayloadBlob)
+        .where(PayloadBlob.hash == digest)
+        .values(ref_count=PayloadBlob.ref_count + 1)
+    )
+    return result.rowcount > 0
+
+
+def store_payload(session: Session, values: Sequence[float]) -> tuple[str, int]:
+    """Reference the blob holding ``values``, creating it if needed.
+
+    Returns the blob's hash and canonical size in bytes. Runs in the caller's
+    transaction; the reference counts once it commits.
+    """
+    data = canonical_payload(values)
+    digest = hashlib.sha256(data).hexdigest()
+    if not _increment(session, digest):
+        # Packed arrays go to the JSON column as-is; see the engine's json_serializer.
+        normalized = values if isinstance(values, array) else json.loads(data)
+        try:
+            with session.begin_nested():
+                session.add(
+                    PayloadBlob(
+                        hash=digest, values=normalized, size_bytes=len(data), ref_count=1
+                    )
+                )
+        except IntegrityError:
+            # Another writer inserted the same content first.
+            _increment(session, digest)
+    blob_cache.put(digest, values, len(data))
+    return digest, len(data)
+
+
+def release_payload(session: Session, digest: str | None) -> None:
+    """Drop one reference; blobs at zero are removed later by collect_garbage()."""
+    if digest:
+        session.exec(
+            update(PayloadBlob)
+            .where(PayloadBlob.hash == digest)
+            .values(ref_count=PayloadBlob.ref_count - 1)
+        )
+
+
+def retain_payload(session: Session, digest: str) -> None:
+    """Add a reference to an existing blob, e.g. for a revision checkpoint."""
+    if not _increment(session, digest):
+        raise LookupError(f"Payload blob {digest} is missing")
+
+
+def load_blob(session: Session | None, digest: str) -> list:
+    """Return a copy of the values stored under ``digest``."""
+    cached = blob_cache.get(digest)
+    if cached is not None:
+        return list(cached)
+    if session is not None:
+        blob = session.get(PayloadBlob, digest)
+    else:
+        with Session(engine) as own_session:
+            blob = own_session.get(PayloadBlob, digest)
+    if blob is None:
+        raise LookupError(f"Payload blob {digest} is missing")
+    blob_cache.put(digest, blob.values, blob.size_bytes)
+    return list(blob.values)
+
+
+def load_payload(viz: SavedVisualization) -> Any:
+    """Return the stored payload of ``viz``, whether inline (legacy) or in a blob.
+
+    For a blob this is the values at ``viz.base_revision``; see
+    ``revisions.current_values`` for the values with pending deltas applied.
+    """
+    if viz.payload_hash is None:
+        return viz.payload
+    return load_blob(object_session(viz), viz.payload_hash)
+
+
+def prefetch_payloads(session: Session, visualizations: Iterable[SavedVisualization]) -> None:
+    """Warm the cache for a listing with one query instead of one per row."""
+    missing = {
+        viz.payload_hash
+        for viz in visualizations
+        if viz.payload_hash is not None and blob_cache.get(viz.payload_hash) is None
+    }
+    if not missing:
+        return
+    for blob in session.exec(select(PayloadBlob).where(PayloadBlob.hash.in_(missing))):
+        blob_cache.put(blob.hash, blob.values, blob.size_bytes)
+
+
+def collect_garbage(batch_size: int = 500) -> int:
+    """Delete unreferenced blobs; returns how many were removed."""
+    removed = 0
+    with Session(engine) as session:
+        while True:
+            digests = session.exec(
+                select(PayloadBlob.hash).where(PayloadBlob.ref_count <= 0).limit(batch_size)
+            ).all()
+            if not digests:
+                return removed
+            # Re-check the count so a blob re-referenced meanwhile survives.
+            result = session.exec(
+                delete(PayloadBlob).where(
+                    PayloadBlob.hash.in_(digests), PayloadBlob.ref_count <= 0
+                )
+            )
+            session.commit()
+            removed += result.rowcount
+            for digest in digests:
+                blob_cache.discard(digest)
+            if len(digests) < batch_size:
+                return removed
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+# Values encoded per json.dumps call; bounds the temporary list of floats.
+_ENCODE_CHUNK = 65_536
+
+
+def extract_values(payload: Any) -> Any:
+    """Return the value list from a list, ``{"values": [...]}`` or legacy tree payload.
+
+    Anything else is returned unchanged.
+    """
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        if isinstance(payload.get("values"), list):
+            return payload.get("values")
+        if isinstance(payload.get("tree"), dict):
+            collected: list[Any] = []
+            stack = [payload.get("tree")]
+            while stack:
+                node = stack.pop()
+                if not isinstance(node, dict) or "value" not in node:
+                    continue
+                collected.append(node.get("value"))
+                if node.get("right") is not None:
+                    stack.append(node.get("right"))
+                if node.get("left") is not None:
+                    stack.append(node.get("left"))
+            if collected:
+                return collected
+    return payload
+
+
+def numeric_values(payload: Any) -> list[float]:
+    """Normalize ``payload`` to a list of floats, raising ValueError if it is not numeric."""
+    values = extract_values(payload)
+    if not isinstance(values, list):
+        raise ValueError(
+            "Payload must be an array of numbers or an object with a 'values' array."
+        )
+    try:
+        return [float(item) for item in values]
+    except (TypeError, ValueError):
+        raise ValueError("Payload values must be numeric.") from None
+
+
+def iter_encoded_values(values: Sequence[float]) -> Iterator[str]:
+    """Yield the compact JSON encoding of ``values`` as floats, in pieces.
+
+    The joined pieces equal ``json.dumps([float(v) for v in values],
+    separators=(",", ":"))``, but only one slice is ever held as Python floats,
+    so packed ``array('d')`` payloads are encoded without a full list copy.
+    """
+    yield "["
+    for start in range(0, len(values), _ENCODE_CHUNK):
+        chunk = [float(value) for value in values[start : start + _ENCODE_CHUNK]]
+        if start:
+            yield ","
+        yield json.dumps(chunk, separators=(",", ":"))[1:-1]
+    yield "]"
+
+
+def encode_values(values: Sequence[float]) -> str:
+    return "".join(iter_encoded_values(values))
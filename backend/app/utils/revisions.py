@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import or_
+from sqlalchemy.orm import object_session
+from sqlmodel import Session, delete, select, update
+
+from ..db import engine
+from ..models import SavedVisualization, VisualizationRevision
+from .payload_blobs import (
+    load_blob,
+    load_payload,
+    release_payload,
+    retain_payload,
+    store_payload,
+)
+from .payloads import numeric_values
+from .usage import charge_usage
+from .visualization_metadata import apply_metadata
+
+EDIT_OPERATIONS = ("push", "pop", "insert", "delete", "set")
+
+
+def _index(op: dict, length: int, allow_end: bool = False) -> int:
+    index = op.get("index")
+    upper = length if allow_end else length - 1
+    if index is None or not 0 <= index <= upper:
+        raise ValueError(f"{op['op']}: index out of range")
+    return index
+
+
+def _value(op: dict) -> float:
+    if op.get("value") is None:
+        raise ValueError(f"{op['op']}: value is required")
+    return float(op["value"])
+
+
+def apply_edits(values: list[float], ops: Iterable[dict]) -> None:
+    """Apply edit operations to ``values`` in place; raises ValueError on a bad edit."""
+    for op in ops:
+        name = op.get("op")
+        if name == "push":
+            values.append(_value(op))
+        elif name == "pop":
+            if not values:
+                raise ValueError("pop: payload is empty")
+            values.pop()
+        elif name == "insert":
+            values.insert(_index(op, len(values), allow_end=True), _value(op))
+        elif name == "delete":
+            del values[_index(op, len(values))]
+        elif name == "set":
+            values[_index(op, len(values))] = _value(op)
+        else:
+            raise ValueError(f"Unsupported edit operation: {name}")
+
+
+def edited_length(ops: Iterable[dict], length: int) -> int:
+    """Validate ``ops`` against a payload of ``length`` values without reading them.
+
+    Raises the same ValueError as ``apply_edits``; returns the resulting length.
+    """
+    for op in ops:
+        name = op.get("op")
+        if name == "push":
+            _value(op)
+            length += 1
+        elif name == "pop":
+            if not length:
+                raise ValueError("pop: payload is empty")
+            length -= 1
+        elif name == "insert":
+            _index(op, length, allow_end=True)
+            _value(op)
+            length += 1
+        elif name == "delete":
+            _index(op, length)
+            length -= 1
+        elif name == "set":
+            _index(op, length)
+            _value(op)
+        else:
+            raise ValueError(f"Unsupported edit operation: {name}")
+    return length
+
+
+def _session_for(viz: SavedVisualization) -> tuple[Session, bool]:
+    session = object_session(viz)
+    if session is not None:
+        return session, False
+    return Session(engine), True
+
+
+def _pending_ops(session: Session, viz: SavedVisualization) -> list[list[dict]]:
+    return session.exec(
+        select(VisualizationRevision.ops)
+        .where(
+            VisualizationRevision.visualization_id == viz.id,
+            VisualizationRevision.revision > viz.base_revision,
+            VisualizationRevision.revision <= viz.revision,
+        )
+        .order_by(VisualizationRevision.revision)
+    ).all()
+
+
+def has_pending_edits(viz: SavedVisualization) -> bool:
+    return viz.base_revision is not None and viz.base_revision < viz.revision
+
+
+def current_payload(viz: SavedVisualization) -> Any:
+    """The payload of ``viz`` at its latest revision: the blob plus pending deltas."""
+    payload = load_payload(viz)
+    if not has_pending_edits(viz):
+        return payload
+    values = numeric_values(payload)
+    session, owned = _session_for(viz)
+    try:
+        for ops in _pending_ops(session, viz):
+            apply_edits(values, ops)
+    finally:
+        if owned:
+            session.close()
+    return values
+
+
+def current_values(viz: SavedVisualization) -> list[float]:
+    return numeric_values(current_payload(viz))
+
+
+def add_checkpoint(session: Session, visualization_id: int, revision: int, digest: str) -> None:
+    """Reference blob ``digest`` as the full values at ``revision``."""
+    retain_payload(session, digest)
+    marked = session.exec(
+        update(VisualizationRevision)
+        .where(
+            VisualizationRevision.visualization_id == visualization_id,
+            VisualizationRevision.revision == revision,
+        )
+        .values(checkpoint_hash=digest)
+    )
+    if not marked.rowcount:
+        # Revision 0 has no delta row of its own.
+        session.add(
+            VisualizationRevision(
+                visualization_id=visualization_id, revision=revision, checkpoint_hash=digest
+            )
+        )
+
+
+def record_revision(
+    session: Session, viz: SavedVisualization, ops: list[dict]
+) -> VisualizationRevision:
+    """Add the delta row for ``ops`` and bump ``viz.revision``.
+
+    Costs the size of the edit: the values are not read or rewritten. On the
+    first edit since the blob was written, the blob itself becomes the base
+    checkpoint (one reference count, no copy).
+    """
+    if viz.base_revision is None:
+        add_checkpoint(session, viz.id, viz.revision, viz.payload_hash)
+        viz.base_revision = viz.revision
+    revision = viz.revision + 1
+    row = VisualizationRevision(visualization_id=viz.id, revision=revision, ops=ops)
+    session.add(row)
+    viz.revision = revision
+    return row
+
+
+def fold_revisions(session: Session, viz: SavedVisualization) -> None:
+    """Write the pending edits of ``viz`` into a new payload blob.
+
+    The new blob doubles as the checkpoint for the current revision, so
+    later PATCHes and revision reads start from it. Exact metadata and
+    payload size replace the estimates the PATCHes recorded. The caller
+    commits.
+    """
+    values = current_values(viz)
+    digest, size = store_payload(session, values)
+    add_checkpoint(session, viz.id, viz.revision, digest)
+    release_payload(session, viz.payload_hash)
+    # Edits that cancel out leave the base blob current, not superseded.
+    restored = size if digest == viz.payload_hash else 0
+    charge_usage(
+        session,
+        viz.user_id,
+        payload_bytes=size - (viz.payload_bytes or 0) - restored,
+        enforce=False,
+    )
+    viz.payload_hash = digest
+    viz.payload_bytes = size
+    viz.history_bytes -= restored
+    viz.base_revision = viz.revision
+    apply_metadata(viz, values)
+    session.add(viz)
+
+
+def reconstruct_revision(
+    session: Session, viz: SavedVisualization, revision: int
+) -> list[float] | None:
+    """Return the values of ``viz`` at ``revision``, or None if it does not exist."""
+    if revision < 0 or revision > viz.revision:
+        return None
+    if revision == viz.revision:
+        return current_values(viz)
+    base = session.exec(
+        select(VisualizationRevision)
+        .where(
+            VisualizationRevision.visualization_id == viz.id,
+            VisualizationRevision.revision <= revision,
+            or_(
+                VisualizationRevision.checkpoint_hash.is_not(None),
+                VisualizationRevision.checkpoint.is_not(None),
+            ),
+        )
+        .order_by(VisualizationRevision.revision.desc())
+        .limit(1)
+    ).first()
+    if base is None:
+        return None
+    if base.checkpoint_hash is not None:
+        values = load_blob(session, base.checkpoint_hash)
+    else:
+        values = list(base.checkpoint)
+    deltas = session.exec(
+        select(VisualizationRevision.ops)
+        .where(
+            VisualizationRevision.visualization_id == viz.id,
+            VisualizationRevision.revision > base.revision,
+            VisualizationRevision.revision <= revision,
+        )
+        .order_by(VisualizationRevision.revision)
+    ).all()
+    for ops in deltas:
+        apply_edits(values, ops)
+    return values
+
+
+def delete_revisions(session: Session, visualization_ids: list[int]) -> None:
+    if not visualization_ids:
+        return
+    checkpoints = session.exec(
+        select(VisualizationRevision.checkpoint_hash).where(
+            VisualizationRevision.visualization_id.in_(visualization_ids),
+            VisualizationRevision.checkpoint_hash.is_not(None),
+        )
+    ).all()
+    for digest in checkpoints:
+        release_payload(session, digest)
+    session.exec(
+        delete(VisualizationRevision).where(
+            VisualizationRevision.visualization_id.in_(visualization_ids)
+        )
+    )
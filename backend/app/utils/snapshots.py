@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import hashlib
+import json
+
+from ..core.config import settings
+from ..core.constants import SNAPSHOT_CACHE_CONTROL
+from ..models import SavedVisualization
+from ..storage import get_storage
+from .user_serializers import serialize_saved_visualization
+
+
+def build_snapshot(viz: SavedVisualization) -> tuple[bytes, str]:
+    """Return the canonical snapshot bytes and their sha256 hex digest."""
+    data = serialize_saved_visualization(viz)
+    document = {
+        "id": data["id"],
+        "name": data["name"],
+        "kind": data["kind"],
+        "payload": data["payload"],
+        "created_at": data.get("created_at"),
+        "updated_at": data.get("updated_at"),
+    }
+    body = json.dumps(
+        document, sort_keys=True, separators=(",", ":"), default=str
+    ).encode("utf-8")
+    return body, hashlib.sha256(body).hexdigest()
+
+
+def write_snapshot(viz: SavedVisualization) -> str:
+    """Store the snapshot for ``viz`` and return its media storage key."""
+    body, digest = build_snapshot(viz)
+    key = f"{settings.SNAPSHOT_DIR}/{digest}.json"
+    storage = get_storage()
+    # Content-addressed, so an existing object already holds these bytes.
+    if not storage.exists(key):
+        storage.write(key, body, "application/json", SNAPSHOT_CACHE_CONTROL)
+    return key
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import Integer
+
+
+class json_array_length(FunctionElement):
+    """Length of a JSON array column, computed by the database."""
+
+    type = Integer()
+    inherit_cache = True
+    name = "json_array_length"
+
+
+@compiles(json_array_length)
+def _compile_json_array_length(element, compiler, **kw):
+    return f"json_array_length({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(json_array_length, "mysql")
+@compiles(json_array_length, "mariadb")
+def _compile_json_length_mysql(element, compiler, **kw):
+    return f"JSON_LENGTH({compiler.process(element.clauses, **kw)})"
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from fastapi.staticfiles import StaticFiles
+from starlette.responses import Response
+from starlette.types import Scope
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that marks content-addressed prefixes as immutable."""
+
+    def __init__(
+        self,
+        *args,
+        immutable_prefixes: tuple[str, ...] = (),
+        cache_control: str = "",
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.immutable_prefixes = tuple(p.strip("/") + "/" for p in immutable_prefixes)
+        self.cache_control = cache_control
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if (
+            self.cache_control
+            and response.status_code == 200
+            and path.lstrip("/").startswith(self.immutable_prefixes)
+        ):
+            response.headers["Cache-Control"] = self.cache_control
+        return response
@@ -0,0 +1,146 @@
+"""Per-user storage usage, kept as running totals in ``user_usage``.
+
+Every path that adds, removes or resizes a saved payload, supersedes one
+with a revision checkpoint, or replaces the profile picture adjusts the
+user's row in its own transaction, so quota checks read one row by primary
+key instead of counting and summing ``saved_visualizations``.
+``reconcile_user_usage`` repairs any drift.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, update
+
+from ..core.config import settings
+from ..models import SavedVisualization, UserUsage
+
+
+def stored_bytes():
+    """Sum of current payload and superseded checkpoint bytes, for a SELECT."""
+    return func.coalesce(
+        func.sum(
+            func.coalesce(SavedVisualization.payload_bytes, 0)
+            + SavedVisualization.history_bytes
+        ),
+        0,
+    )
+
+
+class QuotaExceeded(ValueError):
+    """The change would take the user past a storage quota."""
+
+
+def _seed_usage(session: Session, user_id: int) -> bool:
+    """Create the row for a user who predates usage tracking; False if it existed."""
+    if session.get(UserUsage, user_id) is not None:
+        return False
+    count, total = session.exec(
+        select(func.count(SavedVisualization.id), stored_bytes()).where(
+            SavedVisualization.user_id == user_id
+        )
+    ).one()
+    try:
+        with session.begin_nested():
+            session.add(
+                UserUsage(user_id=user_id, visualization_count=count, payload_bytes=total)
+            )
+    except IntegrityError:
+        # Seeded concurrently; the retried UPDATE applies to that row.
+        pass
+    return True
+
+
+def _quota_error(session: Session, user_id: int, visualizations: int) -> QuotaExceeded:
+    usage = session.exec(
+        select(UserUsage)
+        .where(UserUsage.user_id == user_id)
+        .execution_options(populate_existing=True)
+    ).one()
+    limit = settings.QUOTA_MAX_VISUALIZATIONS
+    if limit and visualizations > 0 and usage.visualization_count + visualizations > limit:
+        return QuotaExceeded(f"Saved visualization limit reached (max {limit}).")
+    return QuotaExceeded(
+        f"Storage quota exceeded (max {settings.QUOTA_MAX_STORAGE_BYTES} bytes)."
+    )
+
+
+def charge_usage(
+    session: Session,
+    user_id: int,
+    visualizations: int = 0,
+    payload_bytes: int = 0,
+    picture_bytes: int | None = None,
+    enforce: bool = True,
+) -> None:
+    """Apply deltas to the user's usage row, refusing growth past the quotas.
+
+    ``picture_bytes`` replaces the current picture size rather than adding
+    to it. The check and the update are one conditional UPDATE, so concurrent
+    writers cannot both squeeze under a limit. Call this before the rows it
+    accounts for are added or deleted: a missing row is seeded from what is
+    already stored. Raises ``QuotaExceeded`` unless ``enforce`` is False; the
+    caller's transaction is left for it to roll back.
+    """
+    if not visualizations and not payload_bytes and picture_bytes is None:
+        return
+    statement = (
+        update(UserUsage)
+        .where(UserUsage.user_id == user_id)
+        .values(
+            visualization_count=UserUsage.visualization_count + visualizations,
+            payload_bytes=UserUsage.payload_bytes + payload_bytes,
+            updated_at=datetime.utcnow(),
+        )
+    )
+    if picture_bytes is not None:
+        statement = statement.values(picture_bytes=picture_bytes)
+    grows = False
+    if enforce and visualizations > 0 and settings.QUOTA_MAX_VISUALIZATIONS:
+        grows = True
+        statement = statement.where(
+            UserUsage.visualization_count + visualizations
+            <= settings.QUOTA_MAX_VISUALIZATIONS
+        )
+    if (
+        enforce
+        and (payload_bytes > 0 or picture_bytes is not None)
+        and settings.QUOTA_MAX_STORAGE_BYTES
+    ):
+        grows = True
+        new_picture = UserUsage.picture_bytes if picture_bytes is None else picture_bytes
+        new_total = UserUsage.payload_bytes + payload_bytes + new_picture
+        # Shrinking is always allowed, even for a user already over the limit.
+        statement = statement.where(
+            (new_total <= settings.QUOTA_MAX_STORAGE_BYTES)
+            | (new_total <= UserUsage.payload_bytes + UserUsage.picture_bytes)
+        )
+    if session.exec(statement).rowcount:
+        return
+    if _seed_usage(session, user_id) and session.exec(statement).rowcount:
+        return
+    if grows:
+        raise _quota_error(session, user_id, visualizations)
+
+
+def read_usage(session: Session, user_id: int) -> dict:
+    """Usage totals and limits for display; never writes."""
+    # Writers update the row with plain UPDATEs; skip any stale identity-map copy.
+    usage = session.get(UserUsage, user_id, populate_existing=True)
+    if usage is None:
+        count, total = session.exec(
+            select(func.count(SavedVisualization.id), stored_bytes()).where(
+                SavedVisualization.user_id == user_id
+            )
+        ).one()
+        usage = UserUsage(user_id=user_id, visualization_count=count, payload_bytes=total)
+    return {
+        "visualization_count": usage.visualization_count,
+        "payload_bytes": usage.payload_bytes,
+        "picture_bytes": usage.picture_bytes,
+        "max_visualizations": settings.QUOTA_MAX_VISUALIZATIONS or None,
+        "max_storage_bytes": settings.QUOTA_MAX_STORAGE_BYTES or None,
+    }
@@ -2,15 +2,22 @@ from __future__ import annotations
 
 from typing import Any
 
-from ..core.config import settings
 from ..models import SavedVisualization, User
+from ..storage import get_storage
+from .payloads import extract_values
+from .revisions import current_payload
 
 
 def build_profile_picture_url(user: User) -> str | None:
     if not user.profile_picture:
         return None
-    relative_path = user.profile_picture.lstrip("/")
-    return f"{settings.MEDIA_URL.rstrip('/')}/{relative_path}"
+    return get_storage().url(user.profile_picture)
+
+
+def build_snapshot_url(viz: SavedVisualization) -> str | None:
+    if not viz.snapshot:
+        return None
+    return get_storage().url(viz.snapshot)
 
 
 def serialize_user(user: User) -> dict:
@@ -29,30 +36,28 @@ def serialize_user_with_saved_visualizations(
     return payload
 
 
-def _extract_values(payload: Any) -> Any:
-    if isinstance(payload, list):
-        return payload
-    if isinstance(payload, dict):
-        if isinstance(payload.get("values"), list):
-            return payload.get("values")
-        if isinstance(payload.get("tree"), dict):
-            collected: list[Any] = []
-            stack = [payload.get("tree")]
-            while stack:
-                node = stack.pop()
-                if not isinstance(node, dict) or "value" not in node:
-                    continue
-                collected.append(node.get("value"))
-                if node.get("right") is not None:
-                    stack.append(node.get("right"))
-                if node.get("left") is not None:
-                    stack.append(node.get("left"))
-            if collected:
-                return collected
-    return payload
+def serialize_saved_visualization_summary(
+    viz: SavedVisualization, element_count: int | None, fields: set[str]
+) -> dict:
+    """Serialize only ``fields`` of ``viz``; the payload column may be unloaded."""
+    data: dict[str, Any] = {"id": viz.id}
+    for name in fields:
+        if name == "element_count":
+            data[name] = element_count
+        elif name == "snapshot_url":
+            data[name] = build_snapshot_url(viz)
+        elif name == "payload":
+            data[name] = extract_values(current_payload(viz))
+        else:
+            data[name] = getattr(viz, name)
+    return data
 
 
-def serialize_saved_visualization(viz: SavedVisualization) -> dict:
-    data = viz.model_dump()
-    data["payload"] = _extract_values(data.get("payload"))
+def serialize_saved_visualization(viz: SavedVisualization, include_payload: bool = True) -> dict:
+    data = viz.model_dump(
+        exclude={"payload", "payload_hash", "payload_bytes", "history_bytes", "base_revision"}
+    )
+    if include_payload:
+        data["payload"] = extract_values(current_payload(viz))
+    data["snapshot_url"] = build_snapshot_url(viz)
     return data
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Query
+
+from ..models import SavedVisualization
+
+# Each sortable column has a (user_id, column) index; see SavedVisualization.
+SORT_COLUMNS = {
+    "created_at": SavedVisualization.created_at,
+    "updated_at": SavedVisualization.updated_at,
+    "element_count": SavedVisualization.element_count,
+    "min_value": SavedVisualization.min_value,
+    "max_value": SavedVisualization.max_value,
+    "height": SavedVisualization.height,
+}
+DEFAULT_SORT = "-created_at"
+
+
+@dataclass(frozen=True)
+class VisualizationFilters:
+    """Sort key and range filters for listing saved visualizations."""
+
+    sort: str = DEFAULT_SORT
+    min_elements: int | None = None
+    max_elements: int | None = None
+    min_value: float | None = None
+    max_value: float | None = None
+    min_height: int | None = None
+    max_height: int | None = None
+    is_sorted: bool | None = None
+
+    def apply(self, query):
+        model = SavedVisualization
+        bounds = (
+            (model.element_count, self.min_elements, self.max_elements),
+            (model.min_value, self.min_value, None),
+            (model.max_value, None, self.max_value),
+            (model.height, self.min_height, self.max_height),
+        )
+        for column, lower, upper in bounds:
+            if lower is not None:
+                query = query.where(column >= lower)
+            if upper is not None:
+                query = query.where(column <= upper)
+        if self.is_sorted is not None:
+            query = query.where(model.is_sorted == self.is_sorted)
+
+        descending = self.sort.startswith("-")
+        column = SORT_COLUMNS[self.sort.lstrip("-")]
+        order = column.desc() if descending else column.asc()
+        # id breaks ties so pages stay stable between requests.
+        return query.order_by(order, model.id.desc() if descending else model.id.asc())
+
+
+def visualization_filters(
+    sort: str = Query(
+        DEFAULT_SORT,
+        description=(
+            f"One of {', '.join(sorted(SORT_COLUMNS))}; prefix with '-' for descending."
+        ),
+    ),
+    min_elements: int | None = Query(None, ge=0),
+    max_elements: int | None = Query(None, ge=0),
+    min_value: float | None = Query(None, description="Smallest stored value is at least this."),
+    max_value: float | None = Query(None, description="Largest stored value is at most this."),
+    min_height: int | None = Query(None, ge=0),
+    max_height: int | None = Query(None, ge=0),
+    is_sorted: bool | None = Query(None),
+) -> VisualizationFilters:
+    """FastAPI dependency building VisualizationFilters from query parameters."""
+    if sort.lstrip("-") not in SORT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"Unknown sort field: {sort}")
+    return VisualizationFilters(
+        sort=sort,
+        min_elements=min_elements,
+        max_elements=max_elements,
+        min_value=min_value,
+        max_value=max_value,
+        min_height=min_height,
+        max_height=max_height,
+        is_sorted=is_sorted,
+    )
@@ -0,0 +1,211 @@
+"""Incremental parser for the create-visualization request body.
+
+The body is ``{"name": ..., "kind": ..., "payload": [...]}``. A flat
+``payload`` array is decoded chunk by chunk straight into an ``array('d')``,
+so a large save never exists as a list of Python objects, and the first
+non-numeric element fails the request before the rest is read. Object
+payloads (``{"values": [...]}`` and legacy trees) are kept as text and
+decoded once at the end.
+
+Malformed JSON raises ``json.JSONDecodeError``; well-formed JSON with a
+non-numeric payload raises a plain ``ValueError``.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from array import array
+from typing import Any
+
+from .payloads import numeric_values
+
+_WS = re.compile(r"[ \t\n\r]*")
+_NUMBER = r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?"
+# A comma-separated run of plain numbers: the fast path, one float() per element.
+_NUMBER_RUN = re.compile(rf"[ \t\n\r]*{_NUMBER}(?:[ \t\n\r]*,[ \t\n\r]*{_NUMBER})*[ \t\n\r]*")
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"')
+_LITERALS = (("true", 1.0), ("false", 0.0))
+# Fields and array elements are short; cap how long one may stay incomplete.
+MAX_FIELD_CHARS = 64 * 1024
+
+_START, _KEY_OR_END, _KEY, _COLON, _VALUE, _SEP, _DONE = range(7)
+_ARRAY_FIRST, _ARRAY_VALUE, _ARRAY_SEP, _OBJECT = range(7, 11)
+
+NUMERIC_ERROR = "Payload values must be numeric."
+SHAPE_ERROR = "Payload must be an array of numbers or an object with a 'values' array."
+
+
+class VisualizationBodyParser:
+    """Feed raw body chunks, then ``close()`` for the fields with a packed payload."""
+
+    def __init__(self) -> None:
+        self.fields: dict[str, Any] = {}
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._offset = 0  # characters already consumed, for error positions
+        self._pending: list[str] = []  # text held back while inside an object payload
+        self._state = _START
+        self._key: str | None = None
+
+    def feed(self, chunk: bytes) -> None:
+        self._append(self._decode(chunk, final=False))
+        if self._state != _OBJECT:
+            self._run(final=False)
+
+    def close(self) -> dict[str, Any]:
+        self._append(self._decode(b"", final=True))
+        if self._pending:
+            self._buf += "".join(self._pending)
+            self._pending = []
+        self._run(final=True)
+        if self._state != _DONE:
+            self._fail("Expecting value", len(self._buf))
+        payload = self.fields.get("payload")
+        if payload is not None and not isinstance(payload, array):
+            self.fields["payload"] = array("d", numeric_values(payload))
+        return self.fields
+
+    def _decode(self, chunk: bytes, final: bool) -> str:
+        try:
+            return self._decoder.decode(chunk, final)
+        except UnicodeDecodeError as exc:
+            raise json.JSONDecodeError(f"Invalid UTF-8: {exc.reason}", "", self._offset) from exc
+
+    def _append(self, text: str) -> None:
+        # Object payloads are only parsed at close(); avoid re-copying the buffer.
+        if self._state == _OBJECT:
+            self._pending.append(text)
+        else:
+            self._buf += text
+
+    def _fail(self, msg: str, pos: int) -> None:
+        raise json.JSONDecodeError(msg, self._buf, pos)
+
+    def _run(self, final: bool) -> None:
+        buf = self._buf
+        i = 0
+        while True:
+            if self._state in (_ARRAY_FIRST, _ARRAY_VALUE, _ARRAY_SEP):
+                i = self._scan_array(i, final)
+                if self._state != _SEP:
+                    break
+            if self._state == _OBJECT:
+                if not final:
+                    break
+                self.fields["payload"], i = json.JSONDecoder().raw_decode(buf, i)
+                self._state = _SEP
+            i = _WS.match(buf, i).end()
+            if i == len(buf):
+                break
+            char = buf[i]
+            state = self._state
+            if state == _START:
+                if char != "{":
+                    self._fail("Expecting '{'", i)
+                self._state, i = _KEY_OR_END, i + 1
+            elif state in (_KEY_OR_END, _KEY):
+                if char == "}" and state == _KEY_OR_END:
+                    self._state, i = _DONE, i + 1
+                    continue
+                if char != '"':
+                    self._fail("Expecting property name enclosed in double quotes", i)
+                match = _STRING.match(buf, i)
+                if match is None:
+                    if final or len(buf) - i > MAX_FIELD_CHARS:
+                        self._fail("Unterminated string", i)
+                    break
+                self._key = json.loads(match.group())
+                self._state, i = _COLON, match.end()
+            elif state == _COLON:
+                if char != ":":
+                    self._fail("Expecting ':' delimiter", i)
+                self._state, i = _VALUE, i + 1
+            elif state == _VALUE:
+                if self._key == "payload":
+                    if char == "[":
+                        self.fields["payload"] = array("d")
+                        self._state, i = _ARRAY_FIRST, i + 1
+                    elif char == "{":
+                        self._state = _OBJECT
+                    else:
+                        raise ValueError(SHAPE_ERROR)
+                    continue
+                try:
+                    value, end = json.JSONDecoder().raw_decode(buf, i)
+                except json.JSONDecodeError:
+                    if final or len(buf) - i > MAX_FIELD_CHARS:
+                        raise
+                    break
+                if end == len(buf) and not final:
+                    break  # a number at the end of the buffer may continue
+                self.fields[self._key] = value
+                self._state, i = _SEP, end
+            elif state == _SEP:
+                if char == ",":
+                    self._state, i = _KEY, i + 1
+                elif char == "}":
+                    self._state, i = _DONE, i + 1
+                else:
+                    self._fail("Expecting ',' delimiter", i)
+            else:
+                self._fail("Extra data", i)
+        # An object payload stops here with i on its '{'; close() resumes from it.
+        self._offset += i
+        self._buf = buf[i:]
+
+    def _scan_array(self, i: int, final: bool) -> int:
+        buf = self._buf
+        values = self.fields["payload"]
+        # Tokens cannot span a delimiter, so everything up to the last one is complete.
+        limit = len(buf) if final else max(buf.rfind(",", i), buf.rfind("]", i)) + 1
+        if limit <= i:
+            if len(buf) - i > MAX_FIELD_CHARS:
+                self._fail("Array element is too long", i)
+            return i
+        while True:
+            if self._state == _ARRAY_SEP:
+                i = _WS.match(buf, i, limit).end()
+                if i == limit:
+                    return i
+                if buf[i] == ",":
+                    self._state, i = _ARRAY_VALUE, i + 1
+                elif buf[i] == "]":
+                    self._state = _SEP
+                    return i + 1
+                else:
+                    self._fail("Expecting ',' delimiter", i)
+                continue
+            run = _NUMBER_RUN.match(buf, i, limit)
+            if run is not None:
+                values.extend(map(float, run.group().split(",")))
+                self._state, i = _ARRAY_SEP, run.end()
+                continue
+            i = _WS.match(buf, i, limit).end()
+            if i == limit:
+                return i
+            char = buf[i]
+            if char == "]" and self._state == _ARRAY_FIRST:
+                self._state = _SEP
+                return i + 1
+            if char == '"':
+                match = _STRING.match(buf, i, limit)
+                if match is None:
+                    if final:
+                        self._fail("Unterminated string", i)
+                    return i
+                try:
+                    values.append(float(json.loads(match.group())))
+                except ValueError:
+                    raise ValueError(NUMERIC_ERROR) from None
+                self._state, i = _ARRAY_SEP, match.end()
+                continue
+            for literal, number in _LITERALS:
+                if buf.startswith(literal, i, limit):
+                    values.append(number)
+                    self._state, i = _ARRAY_SEP, i + len(literal)
+                    break
+            else:
+                # null, nested containers or garbage: rejected without reading further.
+                raise ValueError(NUMERIC_ERROR)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+from ..engine import BstStructure, OperationError
+from ..models import SavedVisualization
+
+# Kinds whose values encode a shape, so height/balance are derived from them.
+TREE_KINDS = ("bst", "binaryheap")
+
+METADATA_FIELDS = (
+    "element_count",
+    "min_value",
+    "max_value",
+    "is_sorted",
+    "height",
+    "balance_factor",
+)
+
+
+def _complete_tree_height(n: int, index: int) -> int:
+    # In an array-backed complete tree the leftmost path is always the deepest.
+    height = 0
+    while index < n:
+        height += 1
+        index = 2 * index + 1
+    return height
+
+
+def compute_metadata(kind: str, values: Sequence[float]) -> dict:
+    """Derive the indexed listing columns from normalized payload values."""
+    n = len(values)
+    metadata = {
+        "element_count": n,
+        "min_value": min(values) if n else None,
+        "max_value": max(values) if n else None,
+        "is_sorted": all(values[i] <= values[i + 1] for i in range(n - 1)),
+        "height": None,
+        "balance_factor": None,
+    }
+    if kind == "binaryheap":
+        metadata["height"] = _complete_tree_height(n, 0)
+        metadata["balance_factor"] = _complete_tree_height(n, 1) - _complete_tree_height(n, 2)
+    elif kind == "bst":
+        try:
+            metadata["height"], metadata["balance_factor"] = BstStructure.shape_of(values)
+        except OperationError:
+            # Duplicates: not a valid BST payload, so it has no tree shape.
+            pass
+    return metadata
+
+
+def apply_metadata(viz: SavedVisualization, values: Sequence[float]) -> None:
+    for name, value in compute_metadata(viz.kind, values).items():
+        setattr(viz, name, value)
+
+
+def apply_edit_metadata(viz: SavedVisualization, ops: Iterable[dict]) -> None:
+    """Update the listing columns of a linear-kind ``viz`` for ``ops``, values unseen.
+
+    ``element_count`` stays exact. Added values widen the range and, at either
+    end of a sorted payload, decide ``is_sorted``; where the result depends on
+    values that were not read (a removed extreme, an overwritten element),
+    the column becomes NULL until the revisions are folded and it is
+    recomputed from the values.
+    """
+    n = viz.element_count
+    low, high, ordered = viz.min_value, viz.max_value, viz.is_sorted
+    for op in ops:
+        name = op["op"]
+        value = float(op["value"]) if op.get("value") is not None else None
+        if name in ("push", "insert"):
+            index = n if name == "push" else op["index"]
+            if n == 0:
+                ordered = True
+            elif ordered is True and index == n:
+                ordered = None if high is None else value >= high
+            elif ordered is True and index == 0:
+                ordered = None if low is None else value <= low
+            elif ordered is not False:
+                ordered = None
+            low = value if n == 0 else (None if low is None else min(low, value))
+            high = value if n == 0 else (None if high is None else max(high, value))
+            n += 1
+        elif name in ("pop", "delete"):
+            n -= 1
+            # Removing any element keeps a sorted payload sorted.
+            ordered = True if ordered is True or n <= 1 else None
+            low = high = None
+        elif name == "set":
+            ordered = True if n == 1 else None
+            low = high = value if n == 1 else None
+    if n == 0:
+        low = high = None
+        ordered = True
+    viz.element_count = n
+    viz.min_value, viz.max_value, viz.is_sorted = low, high, ordered
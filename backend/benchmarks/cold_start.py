@@ -0,0 +1,109 @@
+"""Measure cold start: import time and time to the first healthy response.
+
+Each run spawns a fresh uvicorn process (as a container restart would), polls
+``/api/v1/health`` until it answers 200 and records the elapsed wall time.
+Startup runs in the ``dev`` environment against a throwaway SQLite database so
+``init_db``, the probes and the background threads are all included.
+
+Run from ``backend/``::
+
+    python benchmarks/cold_start.py --runs 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def _env(workdir: str) -> dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        ENV="dev",
+        SECRET_KEY="benchmark-secret",
+        DATABASE_URL=f"sqlite:///{workdir}/bench.db",
+        MEDIA_ROOT=f"{workdir}/media",
+        LOG_LEVEL="WARNING",
+    )
+    return env
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def import_seconds(env: dict[str, str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", "import app.main"], cwd=BACKEND_DIR, env=env, check=True
+    )
+    return time.perf_counter() - start
+
+
+def first_healthy_seconds(env: dict[str, str], timeout: float) -> float:
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/api/v1/health"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            if proc.poll() is not None:
+                raise RuntimeError(f"server exited with {proc.returncode}")
+            time.sleep(0.005)
+        raise RuntimeError(f"no healthy response within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def _report(label: str, samples: list[float]) -> None:
+    ms = sorted(s * 1000 for s in samples)
+    print(
+        f"{label:<22} median {statistics.median(ms):8.1f}ms  "
+        f"min {ms[0]:8.1f}ms  max {ms[-1]:8.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    imports, healthy = [], []
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory(prefix="dsstudio-cold-") as workdir:
+            env = _env(workdir)
+            imports.append(import_seconds(env))
+            healthy.append(first_healthy_seconds(env, args.timeout))
+    _report("import app.main", imports)
+    _report("first healthy response", healthy)
+
+
+if __name__ == "__main__":
+    main()
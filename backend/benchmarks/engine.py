@@ -0,0 +1,86 @@
+"""Benchmark the server-side structure engine bulk builds and operation replay.
+
+Run from ``backend/``::
+
+    python benchmarks/engine.py --sizes 1000 10000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.engine import BstStructure, build, replay  # noqa: E402
+
+TRACE_MEMORY = False
+
+
+def timed(label: str, size: int, func) -> object:
+    if TRACE_MEMORY:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    line = (
+        f"{label:<28} n={size:>9,}  {elapsed * 1000:>10.1f}ms  "
+        f"{elapsed / max(size, 1) * 1e9:>8.0f}ns/elem"
+    )
+    if TRACE_MEMORY:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += f"  peak={peak / 2**20:>7.1f}MiB"
+    print(line)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument(
+        "--memory", action="store_true", help="report peak allocations (slows timings)"
+    )
+    args = parser.parse_args()
+    global TRACE_MEMORY
+    TRACE_MEMORY = args.memory
+    rng = random.Random(42)
+
+    for n in args.sizes:
+        shuffled = [float(v) for v in rng.sample(range(n * 4), n)]
+        ascending = sorted(shuffled)
+        # Loop variables are bound as defaults so each closure keeps this size's data.
+        timed("heap heapify (O(n))", n, lambda v=shuffled: build("binaryheap", v))
+        timed("bst replay inserts", n, lambda v=shuffled: build("bst", v))
+        timed("bst sorted -> chain", n, lambda v=ascending: build("bst", v))
+        timed("bst sorted -> balanced", n, lambda v=ascending: BstStructure.from_sorted(v))
+        stack = build("stack", [])
+        ops = [{"op": "push", "value": v} for v in shuffled] + [{"op": "pop"}] * n
+        timed(
+            "stack push+pop replay",
+            2 * n,
+            lambda s=stack, o=ops: replay(s, o, include_trace=False),
+        )
+        queue = build("queue", [])
+        ops = [{"op": "enqueue", "value": v} for v in shuffled] + [{"op": "dequeue"}] * n
+        timed(
+            "queue enqueue+dequeue",
+            2 * n,
+            lambda q=queue, o=ops: replay(q, o, include_trace=False),
+        )
+        heap = build("binaryheap", shuffled)
+        ops = [{"op": "extract"}] * min(n, 100_000)
+        timed(
+            "heap extract replay",
+            len(ops),
+            lambda h=heap, o=ops: replay(h, o, include_trace=False),
+        )
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Measure bytes on the wire and DB time for list endpoints with and without payloads.
+
+Run from ``backend/``::
+
+    python benchmarks/list_payloads.py --visualizations 200 --size 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+os.environ.setdefault("ENV", "test")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("MEDIA_ROOT", tempfile.mkdtemp(prefix="dsstudio-bench-media-"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.db import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+db_time = 0.0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _start(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_start"] = time.perf_counter()
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _stop(conn, cursor, statement, parameters, context, executemany):
+    global db_time
+    db_time += time.perf_counter() - conn.info.pop("query_start")
+
+
+def measure(client: TestClient, label: str, params: dict, repeat: int) -> None:
+    global db_time
+    db_time = 0.0
+    size = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get("/api/v1/profile/me/saved-visualizations", params=params)
+        assert response.status_code == 200, response.text
+        size = len(response.content)
+    total = (time.perf_counter() - start) / repeat * 1000
+    print(
+        f"{label:<18} {size / 1024:>10.1f} KiB  total={total:.2f}ms  "
+        f"db={db_time / repeat * 1000:.2f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--visualizations", type=int, default=100)
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    SQLModel.metadata.create_all(engine)
+    client = TestClient(app)
+    email = f"bench_{uuid.uuid4().hex}@example.com"
+    client.post(
+        "/api/v1/auth/register",
+        json={"name": "Bench", "surname": "User", "email": email, "password": "password123"},
+    )
+    client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    for n in range(args.visualizations):
+        client.post(
+            "/api/v1/profile/me/saved-visualizations",
+            json={"name": f"viz-{n}", "kind": "array", "payload": list(range(args.size))},
+        )
+
+    measure(client, "full payloads", {}, args.repeat)
+    measure(client, "include_payload=0", {"include_payload": "false"}, args.repeat)
+    measure(client, "fields=name,kind", {"fields": "name,kind"}, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
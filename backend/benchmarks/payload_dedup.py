@@ -0,0 +1,95 @@
+"""Report payload storage with content-addressed blobs versus one copy per row.
+
+The synthetic workload mixes the schema example, a few shared sample
+datasets, repeatedly imported large arrays and unique payloads.
+
+Run from ``backend/``::
+
+    python benchmarks/payload_dedup.py --saves 2000 --large 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+os.environ.setdefault("ENV", "test")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("MEDIA_ROOT", tempfile.mkdtemp(prefix="dsstudio-bench-media-"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import func  # noqa: E402
+from sqlmodel import Session, SQLModel, select  # noqa: E402
+
+from app.db import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import PayloadBlob  # noqa: E402
+from app.utils.payload_blobs import canonical_payload  # noqa: E402
+
+
+def workload(saves: int, large: int, seed: int) -> list[list[float]]:
+    rng = random.Random(seed)
+    samples = [[7, 3, -2, 5]] + [
+        [rng.randint(-50, 50) for _ in range(rng.randint(5, 30))] for _ in range(9)
+    ]
+    imports = [[rng.random() * 1000 for _ in range(large)] for _ in range(3)]
+    payloads = []
+    for _ in range(saves):
+        roll = rng.random()
+        if roll < 0.6:
+            payloads.append(rng.choice(samples))
+        elif roll < 0.75:
+            payloads.append(rng.choice(imports))
+        else:
+            payloads.append([rng.randint(-100, 100) for _ in range(rng.randint(5, 200))])
+    return payloads
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--saves", type=int, default=1000)
+    parser.add_argument("--large", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    SQLModel.metadata.create_all(engine)
+    client = TestClient(app)
+    email = f"bench_{uuid.uuid4().hex}@example.com"
+    client.post(
+        "/api/v1/auth/register",
+        json={"name": "Bench", "surname": "User", "email": email, "password": "password123"},
+    )
+    client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+
+    payloads = workload(args.saves, args.large, args.seed)
+    start = time.perf_counter()
+    for n, payload in enumerate(payloads):
+        response = client.post(
+            "/api/v1/profile/me/saved-visualizations",
+            json={"name": f"viz-{n}", "kind": "array", "payload": payload},
+        )
+        assert response.status_code == 201, response.text
+    elapsed = time.perf_counter() - start
+
+    inline_bytes = sum(len(canonical_payload(payload)) for payload in payloads)
+    with Session(engine) as session:
+        blob_count, blob_bytes = session.exec(
+            select(func.count(), func.sum(PayloadBlob.size_bytes))
+        ).one()
+    print(f"saves:           {len(payloads)} ({elapsed / len(payloads) * 1000:.2f}ms each)")
+    print(f"distinct blobs:  {blob_count}")
+    print(f"one copy per row {inline_bytes / 1024:>10.1f} KiB")
+    print(f"deduplicated     {blob_bytes / 1024:>10.1f} KiB")
+    print(f"saved            {(1 - blob_bytes / inline_bytes) * 100:>10.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Load test: public snapshot reads vs authenticated saved-visualization reads.
+
+Run from ``backend/``::
+
+    python benchmarks/snapshot_reads.py --requests 2000 --size 5000
+
+Both paths go through the full ASGI stack in-process. The authenticated path
+decodes the cookie, loads the user and the visualization from the database and
+re-serializes the payload; the snapshot path is a plain static file read.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+os.environ.setdefault("ENV", "test")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("MEDIA_ROOT", tempfile.mkdtemp(prefix="dsstudio-bench-media-"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.db import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def _timed(client: TestClient, url: str, count: int) -> list[float]:
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = client.get(url)
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    samples = sorted(samples)
+    total = sum(samples)
+    p50 = samples[len(samples) // 2] * 1000
+    p99 = samples[int(len(samples) * 0.99) - 1] * 1000
+    print(
+        f"{label:<14} {len(samples) / total:>9.0f} req/s  p50={p50:.3f}ms  p99={p99:.3f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--size", type=int, default=1000, help="payload length")
+    args = parser.parse_args()
+
+    SQLModel.metadata.create_all(engine)
+    owner = TestClient(app)
+    email = f"bench_{uuid.uuid4().hex}@example.com"
+    owner.post(
+        "/api/v1/auth/register",
+        json={"name": "Bench", "surname": "User", "email": email, "password": "password123"},
+    )
+    owner.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    viz_id = owner.post(
+        "/api/v1/profile/me/saved-visualizations",
+        json={"name": "bench", "kind": "array", "payload": list(range(args.size))},
+    ).json()["id"]
+    snapshot_url = owner.post(
+        f"/api/v1/profile/me/saved-visualizations/{viz_id}/publish"
+    ).json()["snapshot_url"]
+
+    anonymous = TestClient(app)
+    owner_url = f"/api/v1/profile/me/saved-visualizations/{viz_id}"
+    _report("authenticated", _timed(owner, owner_url, args.requests))
+    _report("snapshot", _timed(anonymous, snapshot_url, args.requests))
+
+
+if __name__ == "__main__":
+    main()
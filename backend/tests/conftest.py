@@ -1,5 +1,6 @@
 import os
 import sys
+import tempfile
 from pathlib import Path
 
 import pytest
@@ -10,29 +11,42 @@ from sqlmodel import Session, SQLModel, delete
 os.environ.setdefault("ENV", "test")
 os.environ.setdefault("SECRET_KEY", "testing-secret")
 os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+# Settings are read once at import, so the media dir must be isolated up front.
+os.environ.setdefault("MEDIA_ROOT", tempfile.mkdtemp(prefix="dsstudio-media-"))
 
 BACKEND_DIR = Path(__file__).resolve().parents[1]
 if str(BACKEND_DIR) not in sys.path:
     sys.path.insert(0, str(BACKEND_DIR))
 
+from app.core.config import settings  # noqa: E402
 from app.db import engine  # noqa: E402
 from app.main import app  # noqa: E402
-from app.models import SavedVisualization, User  # noqa: E402
+from app.models import (  # noqa: E402
+    Job,
+    PayloadBlob,
+    RevokedToken,
+    SavedVisualization,
+    User,
+    UserUsage,
+    VisualizationRevision,
+)
 
 
 @pytest.fixture(scope="session", autouse=True)
-def create_db(tmp_path_factory):
-    # Use an isolated media directory per test session
-    media_root = tmp_path_factory.mktemp("media")
-    os.environ["MEDIA_ROOT"] = str(media_root)
+def create_db():
     SQLModel.metadata.create_all(engine)
-    return media_root
+    return settings.MEDIA_ROOT_PATH
 
 
 @pytest.fixture(autouse=True)
 def clean_db():
     with Session(engine) as session:
+        session.exec(delete(Job))
+        session.exec(delete(RevokedToken))
+        session.exec(delete(VisualizationRevision))
         session.exec(delete(SavedVisualization))
+        session.exec(delete(PayloadBlob))
+        session.exec(delete(UserUsage))
         session.exec(delete(User))
         session.commit()
     yield
@@ -0,0 +1,49 @@
+from app.core import health
+from app.core.health import db_probe
+from app.db import pool_wait_recent
+from app.middleware import admission_controller
+
+
+def test_sheds_low_priority_when_in_flight_limit_reached(client, monkeypatch):
+    monkeypatch.setattr(admission_controller, "max_in_flight", 1)
+    monkeypatch.setattr(admission_controller, "in_flight", 1)
+
+    shed = client.get("/api/v1/profile/me")
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == str(admission_controller.retry_after)
+
+    # Health checks and auth (high priority) still get through below the hard limit.
+    assert client.get("/api/v1/health").status_code == 200
+    assert client.get("/api/v1/auth/me").status_code == 401
+
+
+def test_hard_limit_sheds_everything_but_health(client, monkeypatch):
+    monkeypatch.setattr(admission_controller, "hard_limit", 2)
+    monkeypatch.setattr(admission_controller, "in_flight", 2)
+    assert client.get("/api/v1/auth/me").status_code == 503
+    assert client.get("/api/v1/health/db").status_code == 200
+
+
+def test_sheds_when_pool_wait_is_high(client, monkeypatch):
+    monkeypatch.setattr(admission_controller, "max_pool_wait_ms", 100)
+    monkeypatch.setattr(pool_wait_recent, "value", lambda: 0.5)
+    assert client.get("/api/v1/profile/me").status_code == 503
+
+
+def test_health_db_serves_cached_probe_result(client, monkeypatch):
+    assert db_probe.run_once()["db"] == "ok"
+    body = client.get("/api/v1/health/db").json()
+    assert body["db"] == "ok"
+    assert "latency_ms" in body
+
+    class BrokenEngine:
+        def connect(self):
+            raise ConnectionError("db unreachable")
+
+    monkeypatch.setattr(health, "engine", BrokenEngine())
+    db_probe.run_once()
+    down = client.get("/api/v1/health/db")
+    assert down.status_code == 503
+    assert down.json()["db"] == "down"
+    monkeypatch.undo()
+    db_probe.run_once()
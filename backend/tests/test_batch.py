@@ -0,0 +1,140 @@
+import uuid
+
+from sqlalchemy import event
+
+from app.db import engine
+
+BATCH_URL = "/api/v1/batch"
+
+
+def login(client):
+    email = f"batch_{uuid.uuid4().hex}@example.com"
+    client.post(
+        "/api/v1/auth/register",
+        json={"name": "Batch", "surname": "User", "email": email, "password": "password123"},
+    )
+    client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    return email
+
+
+def test_batch_runs_page_load_requests_in_one_round_trip(client):
+    email = login(client)
+    response = client.post(
+        BATCH_URL,
+        json={
+            "requests": [
+                {
+                    "id": "create",
+                    "method": "POST",
+                    "path": "/api/v1/profile/me/saved-visualizations",
+                    "body": {"name": "batched", "kind": "stack", "payload": [1, 2]},
+                },
+                {"id": "me", "path": "/api/v1/auth/me"},
+                {"id": "profile", "path": "/api/v1/profile/me?include_payload=false"},
+                {"id": "saved", "path": "/api/v1/profile/me/saved-visualizations"},
+                {"id": "missing", "path": "/api/v1/profile/me/saved-visualizations/999999"},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    results = {item["id"]: item for item in response.json()}
+    assert [item["id"] for item in response.json()] == [
+        "create", "me", "profile", "saved", "missing"
+    ]
+    assert results["create"]["status"] == 201
+    assert results["me"]["body"]["email"] == email
+    assert "payload" not in results["profile"]["body"]["saved_visualizations"][0]
+    assert results["saved"]["body"][0]["payload"] == [1, 2]
+    assert results["missing"]["status"] == 404
+    assert results["missing"]["body"]["error"] == "Saved visualization not found"
+
+
+def test_batch_checks_auth_once(client):
+    login(client)
+    users_queries = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            users_queries.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        response = client.post(
+            BATCH_URL,
+            json={
+                "requests": [
+                    {"method": "DELETE", "path": "/api/v1/profile/me/saved-visualizations/1"},
+                    {
+                        "method": "PATCH",
+                        "path": "/api/v1/profile/me/saved-visualizations/1",
+                        "body": {"operations": [{"op": "pop"}]},
+                    },
+                ]
+            },
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert [item["status"] for item in response.json()] == [404, 404]
+    # Sub-requests reuse the user the batch loaded into the shared session.
+    assert len(users_queries) == 1
+
+
+def test_batch_rejects_unsafe_paths_and_validates_bodies(client):
+    login(client)
+    response = client.post(
+        BATCH_URL,
+        json={
+            "requests": [
+                {"path": "/api/v1/batch", "method": "POST"},
+                {"path": "/api/v1/auth/logout", "method": "POST"},
+                {"path": "/api/v1/profile/me/saved-visualizations/stream"},
+                {"path": "https://example.com/api/v1/health"},
+                {
+                    "method": "POST",
+                    "path": "/api/v1/profile/me/saved-visualizations",
+                    "body": {"name": "x"},
+                },
+            ]
+        },
+    )
+    statuses = [item["status"] for item in response.json()]
+    assert statuses == [400, 400, 400, 400, 422]
+
+
+def test_batch_without_login_returns_per_item_401(client):
+    response = client.post(
+        BATCH_URL,
+        json={"requests": [{"path": "/api/v1/health"}, {"path": "/api/v1/profile/me"}]},
+    )
+    assert [item["status"] for item in response.json()] == [200, 401]
+
+
+def test_batch_size_is_limited(client):
+    response = client.post(BATCH_URL, json={"requests": [{"path": "/api/v1/health"}] * 21})
+    assert response.status_code == 422
+
+
+def test_streaming_create_keeps_the_shared_batch_session(client):
+    login(client)
+    user_selects = []
+
+    def on_execute(conn, cursor, statement, *args):
+        if "FROM users" in statement:
+            user_selects.append(statement)
+
+    create = {
+        "method": "POST",
+        "path": "/api/v1/profile/me/saved-visualizations",
+        "body": {"name": "batched", "kind": "stack", "payload": [1, 2]},
+    }
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        response = client.post(
+            BATCH_URL, json={"requests": [{"id": "a", **create}, {"id": "b", **create}]}
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    assert [item["status"] for item in response.json()] == [201, 201]
+    # Closing the shared session would drop the batch's user from it, and the
+    # second item would have to load it again.
+    assert len(user_selects) == 1
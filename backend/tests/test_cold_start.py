@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.core.config import settings
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Import cost of the app's own modules relative to fastapi + sqlmodel, timed
+# in the same process, so the check holds on fast and slow machines alike.
+# Recorded at 0.39 (median of 12 runs; app.main ~1.1s on a 1-CPU box, of
+# which fastapi + sqlmodel ~0.83s); the budget allows 1.5x that.
+RECORDED_APP_SHARE = 0.39
+IMPORT_BUDGET_SHARE = float(
+    os.environ.get("DSSTUDIO_IMPORT_BUDGET_SHARE", str(1.5 * RECORDED_APP_SHARE))
+)
+LAZY_MODULES = ("jose", "passlib", "pymysql", "boto3", "botocore")
+
+
+def _importtime(module: str) -> dict[str, int]:
+    """Run ``python -X importtime`` and return cumulative microseconds per module."""
+    env = dict(os.environ, ENV="test", DATABASE_URL="sqlite://")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def test_app_import_skips_heavy_dependencies():
+    timings = _importtime("app.main")
+    eager = sorted(name for name in timings if name.split(".")[0] in LAZY_MODULES)
+    assert eager == []
+    framework = timings["fastapi"] + timings["sqlmodel"]
+    own = timings["app.main"] - framework
+    assert own / framework < IMPORT_BUDGET_SHARE, (
+        f"app modules took {own / 1000:.0f}ms on top of {framework / 1000:.0f}ms "
+        f"for fastapi + sqlmodel"
+    )
+
+
+def test_paths_are_resolved_once():
+    assert settings.MEDIA_ROOT_PATH is settings.MEDIA_ROOT_PATH
+    assert settings.PROFILE_PICTURE_PATH.parent == settings.MEDIA_ROOT_PATH
@@ -0,0 +1,213 @@
+import json
+import random
+import shutil
+import subprocess
+import uuid
+from pathlib import Path
+
+import pytest
+
+from app.engine import (
+    ArrayStructure,
+    BstStructure,
+    HeapStructure,
+    LinkedListStructure,
+    QueueStructure,
+    StackStructure,
+    Structure,
+    build,
+    replay,
+)
+
+STRUCTURES_DIR = Path(__file__).resolve().parents[2] / "frontend/src/algorithms/structures"
+
+
+def test_array_mirrors_js_results():
+    arr = ArrayStructure([1, 2])
+    assert arr.insert(3) == {"index": 2}
+    assert arr.insert(9, 5) == {"error": "Invalid index."}
+    assert arr.delete_at(1) == {"removed": 2, "index": 1}
+    assert arr.search(3) == {"foundIndex": 1, "visited": [0, 1]}
+    assert ArrayStructure().delete_at(0) == {"error": "Array is empty."}
+
+
+def test_stack_queue_and_linked_list():
+    stack = StackStructure([5, 6])
+    assert stack.peek() == 6
+    assert [stack.pop(), stack.pop(), stack.pop()] == [6, 5, None]
+
+    queue = QueueStructure([4, 5])
+    queue.enqueue(6)
+    assert (queue.peek_front(), queue.peek_rear()) == (4, 6)
+    assert [queue.dequeue() for _ in range(4)] == [4, 5, 6, None]
+
+    linked = LinkedListStructure([1, 3])
+    assert linked.insert_at(1, 2) == {"index": 1}
+    assert linked.insert_at(10, 9) == {"error": "Invalid index."}
+    assert linked.delete_by_value(2)["visited"] == [0, 1]
+    assert linked.search(9) == {"found": False, "index": -1, "visited": [0, 1]}
+
+
+def test_bst_insert_delete_and_bulk_builds():
+    bst = BstStructure.from_values([5, 3, 7, 2, 4, 6, 8])
+    assert bst.traverse("in") == [2, 3, 4, 5, 6, 7, 8]
+    assert bst.delete(2)["deleted"] is True
+    assert bst.delete(7)["deleted"] is True
+    assert bst.traverse("in") == [3, 4, 5, 6, 8]
+    assert bst.delete(100)["error"] == "Value not found."
+
+    chain = BstStructure.from_values(list(range(1000)))
+    assert chain.height() == 1000
+    assert chain.to_values() == list(range(1000))
+
+    balanced = BstStructure.from_sorted(range(1023))
+    assert balanced.height() == 10
+    assert balanced.balance_factor() == 0
+    assert balanced.traverse("in") == list(range(1023))
+
+
+def test_heap_heapify_matches_sequential_semantics():
+    heap = HeapStructure([5, 3, 8, 1], mode="min")
+    assert heap.peek() == 1
+    assert [heap.extract()["value"] for _ in range(4)] == [1, 3, 5, 8]
+    assert heap.extract() == {"value": None, "swaps": []}
+
+    heap = HeapStructure([4, 7, 2, 9], mode="max")
+    assert heap.extract()["value"] == 9
+    heap.set_mode("min")
+    assert heap.peek() == 2
+
+
+def test_incomplete_structure_fails_at_construction():
+    class Partial(Structure):
+        kind = "partial"
+
+        def to_values(self):
+            return []
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def _random_operations(kind: str, rng: random.Random, count: int) -> list[dict]:
+    ops_by_kind = {
+        "array": ["insert", "insert_at_index", "delete_at", "search"],
+        "stack": ["push", "pop", "peek"],
+        "queue": ["enqueue", "dequeue", "peek_front", "peek_rear"],
+        "linkedlist": [
+            "append",
+            "prepend",
+            "insert_at",
+            "delete_at",
+            "delete_by_value",
+            "search",
+            "remove",
+        ],
+        "bst": ["insert", "insert", "delete", "search"],
+        "binaryheap": ["insert", "insert", "extract", "peek", "set_mode"],
+    }
+    operations = []
+    for _ in range(count):
+        name = rng.choice(ops_by_kind[kind])
+        op = {"op": name, "value": float(rng.randint(-20, 20)), "index": rng.randint(-1, 12)}
+        if name == "insert_at_index":
+            op["op"] = "insert"
+        elif kind == "array" and name == "insert":
+            del op["index"]
+        if name == "set_mode":
+            op = {"op": name, "mode": rng.choice(["min", "max"])}
+        operations.append(op)
+    return operations
+
+
+JS_HARNESS = """
+import { createArrayStructure } from "%(dir)s/array.js";
+import { createStackStructure } from "%(dir)s/stack.js";
+import { createQueueStructure } from "%(dir)s/queue.js";
+import { createLinkedListStructure } from "%(dir)s/linkedList.js";
+import { createBstStructure } from "%(dir)s/bst.js";
+import { createHeapStructure } from "%(dir)s/heap.js";
+
+const cases = JSON.parse(process.argv[1]);
+const make = {
+  array: createArrayStructure, stack: createStackStructure, queue: createQueueStructure,
+  linkedlist: createLinkedListStructure, bst: createBstStructure, binaryheap: createHeapStructure,
+};
+const call = {
+  insert: (s, o) => (o.index === undefined ? s.insert(o.value) : s.insert(o.value, o.index)),
+  delete_at: (s, o) => s.deleteAt(o.index),
+  search: (s, o) => s.search(o.value),
+  push: (s, o) => s.push(o.value), pop: (s) => s.pop(), peek: (s) => s.peek(),
+  enqueue: (s, o) => s.enqueue(o.value), dequeue: (s) => s.dequeue(),
+  peek_front: (s) => s.peekFront(), peek_rear: (s) => s.peekRear(),
+  append: (s, o) => s.append(o.value), prepend: (s, o) => s.prepend(o.value),
+  insert_at: (s, o) => s.insertAt(o.index, o.value),
+  delete_by_value: (s, o) => s.deleteByValue(o.value), remove: (s) => s.remove(),
+  delete: (s, o) => s.delete(o.value), extract: (s) => s.extract(),
+  set_mode: (s, o) => { s.setMode(o.mode); return { mode: s.getMode() }; },
+};
+const out = cases.map(({ kind, values, ops }) => {
+  const s = make[kind](values);
+  const results = ops.map((o) => call[o.op](s, o) ?? null);
+  const final = kind === "bst" ? s.toPayload().values : s.toArray();
+  return { results, final };
+});
+console.log(JSON.stringify(out));
+"""
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_random_operation_parity_with_js_structures():
+    rng = random.Random(1234)
+    cases = []
+    for kind in ("array", "stack", "queue", "linkedlist", "bst", "binaryheap"):
+        for _ in range(5):
+            values = rng.sample(range(-30, 30), rng.randint(0, 10))
+            ops = _random_operations(kind, rng, 60)
+            cases.append({"kind": kind, "values": values, "ops": ops})
+
+    script = JS_HARNESS % {"dir": STRUCTURES_DIR.as_posix()}
+    completed = subprocess.run(
+        ["node", "--input-type=module", "-e", script, json.dumps(cases)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    expected = json.loads(completed.stdout)
+
+    for case, js in zip(cases, expected, strict=True):
+        structure = build(case["kind"], [float(v) for v in case["values"]])
+        steps = replay(structure, case["ops"])
+        assert [step["result"] for step in steps] == js["results"], case["kind"]
+        assert structure.to_values() == js["final"], case["kind"]
+
+
+def test_operations_endpoint_replays_without_saving(client):
+    email = f"engine_{uuid.uuid4().hex}@example.com"
+    client.post(
+        "/api/v1/auth/register",
+        json={"name": "Eng", "surname": "User", "email": email, "password": "password123"},
+    )
+    client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    viz_id = client.post(
+        "/api/v1/profile/me/saved-visualizations",
+        json={"name": "heap", "kind": "binaryheap", "payload": [5, 3, 8]},
+    ).json()["id"]
+
+    response = client.post(
+        f"/api/v1/profile/me/saved-visualizations/{viz_id}/operations",
+        json={"operations": [{"op": "insert", "value": 1}, {"op": "extract"}]},
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["steps"][1] == {"op": "extract", "result": {"value": 1, "swaps": [[0, 1]]}}
+    assert body["values"] == [3, 5, 8]
+
+    stored = client.get(f"/api/v1/profile/me/saved-visualizations/{viz_id}").json()
+    assert stored["payload"] == [5, 3, 8]
+
+    bad = client.post(
+        f"/api/v1/profile/me/saved-visualizations/{viz_id}/operations",
+        json={"operations": [{"op": "pop"}]},
+    )
+    assert bad.status_code == 400
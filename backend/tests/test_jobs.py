@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+
+from sqlmodel import Session
+
+from app.db import engine
+from app.jobs import enqueue, job_handler, run_pending
+from app.jobs.queue import claim_next
+from app.models import Job
+
+calls: list[dict] = []
+failures = {"remaining": 0}
+
+
+@job_handler("test_record")
+def record(payload: dict) -> None:
+    calls.append(payload)
+
+
+@job_handler("test_flaky")
+def flaky(payload: dict) -> None:
+    if failures["remaining"] > 0:
+        failures["remaining"] -= 1
+        raise RuntimeError("boom")
+    calls.append(payload)
+
+
+def _make_due(job_id: int) -> None:
+    with Session(engine) as session:
+        job = session.get(Job, job_id)
+        job.run_after = datetime.utcnow() - timedelta(seconds=1)
+        session.add(job)
+        session.commit()
+
+
+def test_enqueued_job_runs_only_after_commit():
+    calls.clear()
+    with Session(engine) as session:
+        enqueue(session, "test_record", {"n": 1})
+        assert run_pending() == 0
+        session.commit()
+    assert run_pending() == 1
+    assert calls == [{"n": 1}]
+
+
+def test_claimed_job_is_not_claimed_twice():
+    with Session(engine) as session:
+        enqueue(session, "test_record", {"n": 2})
+        session.commit()
+    with Session(engine) as first, Session(engine) as second:
+        assert claim_next(first) is not None
+        assert claim_next(second) is None
+
+
+def test_failed_job_retries_with_backoff_then_fails():
+    calls.clear()
+    failures["remaining"] = 10
+    with Session(engine) as session:
+        job = enqueue(session, "test_flaky", {"n": 3})
+        job.max_attempts = 2
+        session.commit()
+        job_id = job.id
+
+    assert run_pending() == 1
+    with Session(engine) as session:
+        job = session.get(Job, job_id)
+        assert job.status == "queued"
+        assert job.attempts == 1
+        assert job.run_after > datetime.utcnow()
+        assert "boom" in job.last_error
+
+    # Backoff keeps it out of the queue until run_after passes.
+    assert run_pending() == 0
+    _make_due(job_id)
+    assert run_pending() == 1
+    with Session(engine) as session:
+        assert session.get(Job, job_id).status == "failed"
+    assert calls == []
+
+
+def test_jobs_health_reports_queue_depth(client):
+    with Session(engine) as session:
+        enqueue(session, "test_record", {"n": 4})
+        session.commit()
+    body = client.get("/api/v1/health/jobs").json()
+    assert body["queue"]["queued"] == 1
+    assert "p95_ms" in body["latency"]
@@ -0,0 +1,77 @@
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.lab import run_workload
+from app.lab.pool import benchmark_lab
+
+LAB_URL = "/api/v1/lab/benchmarks"
+
+
+def login(client):
+    email = f"lab_{uuid.uuid4().hex}@example.com"
+    client.post(
+        "/api/v1/auth/register",
+        json={"name": "Lab", "surname": "User", "email": email, "password": "password123"},
+    )
+    client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+
+
+@pytest.fixture()
+def lab():
+    yield benchmark_lab
+    benchmark_lab.shutdown()
+    benchmark_lab._cache.clear()
+
+
+@pytest.mark.parametrize("structure", ["stack", "queue", "bst", "binaryheap"])
+def test_workload_returns_one_curve_per_operation(structure):
+    result = run_workload(structure, "random", [300, 100], seed=1, repeats=2, cpu_seconds=30)
+    assert result["truncated"] is False
+    assert len(result["series"]) == 2
+    for series in result["series"]:
+        assert series["complexity"].startswith("O(")
+        assert [point["size"] for point in series["points"]] == [100, 300]
+        assert all(point["seconds"] > 0 for point in series["points"])
+
+
+def test_workload_stops_at_the_cpu_limit():
+    # Sorted input degrades the BST to a chain: quadratic inserts.
+    result = run_workload("bst", "sorted", [100, 20_000], seed=0, repeats=1, cpu_seconds=0.05)
+    assert result["truncated"] is True
+    assert [point["size"] for point in result["series"][0]["points"]] == [100]
+
+
+def test_benchmark_endpoint_runs_in_pool_and_caches(client, lab):
+    login(client)
+    body = {"structure": "stack", "sizes": [10, 1000], "repeats": 1}
+
+    first = client.post(LAB_URL, json=body)
+    assert first.status_code == 200, first.text
+    data = first.json()
+    assert data["cached"] is False
+    assert data["workload"] == "push_pop"
+    assert [s["operation"] for s in data["series"]] == ["push", "pop"]
+
+    second = client.post(LAB_URL, json=body)
+    assert second.json()["cached"] is True
+    assert second.json()["series"] == data["series"]
+    assert lab.snapshot()["hits"] >= 1
+
+
+def test_benchmark_limits(client, lab, monkeypatch):
+    assert client.post(LAB_URL, json={"structure": "stack", "sizes": [10]}).status_code == 401
+
+    login(client)
+    monkeypatch.setattr(settings, "LAB_MAX_SIZE", 100)
+    too_big = client.post(LAB_URL, json={"structure": "stack", "sizes": [101]})
+    assert too_big.status_code == 400
+
+    unknown = client.post(LAB_URL, json={"structure": "graph", "sizes": [10]})
+    assert unknown.status_code == 422
+
+    monkeypatch.setattr(lab, "max_pending", 0)
+    busy = client.post(LAB_URL, json={"structure": "queue", "sizes": [10]})
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"]
@@ -0,0 +1,65 @@
+import anyio
+import boto3
+import moto
+import pytest
+
+from app.core.config import settings
+from app.storage import LocalMediaStorage, S3MediaStorage, get_storage
+
+
+def test_local_storage_round_trip(tmp_path):
+    storage = LocalMediaStorage(tmp_path, "/media/")
+
+    anyio.run(storage.save, "profile_pictures/a.png", b"png-bytes", "image/png")
+    assert (tmp_path / "profile_pictures" / "a.png").read_bytes() == b"png-bytes"
+    assert storage.exists("profile_pictures/a.png")
+    assert storage.url("profile_pictures/a.png") == "/media/profile_pictures/a.png"
+
+    anyio.run(storage.delete, "profile_pictures/a.png")
+    assert not storage.exists("profile_pictures/a.png")
+    storage.remove("profile_pictures/a.png")  # already gone
+
+
+def test_local_storage_rejects_keys_outside_root(tmp_path):
+    storage = LocalMediaStorage(tmp_path / "media", "/media")
+    with pytest.raises(ValueError):
+        storage.write("../escape.txt", b"x")
+
+
+def test_s3_storage_against_mocked_bucket(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+
+    with moto.mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="media")
+        storage = S3MediaStorage(
+            "media",
+            region="us-east-1",
+            key_prefix="dsstudio",
+            public_base_url="https://cdn.example.com/",
+            max_pool_connections=4,
+        )
+
+        anyio.run(storage.save, "snapshots/abc.json", b"{}", "application/json")
+        assert storage.exists("snapshots/abc.json")
+        head = storage.client.head_object(Bucket="media", Key="dsstudio/snapshots/abc.json")
+        assert head["ContentType"] == "application/json"
+        # Public, never-expiring links rather than presigned ones.
+        assert storage.url("/snapshots/abc.json") == (
+            "https://cdn.example.com/dsstudio/snapshots/abc.json"
+        )
+
+        anyio.run(storage.delete, "snapshots/abc.json")
+        assert not storage.exists("snapshots/abc.json")
+
+
+def test_s3_backend_requires_a_public_base_url(monkeypatch):
+    monkeypatch.setattr(settings, "MEDIA_STORAGE_BACKEND", "s3")
+    monkeypatch.setattr(settings, "S3_BUCKET", "media")
+    monkeypatch.setattr(settings, "S3_PUBLIC_BASE_URL", None)
+    get_storage.cache_clear()
+    try:
+        with pytest.raises(ValueError, match="S3_PUBLIC_BASE_URL"):
+            get_storage()
+    finally:
+        get_storage.cache_clear()
@@ -0,0 +1,93 @@
+import uuid
+
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.db import engine
+from app.jobs import enqueue, run_pending
+from app.models import PayloadBlob, SavedVisualization, User
+from app.utils.payload_blobs import blob_cache, collect_garbage, load_payload
+
+LIST_URL = "/api/v1/profile/me/saved-visualizations"
+
+
+def login(client):
+    email = f"blob_{uuid.uuid4().hex}@example.com"
+    client.post(
+        "/api/v1/auth/register",
+        json={"name": "Blob", "surname": "User", "email": email, "password": "password123"},
+    )
+    client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    return email
+
+
+def create(client, payload):
+    response = client.post(LIST_URL, json={"name": "sample", "kind": "stack", "payload": payload})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def blobs():
+    with Session(engine) as session:
+        rows = session.exec(select(PayloadBlob)).all()
+        return {tuple(blob.values): blob.ref_count for blob in rows}
+
+
+def test_identical_payloads_share_one_blob(client, monkeypatch):
+    monkeypatch.setattr(settings, "REVISION_FOLD_DELAY_SECONDS", 0)
+    login(client)
+    create(client, [7, 3, -2, 5])
+    login(client)
+    second = create(client, [7.0, "3", -2, 5.0])
+    assert blobs() == {(7, 3, -2, 5): 2}
+
+    assert client.get(f"{LIST_URL}/{second}").json()["payload"] == [7, 3, -2, 5]
+    client.patch(f"{LIST_URL}/{second}", json={"operations": [{"op": "pop"}]})
+    # The edited row's blob stays put, now also referenced as its revision 0.
+    assert blobs() == {(7, 3, -2, 5): 3}
+    while run_pending():
+        pass
+    # Folding writes the new values once, shared by the row and its checkpoint.
+    assert blobs() == {(7, 3, -2, 5): 2, (7, 3, -2): 2}
+
+    assert client.delete(f"{LIST_URL}/{second}").status_code == 204
+    assert collect_garbage() == 1
+    assert blobs() == {(7, 3, -2, 5): 1}
+    login(client)
+    create(client, [7, 3, -2, 5])
+    assert blobs() == {(7, 3, -2, 5): 2}
+
+
+def test_load_payload_uses_cache(client):
+    login(client)
+    viz_id = create(client, [1, 2, 3])
+    blob_cache.clear()
+    with Session(engine) as session:
+        viz = session.get(SavedVisualization, viz_id)
+        misses = blob_cache.misses
+        assert load_payload(viz) == [1, 2, 3]
+        assert blob_cache.misses == misses + 1
+        hits = blob_cache.hits
+        assert load_payload(viz) == [1, 2, 3]
+        assert blob_cache.hits == hits + 1
+
+
+def test_migration_moves_inline_payloads_into_blobs(client):
+    email = login(client)
+    with Session(engine) as session:
+        user_id = session.exec(select(User.id).where(User.email == email)).one()
+        session.add_all(
+            [
+                SavedVisualization(user_id=user_id, name="a", kind="array", payload=[4, 4]),
+                SavedVisualization(user_id=user_id, name="b", kind="array", payload=[4, 4]),
+            ]
+        )
+        session.commit()
+        enqueue(session, "migrate_inline_payloads", {"batch_size": 1})
+        session.commit()
+    while run_pending():
+        pass
+
+    assert blobs() == {(4, 4): 2}
+    listing = client.get(LIST_URL).json()
+    assert [item["payload"] for item in listing] == [[4, 4], [4, 4]]
@@ -1,6 +1,8 @@
 import io
 import uuid
 
+from app.core.config import settings
+
 
 def unique_email():
     return f"pic_{uuid.uuid4().hex}@example.com"
@@ -49,3 +51,16 @@ def test_profile_picture_upload_and_replace(client, create_db):
     second_path = body2.get("profile_picture")
 
     assert second_path != first_path
+
+
+def test_refused_picture_is_removed_from_storage(client, create_db, monkeypatch):
+    login(client)
+    monkeypatch.setattr(settings, "QUOTA_MAX_STORAGE_BYTES", 10)
+    before = set((create_db / settings.PROFILE_PICTURE_DIR).glob("*"))
+    refused = client.put(
+        "/api/v1/profile/profile-picture",
+        files={"file": ("big.png", io.BytesIO(make_png_bytes()), "image/png")},
+    )
+    assert refused.status_code == 403
+    assert set((create_db / settings.PROFILE_PICTURE_DIR).glob("*")) == before
+    assert client.get("/api/v1/profile/me").json()["profile_picture"] is None
@@ -0,0 +1,88 @@
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.profiling import ProfileStore
+from app.middleware import ProfilingMiddleware
+
+TOKEN = "profiling-secret"
+
+
+@pytest.fixture()
+def admin_token(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_ADMIN_TOKEN", TOKEN)
+    monkeypatch.setattr(settings, "PROFILING_INTERVAL_MS", 1.0)
+    return TOKEN
+
+
+def busy_endpoint():
+    deadline = time.perf_counter() + 0.05
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return {"total": total}
+
+
+def test_header_profiles_request_and_report_is_readable(client, admin_token):
+    response = client.get(
+        "/api/v1/health", headers={"X-Profile": "1", "X-Profile-Token": admin_token}
+    )
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+
+    headers = {"X-Profile-Token": admin_token}
+    listing = client.get("/api/v1/admin/profiles", headers=headers).json()
+    assert any(str(item["id"]) == profile_id for item in listing)
+    report = client.get(f"/api/v1/admin/profiles/{profile_id}", headers=headers).json()
+    assert report["path"] == "/api/v1/health" and report["status"] == 200
+    assert report["trigger"] == "header"
+
+
+def test_profiling_requires_valid_token(client, admin_token):
+    wrong = client.get("/api/v1/health", headers={"X-Profile": "1", "X-Profile-Token": "x"})
+    assert "X-Profile-Id" not in wrong.headers
+    assert client.get("/api/v1/admin/profiles").status_code == 404
+    assert (
+        client.get("/api/v1/admin/profiles", headers={"X-Profile-Token": "x"}).status_code
+        == 404
+    )
+
+
+def test_disabled_without_admin_token(client):
+    assert settings.PROFILING_ADMIN_TOKEN is None
+    response = client.get("/api/v1/health?profile=1", headers={"X-Profile-Token": ""})
+    assert "X-Profile-Id" not in response.headers
+    assert client.get("/api/v1/admin/profiles", headers={"X-Profile-Token": ""}).status_code == 404
+
+
+def test_sampling_profiles_one_in_n_requests(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_INTERVAL_MS", 1.0)
+    inner = FastAPI()
+    inner.get("/api/v1/busy")(busy_endpoint)
+    store = ProfileStore(10)
+    client = TestClient(ProfilingMiddleware(inner, sample_rate=3, store=store))
+
+    profiled = [
+        "X-Profile-Id" in client.get("/api/v1/busy").headers for _ in range(6)
+    ]
+    assert profiled == [False, False, True, False, False, True]
+    (latest, _) = store.list()
+    assert latest.trigger == "sampled" and latest.samples > 0
+
+
+def test_memory_diff_endpoints(client, admin_token):
+    headers = {"X-Profile-Token": admin_token}
+    assert client.get("/api/v1/admin/memory/diff", headers=headers).status_code == 409
+    assert client.post("/api/v1/admin/memory/start", headers=headers).status_code == 200
+    try:
+        retained = [bytearray(1024) for _ in range(200)]
+        diff = client.get("/api/v1/admin/memory/diff", params={"limit": 5}, headers=headers)
+        assert diff.status_code == 200
+        body = diff.json()
+        assert body["traced_bytes"] > 0 and len(body["top"]) <= 5
+        assert retained
+    finally:
+        client.post("/api/v1/admin/memory/stop", headers=headers)
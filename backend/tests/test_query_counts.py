@@ -0,0 +1,160 @@
+"""Lock in the number of SQL statements each write endpoint issues.
+
+Counts cover the whole request, including the auth lookup. If a change
+adds a round trip on purpose, update the expected number here.
+"""
+
+import uuid
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.db import engine
+from app.routers import profile
+
+PASSWORD = "password123"
+
+
+@contextmanager
+def recorded():
+    """Collect executed statements and pool checkouts made inside the block."""
+    log = {"statements": [], "checkouts": 0}
+
+    def on_execute(conn, cursor, statement, *args):
+        log["statements"].append(statement)
+
+    def on_checkout(*args):
+        log["checkouts"] += 1
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    event.listen(engine.pool, "checkout", on_checkout)
+    try:
+        yield log
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+        event.remove(engine.pool, "checkout", on_checkout)
+
+
+def register(client, email=None):
+    email = email or f"queries_{uuid.uuid4().hex}@example.com"
+    response = client.post(
+        "/api/v1/auth/register",
+        json={"name": "Query", "surname": "Count", "email": email, "password": PASSWORD},
+    )
+    return email, response
+
+
+def login(client):
+    email, _ = register(client)
+    client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+    return email
+
+
+def create(client, payload):
+    return client.post(
+        "/api/v1/profile/me/saved-visualizations",
+        json={"name": "counted", "kind": "array", "payload": payload},
+    )
+
+
+def test_register_inserts_user_and_usage_row(client):
+    with recorded() as log:
+        email, response = register(client)
+    assert response.status_code == 201
+    assert response.json()["id"]
+    assert len(log["statements"]) == 2
+    assert log["statements"][0].startswith("INSERT INTO users")
+    assert log["statements"][1].startswith("INSERT INTO user_usage")
+
+    with recorded() as log:
+        _, duplicate = register(client, email)
+    assert duplicate.status_code == 400
+    assert len(log["statements"]) == 1
+
+
+def test_logout_without_token_never_touches_the_database(client):
+    with recorded() as log:
+        response = client.post("/api/v1/auth/logout")
+    assert response.status_code == 200
+    assert log == {"statements": [], "checkouts": 0}
+
+
+def test_update_profile_relies_on_the_unique_index(client):
+    taken, _ = register(client)
+    login(client)
+    create(client, [1, 2])
+
+    with recorded() as log:
+        response = client.put("/api/v1/profile/me", json={"name": "Renamed"})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Renamed"
+    # user, UPDATE, visualizations; the payload comes from the blob cache
+    assert len(log["statements"]) == 3
+
+    with recorded() as log:
+        conflict = client.put("/api/v1/profile/me", json={"email": taken})
+    assert conflict.status_code == 400
+    assert conflict.json()["error"] == "Email already in use"
+    assert len(log["statements"]) == 2
+
+
+def test_password_update_skips_refresh(client):
+    login(client)
+    with recorded() as log:
+        response = client.put(
+            "/api/v1/profile/password",
+            json={"current_password": PASSWORD, "new_password": "password456"},
+        )
+    assert response.status_code == 200
+    assert len(log["statements"]) == 2
+
+
+def test_create_holds_no_connection_while_the_body_streams(client, monkeypatch):
+    login(client)
+    held = []
+    read_body = profile._read_visualization_body
+
+    async def spy(request):
+        held.append(engine.pool.checkedout())
+        return await read_body(request)
+
+    monkeypatch.setattr(profile, "_read_visualization_body", spy)
+    assert create(client, [1, 2]).status_code == 201
+    assert held == [0]
+
+
+def test_create_and_patch_return_server_defaults_without_refresh(client):
+    login(client)
+    with recorded() as log:
+        response = create(client, [3, 1, 2])
+    assert response.status_code == 201
+    created = response.json()
+    assert created["created_at"] and created["updated_at"]
+    # user, blob upsert (UPDATE, SAVEPOINT, INSERT, RELEASE), usage UPDATE,
+    # INSERT ... RETURNING
+    assert len(log["statements"]) == 7
+    assert not any("FROM saved_visualizations" in s for s in log["statements"])
+
+    with recorded() as log:
+        response = client.patch(
+            f"/api/v1/profile/me/saved-visualizations/{created['id']}",
+            json={"operations": [{"op": "push", "value": 4}]},
+        )
+    assert response.status_code == 200
+    assert response.json()["revision"] == 1
+    viz_selects = [s for s in log["statements"] if "FROM saved_visualizations" in s]
+    assert len(viz_selects) == 1
+    # user, SELECT ... FOR UPDATE, usage UPDATE, base checkpoint (blob ref,
+    # UPDATE, INSERT), fold job INSERT, row UPDATE, delta INSERT
+    assert len(log["statements"]) == 9
+
+    with recorded() as log:
+        response = client.patch(
+            f"/api/v1/profile/me/saved-visualizations/{created['id']}",
+            json={"operations": [{"op": "set", "index": 0, "value": 9}]},
+        )
+    assert response.status_code == 200
+    assert response.json()["revision"] == 2
+    # Later edits write only the delta: the stored values are never read.
+    assert not any("payload_blobs" in s for s in log["statements"])
+    assert len(log["statements"]) == 5
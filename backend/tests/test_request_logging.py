@@ -0,0 +1,99 @@
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.logging import (
+    JsonFormatter,
+    RequestIdFilter,
+    _StructuredQueueHandler,
+    request_id_var,
+)
+from app.main import unhandled_exception_handler
+from app.middleware import RequestIdMiddleware
+
+
+def test_request_id_is_generated_or_propagated(client):
+    generated = client.get("/api/v1/health")
+    assert len(generated.headers["X-Request-ID"]) == 32
+
+    echoed = client.get("/api/v1/health", headers={"X-Request-ID": "abc-123"})
+    assert echoed.headers["X-Request-ID"] == "abc-123"
+
+    replaced = client.get("/api/v1/health", headers={"X-Request-ID": "bad id\nvalue"})
+    assert replaced.headers["X-Request-ID"] != "bad id\nvalue"
+
+
+def test_access_log_has_status_duration_and_request_id(client, caplog):
+    with caplog.at_level(logging.INFO, logger="app.access"):
+        client.get("/api/v1/health", headers={"X-Request-ID": "req-1"})
+        client.get("/api/v1/profile/me")
+    first, second = [r for r in caplog.records if r.name == "app.access"]
+    assert (first.path, first.status, first.request_id) == ("/api/v1/health", 200, "req-1")
+    assert first.duration_ms >= 0
+    assert second.status == 401
+
+
+def test_success_logs_are_sampled_but_errors_are_not():
+    middleware = RequestIdMiddleware(lambda *args: None, sample_rate=0.0, slow_ms=500)
+    assert not middleware.should_log(200, 10)
+    assert middleware.should_log(404, 10)
+    assert middleware.should_log(200, 900)
+
+
+def test_json_lines_through_queue_keep_request_id_and_extras():
+    records = queue.SimpleQueue()
+    output = []
+
+    class Collect(logging.Handler):
+        def emit(self, record):
+            output.append(self.format(record))
+
+    sink = Collect()
+    sink.setFormatter(JsonFormatter())
+    handler = _StructuredQueueHandler(records)
+    handler.addFilter(RequestIdFilter())
+    listener = QueueListener(records, sink)
+    logger = logging.getLogger("tests.json")
+    logger.addHandler(handler)
+    logger.propagate = False
+    listener.start()
+    token = request_id_var.set("rid-7")
+    try:
+        logger.warning("saved %s", 3, extra={"viz_id": 9})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed")
+    finally:
+        request_id_var.reset(token)
+        listener.stop()
+        logger.removeHandler(handler)
+
+    saved, failed = (json.loads(line) for line in output)
+    assert saved["message"] == "saved 3" and saved["viz_id"] == 9
+    assert saved["request_id"] == "rid-7" and saved["level"] == "WARNING"
+    assert "ValueError: boom" in failed["exc"]
+
+
+def test_unhandled_exceptions_are_logged_with_request_id(caplog):
+    broken = FastAPI()
+    broken.add_exception_handler(Exception, unhandled_exception_handler)
+    broken.add_middleware(RequestIdMiddleware)
+
+    @broken.get("/boom")
+    def boom():
+        raise RuntimeError("kaput")
+
+    client = TestClient(broken, raise_server_exceptions=False)
+    with caplog.at_level(logging.ERROR):
+        response = client.get("/boom", headers={"X-Request-ID": "err-1"})
+    assert response.status_code == 500
+    assert response.json()["request_id"] == "err-1"
+    assert response.headers["X-Request-ID"] == "err-1"
+    (record,) = [r for r in caplog.records if r.exc_info]
+    assert record.request_id == "err-1"
+    assert "kaput" in str(record.exc_info[1])
@@ -0,0 +1,113 @@
+import asyncio
+import uuid
+
+from app.events import EventBroker, broker
+from app.routers.profile import _event_stream
+
+
+def login(client):
+    email = f"sse_{uuid.uuid4().hex}@example.com"
+    client.post(
+        "/api/v1/auth/register",
+        json={"name": "Sse", "surname": "User", "email": email, "password": "password123"},
+    )
+    client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    return client.get("/api/v1/auth/me").json()["id"]
+
+
+def test_subscriber_receives_only_own_events():
+    events = EventBroker(buffer_size=10, max_streams=5)
+
+    async def scenario():
+        sub, replay = events.subscribe(user_id=1)
+        assert replay == []
+        events.publish(2, "created", {"id": 99})
+        events.publish(1, "created", {"id": 7})
+        event = await asyncio.wait_for(sub.queue.get(), timeout=1)
+        assert (event.type, event.data) == ("created", {"id": 7})
+        assert sub.queue.empty()
+        events.unsubscribe(sub)
+        assert events.active_streams == 0
+
+    asyncio.run(scenario())
+
+
+def test_resume_from_ring_buffer_and_reset_when_evicted():
+    events = EventBroker(buffer_size=3, max_streams=5)
+
+    async def scenario():
+        first = events.publish(1, "created", {"id": 1}).id
+        events.publish(1, "deleted", {"id": 1})
+        sub, replay = events.subscribe(1, last_event_id=first)
+        assert [e.type for e in replay] == ["deleted"]
+        events.unsubscribe(sub)
+
+        for n in range(5):
+            events.publish(1, "created", {"id": n})
+        sub, replay = events.subscribe(1, last_event_id=first)
+        assert replay is None
+        events.unsubscribe(sub)
+
+    asyncio.run(scenario())
+
+
+def test_stream_cap_returns_503(client):
+    login(client)
+    original = broker.max_streams
+    broker.max_streams = 0
+    try:
+        response = client.get("/api/v1/profile/me/saved-visualizations/stream")
+    finally:
+        broker.max_streams = original
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
+
+
+def test_mutations_publish_events_and_stream_replays_them(client):
+    user_id = login(client)
+    before = broker.publish(user_id, "noop", {}).id
+    created = client.post(
+        "/api/v1/profile/me/saved-visualizations",
+        json={"name": "live", "kind": "stack", "payload": [1, 2]},
+    ).json()
+    client.delete(f"/api/v1/profile/me/saved-visualizations/{created['id']}")
+
+    class DisconnectedRequest:
+        async def is_disconnected(self):
+            return True
+
+    async def read_stream():
+        sub, replay = broker.subscribe(user_id, last_event_id=before)
+        sub.overflowed = True  # end the stream after the replay
+        return [chunk async for chunk in _event_stream(DisconnectedRequest(), sub, replay)]
+
+    chunks = asyncio.run(read_stream())
+    assert chunks[0].startswith("retry:")
+    assert "event: created" in chunks[1] and '"name":"live"' in chunks[1]
+    assert '"payload"' not in chunks[1]
+    assert "event: deleted" in chunks[2]
+    assert broker.active_streams == 0
+
+
+def test_buffered_publish_events_carry_no_payload(client):
+    user_id = login(client)
+    before = broker.publish(user_id, "noop", {}).id
+    created = client.post(
+        "/api/v1/profile/me/saved-visualizations",
+        json={"name": "kept", "kind": "stack", "payload": [1, 2]},
+    ).json()
+    base = f"/api/v1/profile/me/saved-visualizations/{created['id']}"
+    client.post(f"{base}/publish")
+    client.delete(f"{base}/publish")
+
+    async def buffered():
+        sub, replay = broker.subscribe(user_id, last_event_id=before)
+        broker.unsubscribe(sub)
+        return replay
+
+    replay = asyncio.run(buffered())
+    updates = [event.data for event in replay if event.type == "updated"]
+    assert len(updates) == 2
+    # The ring buffer holds metadata only, never full payload lists.
+    assert all("payload" not in data for data in updates)
+    assert updates[0]["snapshot_url"] and updates[1]["snapshot_url"] is None
@@ -26,7 +26,7 @@ def test_saved_visualization_crud(client):
     )
     assert create.status_code == 201, create.text
     created = create.json()
-    assert created["payload"] == payload
+    assert "payload" not in created
     viz_id = created["id"]
 
     listing = client.get("/api/v1/profile/me/saved-visualizations")
@@ -36,6 +36,7 @@ def test_saved_visualization_crud(client):
     get_one = client.get(f"/api/v1/profile/me/saved-visualizations/{viz_id}")
     assert get_one.status_code == 200
     assert get_one.json()["name"] == "bst-case"
+    assert get_one.json()["payload"] == payload
 
     delete = client.delete(f"/api/v1/profile/me/saved-visualizations/{viz_id}")
     assert delete.status_code == 204
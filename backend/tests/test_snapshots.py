@@ -0,0 +1,119 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.db import engine
+from app.jobs import enqueue, run_pending
+from app.main import app
+from app.models import Job
+
+
+def login(client):
+    email = f"snap_{uuid.uuid4().hex}@example.com"
+    client.post(
+        "/api/v1/auth/register",
+        json={"name": "Snap", "surname": "User", "email": email, "password": "password123"},
+    )
+    login = client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    assert login.status_code == 200
+
+
+def create_viz(client, payload, kind="binaryheap"):
+    create = client.post(
+        "/api/v1/profile/me/saved-visualizations",
+        json={"name": "shared", "kind": kind, "payload": payload},
+    )
+    assert create.status_code == 201, create.text
+    return create.json()["id"]
+
+
+def test_publish_serves_public_immutable_snapshot(client, create_db):
+    login(client)
+    viz_id = create_viz(client, [4, 1, 3])
+
+    publish = client.post(f"/api/v1/profile/me/saved-visualizations/{viz_id}/publish")
+    assert publish.status_code == 200, publish.text
+    url = publish.json()["snapshot_url"]
+    assert url.startswith("/media/snapshots/") and url.endswith(".json")
+
+    # Publishing unchanged content is idempotent.
+    again = client.post(f"/api/v1/profile/me/saved-visualizations/{viz_id}/publish")
+    assert again.json()["snapshot_url"] == url
+
+    anonymous = TestClient(app)
+    public = anonymous.get(url)
+    assert public.status_code == 200
+    assert "immutable" in public.headers["cache-control"]
+    body = public.json()
+    assert body["id"] == viz_id
+    assert body["payload"] == [4, 1, 3]
+
+    listing = client.get(f"/api/v1/profile/me/saved-visualizations/{viz_id}")
+    assert listing.json()["snapshot_url"] == url
+
+
+def test_unpublish_and_delete_remove_snapshot_file(client, create_db):
+    login(client)
+    viz_id = create_viz(client, [1, 2])
+    url = client.post(f"/api/v1/profile/me/saved-visualizations/{viz_id}/publish").json()[
+        "snapshot_url"
+    ]
+    snapshot_file = create_db / url.removeprefix("/media/")
+    assert snapshot_file.is_file()
+
+    unpublish = client.delete(f"/api/v1/profile/me/saved-visualizations/{viz_id}/publish")
+    assert unpublish.status_code == 204
+    # File removal is queued and runs after the response.
+    assert snapshot_file.exists()
+    run_pending()
+    assert not snapshot_file.exists()
+    assert TestClient(app).get(url).status_code == 404
+
+    client.post(f"/api/v1/profile/me/saved-visualizations/{viz_id}/publish")
+    client.delete(f"/api/v1/profile/me/saved-visualizations/{viz_id}")
+    run_pending()
+    assert not snapshot_file.exists()
+
+
+def test_republish_before_queued_delete_keeps_snapshot(client, create_db):
+    login(client)
+    viz_id = create_viz(client, [5, 6])
+    publish_url = f"/api/v1/profile/me/saved-visualizations/{viz_id}/publish"
+    url = client.post(publish_url).json()["snapshot_url"]
+    snapshot_file = create_db / url.removeprefix("/media/")
+
+    client.delete(publish_url)
+    # Same content, same key; the delete queued by unpublish must not remove it.
+    assert client.post(publish_url).json()["snapshot_url"] == url
+    run_pending()
+    assert snapshot_file.is_file()
+    assert TestClient(app).get(url).status_code == 200
+
+
+def test_publish_a_b_a_keeps_current_snapshot(client, create_db):
+    login(client)
+    viz_id = create_viz(client, [1, 2], kind="array")
+    base = f"/api/v1/profile/me/saved-visualizations/{viz_id}"
+    first = client.post(f"{base}/publish").json()["snapshot_url"]
+    client.patch(base, json={"operations": [{"op": "push", "value": 3}]})
+    second = client.post(f"{base}/publish").json()["snapshot_url"]
+    client.patch(base, json={"operations": [{"op": "pop"}]})
+    third = client.post(f"{base}/publish").json()["snapshot_url"]
+    assert first != second
+
+    run_pending()
+    assert not (create_db / second.removeprefix("/media/")).exists()
+    assert TestClient(app).get(third).status_code == 200
+
+
+def test_out_of_root_media_delete_fails_without_retry():
+    with Session(engine) as session:
+        job = enqueue(session, "delete_media", {"path": "../../outside.txt"})
+        session.commit()
+        job_id = job.id
+    run_pending()
+    with Session(engine) as session:
+        job = session.get(Job, job_id)
+        assert job.status == "failed"
+        assert job.attempts == 1
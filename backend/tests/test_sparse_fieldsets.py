@@ -0,0 +1,74 @@
+import uuid
+
+from sqlalchemy import event
+
+from app.db import engine
+
+
+def login(client):
+    email = f"sparse_{uuid.uuid4().hex}@example.com"
+    client.post(
+        "/api/v1/auth/register",
+        json={"name": "Sparse", "surname": "User", "email": email, "password": "password123"},
+    )
+    client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+
+
+def create(client, name, payload):
+    response = client.post(
+        "/api/v1/profile/me/saved-visualizations",
+        json={"name": name, "kind": "array", "payload": payload},
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_list_without_payload_returns_summaries_and_skips_json_column(client):
+    login(client)
+    create(client, "small", [1, 2, 3])
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        listing = client.get(
+            "/api/v1/profile/me/saved-visualizations", params={"include_payload": "false"}
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert listing.status_code == 200
+    (item,) = listing.json()
+    assert item["name"] == "small"
+    assert item["element_count"] == 3
+    assert "payload" not in item
+    viz_select = [s for s in statements if "FROM saved_visualizations" in s]
+    assert viz_select and "saved_visualizations.payload," not in viz_select[0]
+
+
+def test_sparse_fieldset_and_full_listing(client):
+    login(client)
+    viz_id = create(client, "pick", [4, 5])
+
+    sparse = client.get(
+        "/api/v1/profile/me/saved-visualizations", params={"fields": "name,kind"}
+    ).json()
+    assert sparse == [{"id": viz_id, "name": "pick", "kind": "array"}]
+
+    full = client.get("/api/v1/profile/me/saved-visualizations").json()
+    assert full[0]["payload"] == [4, 5]
+    assert full[0]["element_count"] == 2
+
+    bad = client.get("/api/v1/profile/me/saved-visualizations", params={"fields": "secret"})
+    assert bad.status_code == 400
+
+
+def test_profile_accepts_include_payload_false(client):
+    login(client)
+    create(client, "profile", [9])
+    body = client.get("/api/v1/profile/me", params={"include_payload": "false"}).json()
+    assert body["email"].startswith("sparse_")
+    assert body["saved_visualizations"][0]["element_count"] == 1
+    assert "payload" not in body["saved_visualizations"][0]
@@ -0,0 +1,104 @@
+import json
+import uuid
+from array import array
+
+import pytest
+
+from app.routers import profile
+from app.utils.payloads import encode_values
+from app.utils.visualization_ingest import VisualizationBodyParser
+
+CREATE_URL = "/api/v1/profile/me/saved-visualizations"
+
+
+def login(client):
+    email = f"ingest_{uuid.uuid4().hex}@example.com"
+    client.post(
+        "/api/v1/auth/register",
+        json={"name": "Ingest", "surname": "User", "email": email, "password": "password123"},
+    )
+    client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+
+
+def parse(body: bytes, step: int) -> dict:
+    parser = VisualizationBodyParser()
+    for start in range(0, len(body), step):
+        parser.feed(body[start : start + step])
+    return parser.close()
+
+
+@pytest.mark.parametrize(
+    "payload, expected",
+    [
+        ([1, 2.5, -3e2, "4", True, 0], [1, 2.5, -300, 4, 1, 0]),
+        ([], []),
+        ({"values": [3, "1"]}, [3, 1]),
+        ({"tree": {"value": 2, "left": {"value": 1}}}, [2, 1]),
+    ],
+)
+def test_parser_matches_json_at_every_chunk_boundary(payload, expected):
+    body = json.dumps({"name": "a,]", "kind": "array", "payload": payload}).encode()
+    for step in range(1, len(body) + 1):
+        fields = parse(body, step)
+        assert fields["name"] == "a,]"
+        assert fields["payload"] == array("d", expected)
+
+
+def test_parser_rejects_non_numeric_values_before_the_body_ends():
+    parser = VisualizationBodyParser()
+    with pytest.raises(ValueError, match="numeric"):
+        parser.feed(b'{"name": "x", "payload": [1, 2, null, ')
+
+
+def test_encode_values_matches_json_dumps():
+    values = [1, 2.5, -0.0, 1e300, 3]
+    expected = json.dumps([float(v) for v in values], separators=(",", ":"))
+    assert encode_values(array("d", values)) == expected
+    assert encode_values(values) == expected
+
+
+def test_create_streams_payload(client):
+    login(client)
+    response = client.post(
+        CREATE_URL,
+        content=json.dumps({"name": "big", "kind": "array", "payload": list(range(5000))}),
+        headers={"Content-Type": "application/json"},
+    )
+    assert response.status_code == 201, response.text
+    data = response.json()
+    assert data["element_count"] == 5000
+    # Neither the response nor the "created" event rebuilds the payload list.
+    assert "payload" not in data
+
+    fetched = client.get(f"{CREATE_URL}/{data['id']}").json()
+    assert fetched["payload"][-1] == 4999
+
+
+def test_create_error_responses(client, monkeypatch):
+    login(client)
+    bad_value = client.post(CREATE_URL, json={"name": "b", "kind": "array", "payload": [1, {}]})
+    assert bad_value.status_code == 400
+    assert bad_value.json()["error"] == "Payload values must be numeric."
+
+    malformed = client.post(
+        CREATE_URL,
+        content=b'{"name": "b", "payload": [1,',
+        headers={"Content-Type": "application/json"},
+    )
+    assert malformed.status_code == 422
+    assert malformed.json()["detail"][0]["type"] == "json_invalid"
+
+    missing = client.post(CREATE_URL, json={"name": "b", "payload": [1]})
+    assert missing.status_code == 422
+    assert missing.json()["detail"][0]["loc"] == ["body", "kind"]
+
+    monkeypatch.setattr(profile, "VISUALIZATION_MAX_BODY_BYTES", 64)
+    too_large = client.post(
+        CREATE_URL, json={"name": "b", "kind": "array", "payload": list(range(100))}
+    )
+    assert too_large.status_code == 413
+
+
+def test_create_requires_login_before_reading_body(client):
+    response = client.post(CREATE_URL, json={"name": "b", "kind": "array", "payload": [1]})
+    assert response.status_code == 401
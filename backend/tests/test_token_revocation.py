@@ -0,0 +1,82 @@
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core.revocation import BloomFilter, revocation_filter
+from app.core.security import decode_token
+from app.db import engine
+from app.models import RevokedToken
+
+
+def login(client):
+    email = f"revoke_{uuid.uuid4().hex}@example.com"
+    client.post(
+        "/api/v1/auth/register",
+        json={"name": "Rev", "surname": "User", "email": email, "password": "password123"},
+    )
+    client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    return client.cookies.get("access_token")
+
+
+def test_logged_out_token_is_rejected(client):
+    token = login(client)
+    assert client.get("/api/v1/auth/me").status_code == 200
+
+    client.post("/api/v1/auth/logout")
+    client.cookies.set("access_token", token)
+    assert client.get("/api/v1/auth/me").status_code == 401
+    assert client.get("/api/v1/profile/me").status_code == 401
+
+
+def revocation_lookups(client) -> int:
+    """GET /auth/me and count the SELECTs it sends to revoked_tokens."""
+    statements = []
+
+    def on_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        assert client.get("/api/v1/auth/me").status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    return sum(
+        1 for s in statements if s.startswith("SELECT") and "FROM revoked_tokens" in s
+    )
+
+
+def test_false_positive_falls_back_to_database(client, monkeypatch):
+    login(client)
+    # A filter miss answers without touching the table.
+    assert revocation_lookups(client) == 0
+
+    # Every lookup "hits" the filter, forcing the DB confirmation path.
+    monkeypatch.setattr(revocation_filter, "might_be_revoked", lambda jti: True)
+    assert revocation_lookups(client) == 1
+
+
+def test_refresh_picks_up_revocations_from_other_workers(client):
+    token = login(client)
+    jti = decode_token(token)["jti"]
+    assert not revocation_filter.might_be_revoked(jti)
+
+    with Session(engine) as session:
+        session.add(
+            RevokedToken(jti=jti, expires_at=datetime.utcnow() + timedelta(minutes=5))
+        )
+        session.commit()
+        revocation_filter.refresh(session)
+
+    assert client.get("/api/v1/auth/me").status_code == 401
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [uuid.uuid4().hex for _ in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10_000))
+    assert false_positives < 300
@@ -0,0 +1,198 @@
+import io
+import uuid
+
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.db import engine
+from app.jobs import enqueue, run_pending
+from app.models import SavedVisualization, User, UserUsage
+from app.utils.payload_blobs import canonical_payload
+
+PROFILE_URL = "/api/v1/profile/me"
+LIST_URL = "/api/v1/profile/me/saved-visualizations"
+
+
+def login(client):
+    email = f"usage_{uuid.uuid4().hex}@example.com"
+    client.post(
+        "/api/v1/auth/register",
+        json={"name": "Usage", "surname": "User", "email": email, "password": "password123"},
+    )
+    client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    return email
+
+
+def create(client, values):
+    return client.post(LIST_URL, json={"name": "u", "kind": "array", "payload": values})
+
+
+def usage(client):
+    return client.get(PROFILE_URL, params={"include_payload": "false"}).json()["usage"]
+
+
+def size(values):
+    return len(canonical_payload(values))
+
+
+def run_jobs():
+    while run_pending():
+        pass
+
+
+def test_usage_follows_every_write(client):
+    login(client)
+    assert usage(client) == {
+        "visualization_count": 0,
+        "payload_bytes": 0,
+        "picture_bytes": 0,
+        "max_visualizations": settings.QUOTA_MAX_VISUALIZATIONS,
+        "max_storage_bytes": settings.QUOTA_MAX_STORAGE_BYTES,
+    }
+
+    first = create(client, [1, 2, 3]).json()
+    create(client, [4, 5])
+    assert usage(client)["visualization_count"] == 2
+    assert usage(client)["payload_bytes"] == size([1, 2, 3]) + size([4, 5])
+
+    client.patch(f"{LIST_URL}/{first['id']}", json={"operations": [{"op": "push", "value": 10}]})
+    # The old values live on as the revision 0 checkpoint.
+    assert usage(client)["payload_bytes"] == (
+        size([1, 2, 3, 10]) + size([1, 2, 3]) + size([4, 5])
+    )
+
+    client.delete(f"{LIST_URL}/{first['id']}")
+    assert usage(client)["visualization_count"] == 1
+    assert usage(client)["payload_bytes"] == size([4, 5])
+
+    picture = io.BytesIO(b"\x89PNG" + b"\x00" * 96)
+    client.put(
+        "/api/v1/profile/profile-picture",
+        files={"file": ("me.png", picture, "image/png")},
+    )
+    assert usage(client)["picture_bytes"] == 100
+
+
+def test_quotas_refuse_growth_but_not_shrinking(client, monkeypatch):
+    login(client)
+    monkeypatch.setattr(settings, "QUOTA_MAX_VISUALIZATIONS", 1)
+    first = create(client, [1, 2, 3]).json()
+    refused = create(client, [1])
+    assert refused.status_code == 403
+    assert refused.json()["error"] == "Saved visualization limit reached (max 1)."
+    assert usage(client)["visualization_count"] == 1
+
+    monkeypatch.setattr(settings, "QUOTA_MAX_VISUALIZATIONS", 0)
+    monkeypatch.setattr(settings, "QUOTA_MAX_STORAGE_BYTES", size([1, 2, 3]))
+    url = f"{LIST_URL}/{first['id']}"
+    grow = client.patch(url, json={"operations": [{"op": "push", "value": 4}]})
+    assert grow.status_code == 403
+    assert client.get(url).json()["payload"] == [1, 2, 3]
+
+    monkeypatch.setattr(settings, "REVISION_FOLD_DELAY_SECONDS", 0)
+    shrink = client.patch(url, json={"operations": [{"op": "pop"}]})
+    assert shrink.status_code == 200
+    # Removed bytes are credited once the edit is folded into the stored values;
+    # the superseded values are kept as a checkpoint and still count.
+    assert usage(client)["payload_bytes"] == 2 * size([1, 2, 3])
+    run_jobs()
+    assert usage(client)["payload_bytes"] == size([1, 2]) + size([1, 2, 3])
+
+
+def test_revision_history_counts_until_deleted(client, monkeypatch):
+    login(client)
+    monkeypatch.setattr(settings, "REVISION_FOLD_DELAY_SECONDS", 0)
+    url = f"{LIST_URL}/{create(client, [1, 2]).json()['id']}"
+    for value in (3, 4):
+        client.patch(url, json={"operations": [{"op": "push", "value": value}]})
+        run_jobs()
+    history = size([1, 2]) + size([1, 2, 3])
+    assert usage(client)["payload_bytes"] == size([1, 2, 3, 4]) + history
+
+    # Edits that cancel out supersede nothing.
+    client.patch(url, json={"operations": [{"op": "push", "value": 5}]})
+    client.patch(url, json={"operations": [{"op": "pop"}]})
+    run_jobs()
+    assert usage(client)["payload_bytes"] == size([1, 2, 3, 4]) + history
+
+    monkeypatch.setattr(settings, "QUOTA_MAX_STORAGE_BYTES", size([1, 2, 3, 4]) + history)
+    grow = client.patch(url, json={"operations": [{"op": "push", "value": 5}]})
+    assert grow.status_code == 403
+    shrink = client.patch(url, json={"operations": [{"op": "pop"}]})
+    assert shrink.status_code == 200
+
+    client.delete(url)
+    assert usage(client)["payload_bytes"] == 0
+
+
+def test_reconciliation_repairs_drift_in_batches(client):
+    email = login(client)
+    create(client, [1, 2])
+    create(client, [3])
+    login(client)
+    create(client, [7, 7, 7])
+    with Session(engine) as session:
+        user_id = session.exec(select(User.id).where(User.email == email)).one()
+        row = session.get(UserUsage, user_id)
+        row.visualization_count = 40
+        row.payload_bytes = 1
+        session.add(row)
+        # A row saved before payload sizes were recorded.
+        for viz in session.exec(
+            select(SavedVisualization).where(SavedVisualization.user_id == user_id)
+        ):
+            viz.payload_bytes = None
+            session.add(viz)
+        session.commit()
+        enqueue(session, "reconcile_user_usage", {"batch_size": 1})
+        session.commit()
+    statements = []
+
+    def on_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        run_jobs()
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    # Each batch locks the counters before reading users or their rows.
+    reads = [s for s in statements if "FROM user_usage" in s or "FROM users" in s]
+    assert "FROM user_usage" in reads[0] and "FROM users" in reads[1]
+
+    with Session(engine) as session:
+        rows = {row.user_id: row for row in session.exec(select(UserUsage))}
+        assert rows[user_id].visualization_count == 2
+        assert rows[user_id].payload_bytes == size([1, 2]) + size([3])
+        assert len(rows) == 2
+        assert all(row.visualization_count == 1 for uid, row in rows.items() if uid != user_id)
+
+
+def test_users_without_a_usage_row_are_seeded(client, monkeypatch):
+    email = login(client)
+    create(client, [1, 2])
+    with Session(engine) as session:
+        user_id = session.exec(select(User.id).where(User.email == email)).one()
+        session.delete(session.get(UserUsage, user_id))
+        session.commit()
+
+    # Read-only views count on the fly without writing a row.
+    assert usage(client)["visualization_count"] == 1
+    monkeypatch.setattr(settings, "QUOTA_MAX_VISUALIZATIONS", 1)
+    assert create(client, [3]).status_code == 403
+
+    monkeypatch.setattr(settings, "QUOTA_MAX_VISUALIZATIONS", 2)
+    assert create(client, [3]).status_code == 201
+    with Session(engine) as session:
+        row = session.get(UserUsage, user_id)
+        assert row.visualization_count == 2
+        assert row.payload_bytes == size([1, 2]) + size([3])
+
+
+def test_deleting_the_account_drops_its_usage_row(client):
+    login(client)
+    create(client, [1])
+    assert client.delete(PROFILE_URL).status_code == 204
+    with Session(engine) as session:
+        assert session.exec(select(UserUsage)).all() == []
@@ -0,0 +1,132 @@
+import uuid
+
+from sqlmodel import Session, select
+
+from app.db import engine
+from app.engine import BstStructure
+from app.jobs import enqueue, run_pending, schedule_metadata_backfill
+from app.models import SavedVisualization, User
+from app.utils.visualization_metadata import compute_metadata
+
+LIST_URL = "/api/v1/profile/me/saved-visualizations"
+
+
+def login(client):
+    email = f"meta_{uuid.uuid4().hex}@example.com"
+    client.post(
+        "/api/v1/auth/register",
+        json={"name": "Meta", "surname": "User", "email": email, "password": "password123"},
+    )
+    client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    return email
+
+
+def create(client, name, kind, payload):
+    response = client.post(LIST_URL, json={"name": name, "kind": kind, "payload": payload})
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_compute_metadata_tree_shapes():
+    heap = compute_metadata("binaryheap", [1, 2, 3, 4, 5])
+    assert (heap["height"], heap["balance_factor"]) == (3, 1)
+    chain = compute_metadata("bst", [1, 2, 3])
+    assert (chain["height"], chain["balance_factor"]) == (3, -2)
+    assert chain["is_sorted"] is True
+    assert compute_metadata("bst", [2, 2])["height"] is None
+    empty = compute_metadata("array", [])
+    assert empty["element_count"] == 0 and empty["min_value"] is None
+
+
+def test_bst_metadata_handles_non_monotonic_degenerate_input():
+    # Zigzag inserts build a 20k-deep chain; replaying them took tens of seconds.
+    zigzag = [v for i in range(10_000) for v in (i, 40_000 - i)]
+    shape = compute_metadata("bst", zigzag)
+    assert (shape["height"], shape["balance_factor"]) == (20_000, -19_999)
+
+    nearly_sorted = list(range(500))
+    nearly_sorted[10], nearly_sorted[400] = nearly_sorted[400], nearly_sorted[10]
+    replayed = BstStructure()
+    for value in nearly_sorted:
+        replayed.insert(value)
+    shape = compute_metadata("bst", nearly_sorted)
+    assert (shape["height"], shape["balance_factor"]) == (
+        replayed.height(),
+        replayed.balance_factor(),
+    )
+
+
+def test_create_stores_metadata(client):
+    login(client)
+    data = create(client, "tree", "bst", [5, 3, 8, 1])
+    assert data["element_count"] == 4
+    assert (data["min_value"], data["max_value"]) == (1, 8)
+    assert data["is_sorted"] is False
+    assert (data["height"], data["balance_factor"]) == (3, 1)
+
+
+def test_list_sorts_and_filters_on_metadata(client):
+    login(client)
+    create(client, "small", "array", [1, 2])
+    create(client, "large", "array", [9, 7, 5, 3, 1])
+    create(client, "medium", "stack", [4, 5, 6])
+
+    by_size = client.get(LIST_URL, params={"sort": "-element_count", "fields": "name"}).json()
+    assert [item["name"] for item in by_size] == ["large", "medium", "small"]
+
+    ranged = client.get(
+        LIST_URL, params={"min_elements": 3, "max_value": 6, "sort": "element_count"}
+    ).json()
+    assert [item["name"] for item in ranged] == ["medium"]
+
+    only_sorted = client.get(LIST_URL, params={"is_sorted": "true", "sort": "min_value"}).json()
+    assert [item["name"] for item in only_sorted] == ["small", "medium"]
+
+    bad = client.get(LIST_URL, params={"sort": "payload"})
+    assert bad.status_code == 400
+
+
+def test_backfill_job_fills_legacy_rows(client):
+    email = login(client)
+    with Session(engine) as session:
+        user_id = session.exec(select(User.id).where(User.email == email)).one()
+        legacy = [
+            SavedVisualization(user_id=user_id, name=f"old{i}", kind="array", payload=[i, 0])
+            for i in range(3)
+        ]
+        legacy.append(
+            SavedVisualization(user_id=user_id, name="junk", kind="array", payload={"x": 1})
+        )
+        session.add_all(legacy)
+        session.commit()
+        ids = [viz.id for viz in legacy]
+
+    # The first job handles two rows and enqueues the rest as a follow-up batch.
+    with Session(engine) as session:
+        enqueue(session, "backfill_visualization_metadata", {"batch_size": 2})
+        session.commit()
+    while run_pending():
+        pass
+
+    with Session(engine) as session:
+        rows = [session.get(SavedVisualization, viz_id) for viz_id in ids]
+        assert [row.element_count for row in rows] == [2, 2, 2, 0]
+        assert rows[2].max_value == 2 and rows[2].is_sorted is False
+        assert rows[3].max_value is None
+
+    # Non-numeric rows are marked, so the startup check has nothing left to do.
+    assert schedule_metadata_backfill() is False
+
+
+def test_backfill_is_not_scheduled_twice(client):
+    email = login(client)
+    with Session(engine) as session:
+        user_id = session.exec(select(User.id).where(User.email == email)).one()
+        session.add(SavedVisualization(user_id=user_id, name="old", kind="array", payload=[1]))
+        session.commit()
+
+    assert schedule_metadata_backfill() is True
+    assert schedule_metadata_backfill() is False
+    while run_pending():
+        pass
+    assert schedule_metadata_backfill() is False
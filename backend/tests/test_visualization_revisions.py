@@ -0,0 +1,109 @@
+import uuid
+
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.db import engine
+from app.jobs import run_pending
+from app.models import SavedVisualization, VisualizationRevision
+
+LIST_URL = "/api/v1/profile/me/saved-visualizations"
+
+
+def login(client):
+    email = f"rev_{uuid.uuid4().hex}@example.com"
+    client.post(
+        "/api/v1/auth/register",
+        json={"name": "Rev", "surname": "User", "email": email, "password": "password123"},
+    )
+    client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+
+
+def create(client, payload):
+    response = client.post(LIST_URL, json={"name": "edit", "kind": "array", "payload": payload})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def patch(client, viz_id, operations, **extra):
+    return client.patch(f"{LIST_URL}/{viz_id}", json={"operations": operations, **extra})
+
+
+def run_jobs():
+    while run_pending():
+        pass
+
+
+def test_patch_applies_edits_and_updates_metadata(client, monkeypatch):
+    monkeypatch.setattr(settings, "REVISION_FOLD_DELAY_SECONDS", 0)
+    login(client)
+    viz_id = create(client, [1, 2, 3])
+    response = patch(
+        client,
+        viz_id,
+        [
+            {"op": "push", "value": 10},
+            {"op": "set", "index": 0, "value": 7},
+            {"op": "insert", "index": 1, "value": 0},
+            {"op": "delete", "index": 2},
+            {"op": "pop"},
+        ],
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert "payload" not in body
+    assert body["revision"] == 1
+    # The count is exact; what depends on overwritten or removed values is
+    # unknown until the edits are folded.
+    assert (body["element_count"], body["min_value"], body["is_sorted"]) == (3, None, None)
+    assert client.get(f"{LIST_URL}/{viz_id}").json()["payload"] == [7, 0, 3]
+
+    stale = patch(client, viz_id, [{"op": "pop"}], expected_revision=0)
+    assert stale.status_code == 409
+    bad = patch(client, viz_id, [{"op": "delete", "index": 9}])
+    assert bad.status_code == 400
+
+    run_jobs()
+    folded = client.get(f"{LIST_URL}/{viz_id}").json()
+    assert folded["payload"] == [7, 0, 3]
+    assert (folded["element_count"], folded["min_value"], folded["is_sorted"]) == (3, 0, False)
+
+
+def test_tree_kinds_cannot_be_edited(client):
+    login(client)
+    response = client.post(LIST_URL, json={"name": "t", "kind": "bst", "payload": [2, 1, 3]})
+    viz_id = response.json()["id"]
+    refused = patch(client, viz_id, [{"op": "push", "value": 0}])
+    assert refused.status_code == 400
+    assert refused.json()["error"] == "Edits are not supported for bst visualizations."
+    assert client.get(f"{LIST_URL}/{viz_id}").json()["revision"] == 0
+
+
+def test_revisions_store_deltas_and_reconstruct(client, monkeypatch):
+    monkeypatch.setattr(settings, "REVISION_CHECKPOINT_INTERVAL", 3)
+    login(client)
+    viz_id = create(client, [0])
+    for value in range(1, 8):
+        # Every third pending edit folds the deltas inline, with no worker running.
+        assert patch(client, viz_id, [{"op": "push", "value": value}]).status_code == 200
+
+    with Session(engine) as session:
+        rows = session.exec(
+            select(VisualizationRevision)
+            .where(VisualizationRevision.visualization_id == viz_id)
+            .order_by(VisualizationRevision.revision)
+        ).all()
+        viz = session.get(SavedVisualization, viz_id)
+        assert (viz.base_revision, viz.revision) == (6, 7)
+    assert [row.revision for row in rows if row.checkpoint_hash is not None] == [0, 3, 6]
+    assert rows[5].ops == [{"op": "push", "value": 5.0}]
+
+    for revision in range(8):
+        response = client.get(f"{LIST_URL}/{viz_id}/revisions/{revision}")
+        assert response.status_code == 200
+        assert response.json()["payload"] == list(range(revision + 1))
+    assert client.get(f"{LIST_URL}/{viz_id}/revisions/8").status_code == 404
+
+    assert client.delete(f"{LIST_URL}/{viz_id}").status_code == 204
+    with Session(engine) as session:
+        assert session.exec(select(VisualizationRevision)).first() is None
@@ -4,10 +4,12 @@ import "./style.css";
 import { STRUCTURE_INFO } from "./data/structureInfo.js";
 import { parseInputValues } from "./utils/inputParser.js";
 import {
-  fetchCurrentUser,
+  fetchUserWithSavedVisualizations,
   fetchSavedVisualizations,
+  fetchSavedVisualization,
   createSavedVisualization,
   deleteSavedVisualization,
+  subscribeToSavedVisualizations,
 } from "./services/api.js";
 
 import { createArrayStructure } from "./algorithms/structures/array.js";
@@ -895,6 +897,39 @@ document.addEventListener("DOMContentLoaded", () => {
     }
   };
 
+  const upsertSavedVisualization = (viz) => {
+    if (!viz || !Number.isFinite(viz.id)) return;
+    const index = savedVisualizations.findIndex((item) => item.id === viz.id);
+    if (index === -1) {
+      savedVisualizations = [viz, ...savedVisualizations];
+    } else {
+      // Edit events omit the payload; drop the stale copy so "load" refetches it.
+      savedVisualizations = savedVisualizations.map((item) => {
+        if (item.id !== viz.id) return item;
+        const merged = { ...item, ...viz };
+        if (!("payload" in viz)) delete merged.payload;
+        return merged;
+      });
+    }
+    renderSavedVisualizations();
+  };
+
+  const removeSavedVisualization = (vizId) => {
+    savedVisualizations = savedVisualizations.filter((item) => item.id !== vizId);
+    renderSavedVisualizations();
+  };
+
+  let unsubscribeSavedVisualizations = null;
+  const subscribeSavedVisualizations = () => {
+    if (!loggedInUser || unsubscribeSavedVisualizations) return;
+    unsubscribeSavedVisualizations = subscribeToSavedVisualizations({
+      onCreated: upsertSavedVisualization,
+      onUpdated: upsertSavedVisualization,
+      onDeleted: ({ id }) => removeSavedVisualization(id),
+      onReset: () => refreshSavedVisualizations(),
+    });
+  };
+
   const handleSavedVisualizationsClick = async (event) => {
     const target = event.target;
     if (!target?.dataset?.action) return;
@@ -905,6 +940,14 @@ document.addEventListener("DOMContentLoaded", () => {
     if (!entry) return;
 
     if (action === "load") {
+      if (entry.payload === undefined) {
+        try {
+          entry.payload = (await fetchSavedVisualization(entry.id)).payload;
+        } catch (error) {
+          updateStatus(error.message, "error");
+          return;
+        }
+      }
       const applied = applyPayloadToStructure(entry.kind, entry.payload);
       if (!applied) {
         updateStatus("Could not load the saved visualization.", "error");
@@ -921,8 +964,7 @@ document.addEventListener("DOMContentLoaded", () => {
       if (!confirmed) return;
       try {
         await deleteSavedVisualization(entry.id);
-        savedVisualizations = savedVisualizations.filter((item) => item.id !== entry.id);
-        renderSavedVisualizations();
+        removeSavedVisualization(entry.id);
         updateStatus(`Deleted "${entry.name}".`, "success");
       } catch (error) {
         updateStatus(error.message, "error");
@@ -963,13 +1005,13 @@ document.addEventListener("DOMContentLoaded", () => {
       return;
     }
     try {
-      await createSavedVisualization({
+      const created = await createSavedVisualization({
         name,
         kind: currentStructureKey,
         payload: valuesForSave,
       });
       setSaveMessage("Saved! View it below or in your profile.", "success");
-      await refreshSavedVisualizations();
+      upsertSavedVisualization(created);
       setTimeout(() => {
         toggleSaveModal(false);
       }, 600);
@@ -1312,12 +1354,17 @@ document.addEventListener("DOMContentLoaded", () => {
 
   const initAuthState = async () => {
     try {
-      loggedInUser = await fetchCurrentUser();
+      // User and saved list in one round trip.
+      const session = await fetchUserWithSavedVisualizations();
+      loggedInUser = session.user;
+      savedVisualizations = session.savedVisualizations;
+      renderSavedVisualizations();
     } catch (error) {
       console.warn("Unable to fetch current user.", error);
       loggedInUser = null;
+      await refreshSavedVisualizations();
     }
-    await refreshSavedVisualizations();
+    subscribeSavedVisualizations();
   };
 
   // Init
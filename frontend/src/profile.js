@@ -1,6 +1,7 @@
 // frontend/src/profile.js
 import "./style.css";
 import { API_ORIGIN, AUTH_BASE, PROFILE_BASE } from "./config.js";
+import { batchRequests } from "./services/api.js";
 
 const PLACEHOLDER_IMAGE = "/profile-placeholder.png";
 const SAVED_VIS_STORAGE_KEY = "dss-saved-visualization";
@@ -178,25 +179,22 @@ function renderProfile(user) {
 
 async function fetchProfile() {
   try {
-    const authRes = await fetch(`${AUTH_BASE}/me`, { credentials: "include" });
-    if (authRes.status === 401) {
+    // Login check and profile load share one round trip.
+    const [auth, profile] = await batchRequests([
+      { id: "me", path: "/api/v1/auth/me" },
+      { id: "profile", path: "/api/v1/profile/me" },
+    ]);
+    if (auth.status === 401 || profile.status === 401) {
       window.location.href = "./login.html";
       return;
     }
-    if (!authRes.ok) {
+    if (auth.status !== 200) {
       throw new Error("Failed to verify login status.");
     }
-
-    const res = await fetch(`${PROFILE_BASE}/me`, { credentials: "include" });
-    if (res.status === 401) {
-      window.location.href = "./login.html";
-      return;
-    }
-    if (!res.ok) {
+    if (profile.status !== 200) {
       throw new Error("Failed to load profile");
     }
-    const data = await res.json();
-    renderProfile(data);
+    renderProfile(profile.body);
   } catch (error) {
     console.error(error);
     setStatus(profileMessage, "Unable to load profile. Please log in again.", "error");
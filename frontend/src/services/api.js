@@ -1,5 +1,8 @@
 // frontend/src/services/api.js
-import { AUTH_BASE, PROFILE_BASE } from "../config.js";
+import { API_BASE, AUTH_BASE, PROFILE_BASE } from "../config.js";
+
+// Sub-request paths inside a batch are origin-less.
+const API_PATH = "/api/v1";
 
 const defaultOptions = {
   credentials: "include",
@@ -24,6 +27,41 @@ export async function fetchCurrentUser() {
   return response.json();
 }
 
+// Run several API requests in one round trip. Each entry is
+// { id, method = "GET", path, body }; results come back in the same order
+// as { id, status, body }.
+export async function batchRequests(requests) {
+  const response = await fetch(`${API_BASE}/batch`, {
+    ...defaultOptions,
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ requests }),
+  });
+  if (!response.ok) {
+    const data = await parseJson(response);
+    throw new Error(data.detail || data.error || "Batch request failed.");
+  }
+  return response.json();
+}
+
+// Current user plus their saved visualizations; user is null when logged out.
+export async function fetchUserWithSavedVisualizations() {
+  const [me, saved] = await batchRequests([
+    { id: "me", path: `${API_PATH}/auth/me` },
+    { id: "saved", path: `${API_PATH}/profile/me/saved-visualizations` },
+  ]);
+  if (me.status === 401) {
+    return { user: null, savedVisualizations: [] };
+  }
+  if (me.status !== 200) {
+    throw new Error("Unable to fetch current user.");
+  }
+  if (saved.status !== 200) {
+    throw new Error("Unable to load saved visualizations.");
+  }
+  return { user: me.body, savedVisualizations: saved.body };
+}
+
 export async function fetchSavedVisualizations() {
   const response = await fetch(
     `${PROFILE_BASE}/me/saved-visualizations`,
@@ -40,6 +78,24 @@ export async function fetchSavedVisualizations() {
   return response.json();
 }
 
+export async function fetchSavedVisualization(id) {
+  const response = await fetch(
+    `${PROFILE_BASE}/me/saved-visualizations/${id}`,
+    defaultOptions,
+  );
+  const data = await parseJson(response);
+  if (response.status === 401) {
+    const error = new Error("Not authenticated.");
+    error.status = 401;
+    throw error;
+  }
+  if (!response.ok) {
+    throw new Error(data.detail || data.error || "Unable to load visualization.");
+  }
+  return data;
+}
+
+// Resolves to the new entry's id and metadata; the payload is not echoed back.
 export async function createSavedVisualization(payload) {
   const response = await fetch(`${PROFILE_BASE}/me/saved-visualizations`, {
     ...defaultOptions,
@@ -59,6 +115,36 @@ export async function createSavedVisualization(payload) {
   return data;
 }
 
+// Apply edits ({ op: "push" | "pop" | "insert" | "delete" | "set", index, value })
+// without resending the whole payload. Pass expectedRevision to get a 409
+// instead of overwriting someone else's change. The response (like the
+// "updated" event it triggers) carries the new revision and metadata but no
+// payload; use fetchSavedVisualization for the values.
+export async function patchSavedVisualization(id, operations, expectedRevision) {
+  const body = { operations };
+  if (expectedRevision !== undefined) {
+    body.expected_revision = expectedRevision;
+  }
+  const response = await fetch(`${PROFILE_BASE}/me/saved-visualizations/${id}`, {
+    ...defaultOptions,
+    method: "PATCH",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(body),
+  });
+  const data = await parseJson(response);
+  if (response.status === 401) {
+    const error = new Error("Please log in to manage visualizations.");
+    error.status = 401;
+    throw error;
+  }
+  if (!response.ok) {
+    const error = new Error(data.detail || data.error || "Unable to update visualization.");
+    error.status = response.status;
+    throw error;
+  }
+  return data;
+}
+
 export async function deleteSavedVisualization(id) {
   const response = await fetch(
     `${PROFILE_BASE}/me/saved-visualizations/${id}`,
@@ -78,3 +164,47 @@ export async function deleteSavedVisualization(id) {
   }
   return true;
 }
+
+// Time a structure's operations server-side. Returns one curve per operation,
+// { operation, complexity, points: [{ size, seconds, ns_per_op }] }, to plot
+// against the complexity claims in data/structureInfo.js.
+export async function runBenchmark({ structure, sizes, distribution = "random", repeats = 1 }) {
+  const response = await fetch(`${API_BASE}/lab/benchmarks`, {
+    ...defaultOptions,
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ structure, sizes, distribution, repeats }),
+  });
+  const data = await parseJson(response);
+  if (!response.ok) {
+    const error = new Error(data.error || "Unable to run benchmark.");
+    error.status = response.status;
+    throw error;
+  }
+  return data;
+}
+
+// Subscribe to saved-visualization changes pushed by the server.
+// EventSource reconnects on its own and sends Last-Event-ID so missed
+// events are replayed; a "reset" event means the client must reload.
+export function subscribeToSavedVisualizations({ onCreated, onUpdated, onDeleted, onReset }) {
+  if (typeof EventSource === "undefined") return () => {};
+  const source = new EventSource(`${PROFILE_BASE}/me/saved-visualizations/stream`, {
+    withCredentials: true,
+  });
+  const listen = (type, handler) => {
+    if (!handler) return;
+    source.addEventListener(type, (event) => {
+      try {
+        handler(JSON.parse(event.data));
+      } catch (error) {
+        console.warn(`Ignoring malformed ${type} event.`, error);
+      }
+    });
+  };
+  listen("created", onCreated);
+  listen("updated", onUpdated);
+  listen("deleted", onDeleted);
+  listen("reset", onReset);
+  return () => source.close();
+}